@@ -79,10 +79,13 @@ class ClassicFanzinesDate:
         return f"{datetime.now():%B %d, %Y}"
 
 
-    def DaysAgo(self) -> int|None:
+    # (When checking many dates at once, pass in a single value for now.)
+    def DaysAgo(self, now: datetime|None=None) -> int|None:
         if self._date is None:
             return None
-        return (datetime.now()-self._date).days
+        if now is None:
+            now=datetime.now()
+        return (now-self._date).days
 
 
 #==========================================================================================================
@@ -106,6 +109,10 @@ class ClassicFanzinesLine:
         self._updated: ClassicFanzinesDate|None=None
         self.DuplicateCopy=False
         self._flag=""
+        # The xxxSort keys are expensive to compute (unidecode etc.) and are read many times when sorting and rendering,
+        # so they are cached here as key name -> (the value it was computed from, key).  The setters of the source fields
+        # clear their entries.  (The source value is checked too, since a FanzineNames can be changed in place.)
+        self._sortKeyCache: dict[str, tuple[str, str]]={}
 
         # Initialize from another CFL by deep copying
         if isinstance(cfl, ClassicFanzinesLine):
@@ -174,21 +181,79 @@ class ClassicFanzinesLine:
         new._betterScanNeeded=old._betterScanNeeded
         new._created=old._created
         new._updated=old._updated
+        new._sortKeyCache={}
         return new
 
 
+    # Turn the CFL into a plain dict (and back) so it can be stored as JSON.  Everything is stored raw, so a round trip
+    # leaves an equal CFL.
+    def AsDict(self) -> dict[str, str|bool|list[str]|None]:
+        def DateStr(d: ClassicFanzinesDate|None) -> str|None:
+            if d is None:
+                return None
+            if d._date is None:
+                return ""
+            return d.Date.isoformat()
+
+        return {"url": self._url, "mainname": self._name._mainname, "othernames": list(self._name._othernames),
+                "editors": self._editors, "dates": self._dates, "type": self._type, "clubname": self._clubname,
+                "issues": self._issues, "topcomments": self._topcomments, "country": self._country,
+                "complete": self._complete, "betterscanneeded": self._betterScanNeeded,
+                "created": DateStr(self._created), "updated": DateStr(self._updated), "flag": self._flag}
+
+    @staticmethod
+    def FromDict(d: dict[str, str|bool|list[str]|None]) -> ClassicFanzinesLine:
+        def Date(s: str|None) -> ClassicFanzinesDate|None:
+            if s is None:
+                return None
+            if s == "":
+                return ClassicFanzinesDate()
+            return ClassicFanzinesDate(datetime.fromisoformat(s))
+
+        cfl=ClassicFanzinesLine()
+        cfl._url=d["url"]
+        cfl._name._mainname=d["mainname"]
+        cfl._name._othernames=list(d["othernames"])
+        cfl._editors=d["editors"]
+        cfl._dates=d["dates"]
+        cfl._type=d["type"]
+        cfl._clubname=d["clubname"]
+        cfl._issues=d["issues"]
+        cfl._topcomments=d["topcomments"]
+        cfl._country=d["country"]
+        cfl._complete=d["complete"]
+        cfl._betterScanNeeded=d["betterscanneeded"]
+        cfl._created=Date(d["created"])
+        cfl._updated=Date(d["updated"])
+        cfl._flag=d["flag"]
+        return cfl
+
+
     @property
     def Name(self) -> FanzineNames:
         return self._name
     @Name.setter
     def Name(self, val: FanzineNames):
         self._name=val
+        self._sortKeyCache.pop("DisplayName", None)
+
+
+    # Return the cached sort key computed from source, computing it if need be
+    def _CachedSortKey(self, name: str, source: str, compute) -> str:
+        cached=self._sortKeyCache.get(name)
+        if cached is not None and cached[0] == source:
+            return cached[1]
+        key=compute(source)
+        self._sortKeyCache[name]=(source, key)
+        return key
 
     @property
     def DisplayNameSort(self) -> str:
-        pre, _, mid, post=FindNextBracketedText(self._name.MainName)
-        dns=unidecode(f"{pre} {mid} {post}".strip().casefold())
-        return ArticleToEnd(dns)
+        def Compute(mainname: str) -> str:
+            pre, _, mid, post=FindNextBracketedText(mainname)
+            dns=unidecode(f"{pre} {mid} {post}".strip().casefold())
+            return ArticleToEnd(dns)
+        return self._CachedSortKey("DisplayName", self._name.MainName, Compute)
     @DisplayNameSort.setter
     def DisplayNameSort(self, val: str):
         raise Exception(f"ClassicFanzinesLine.DisplayNameSort({val}): setter should never be called.")
@@ -206,13 +271,16 @@ class ClassicFanzinesLine:
     @Editors.setter
     def Editors(self, val: str):
         self._editors=RemoveHTMLishWhitespace(val, replacement="; ")
+        self._sortKeyCache.pop("Editors", None)
 
     @property
     def EditorsSort(self) -> str:
-        eds=re.split(r"<br/?>|;", self.Editors)
-        # Sort based on the 1st editor's last name all caps.
-        ed=unidecode(eds[0])
-        return SortPersonsName(ed).casefold()
+        def Compute(editors: str) -> str:
+            eds=re.split(r"<br/?>|;", editors)
+            # Sort based on the 1st editor's last name all caps.
+            ed=unidecode(eds[0])
+            return SortPersonsName(ed).casefold()
+        return self._CachedSortKey("Editors", self.Editors, Compute)
     @EditorsSort.setter
     def EditorsSort(self, val: str):
         raise Exception(f"ClassicFanzinesLine.EditorsSort({val}): setter should never be called.")
@@ -223,18 +291,21 @@ class ClassicFanzinesLine:
     @Dates.setter
     def Dates(self, val: str):
         self._dates=val
+        self._sortKeyCache.pop("Dates", None)
 
     @property
     def DatesSort(self) -> str:
-        # Sort based on 1st 4-digit year.  We need to find the year, as sometimes odd stuff gets entered!
-        m=re.search(r"((?:19|20)[0-9][0-9])", self.Dates)
-        if m is None:
-            # Can't find a fulll year.  Try replacing "?" with "0"
-            d=self.Dates.replace("?", "0")
-            m=re.search(r"((?:19|20)[0-9][0-9])", d)
+        def Compute(dates: str) -> str:
+            # Sort based on 1st 4-digit year.  We need to find the year, as sometimes odd stuff gets entered!
+            m=re.search(r"((?:19|20)[0-9][0-9])", dates)
             if m is None:
-                return "zzzz"
-        return (m.groups()[0]+"0000")[0:4]
+                # Can't find a fulll year.  Try replacing "?" with "0"
+                d=dates.replace("?", "0")
+                m=re.search(r"((?:19|20)[0-9][0-9])", d)
+                if m is None:
+                    return "zzzz"
+            return (m.groups()[0]+"0000")[0:4]
+        return self._CachedSortKey("Dates", self.Dates, Compute)
     @DatesSort.setter
     def DatesSort(self, val: str):
         raise Exception(f"ClassicFanzinesLine.DatesSort({val}): setter should never be called.")
@@ -261,10 +332,11 @@ class ClassicFanzinesLine:
         if isinstance(val, int):
             val=str(val)
         self._issues=val
+        self._sortKeyCache.pop("Issues", None)
 
     @property
     def IssuesSort(self) -> str:
-        return f"{Int0(self.Issues.replace(',', '')):05d}"     # Need to handle page counts like 1,404
+        return self._CachedSortKey("Issues", self.Issues, lambda issues: f"{Int0(issues.replace(',', '')):05d}")     # Need to handle page counts like 1,404
     @IssuesSort.setter
     def IssuesSort(self, val: str):
         raise Exception(f"ClassicFanzinesLine.IssuesSort({val}): setter should never be called.")
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+# The main window's list of all fanzines, kept in server-directory order.
+#
+# Fanzines are looked up, replaced, added and deleted by server directory (case-insensitively, as Windows directory
+# names are not case-sensitive).  A dict gives the lookup, and a parallel pair of sorted lists (keys and CFLs) maintained
+# with bisect keeps the order, so none of these operations needs to search or re-sort the whole list.
+# It behaves like a read-only list of ClassicFanzinesLines for everything else (len, indexing, iteration).
+
+from bisect import bisect_left, bisect_right
+
+from ClassicFanzinesLine import ClassicFanzinesLine
+from Log import Log
+
+
+def ServerDirKey(serverDir: str) -> str:
+    return serverDir.strip().casefold()
+
+
+class ClassicFanzinesList:
+    def __init__(self, fanzines: list[ClassicFanzinesLine]|None=None) -> None:
+        self._keys: list[str]=[]                        # Sorted
+        self._cfls: list[ClassicFanzinesLine]=[]        # In the same order as _keys
+        self._byKey: dict[str, ClassicFanzinesLine]={}
+        if fanzines is not None:
+            fanzines=sorted(fanzines, key=lambda cfl: ServerDirKey(cfl.ServerDir))
+            self._cfls=fanzines
+            self._keys=[ServerDirKey(x.ServerDir) for x in fanzines]
+            for key, cfl in zip(self._keys, self._cfls):
+                if key in self._byKey:
+                    Log(f"ClassicFanzinesList: '{cfl.ServerDir}' appears more than once")
+                    continue
+                self._byKey[key]=cfl
+
+    def __len__(self) -> int:
+        return len(self._cfls)
+
+    def __getitem__(self, index: int|slice) -> ClassicFanzinesLine|list[ClassicFanzinesLine]:
+        return self._cfls[index]
+
+    def __iter__(self):
+        return iter(self._cfls)
+
+    def __contains__(self, serverDir: str) -> bool:
+        return ServerDirKey(serverDir) in self._byKey
+
+    def Get(self, serverDir: str) -> ClassicFanzinesLine|None:
+        return self._byKey.get(ServerDirKey(serverDir))
+
+    # Replace the entry for cfl's server directory with cfl, or insert cfl in order if there's no entry.
+    # Returns the entry which was replaced (or None).
+    def Merge(self, cfl: ClassicFanzinesLine) -> ClassicFanzinesLine|None:
+        key=ServerDirKey(cfl.ServerDir)
+        old=self._byKey.get(key)
+        self._byKey[key]=cfl
+        if old is not None:
+            self._cfls[bisect_left(self._keys, key)]=cfl
+            return old
+        loc=bisect_right(self._keys, key)
+        self._keys.insert(loc, key)
+        self._cfls.insert(loc, cfl)
+        return None
+
+    # Delete the entry (or entries) for serverDir, returning what was deleted
+    def Remove(self, serverDir: str) -> list[ClassicFanzinesLine]:
+        key=ServerDirKey(serverDir)
+        if key not in self._byKey:
+            return []
+        del self._byKey[key]
+        start=bisect_left(self._keys, key)
+        end=bisect_right(self._keys, key)
+        removed=self._cfls[start:end]
+        del self._keys[start:end]
+        del self._cfls[start:end]
+        return removed
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+# A local snapshot of the parsed Classic Fanzines list.
+#
+# Downloading and parsing Classic_Fanzines.html takes several seconds and it rarely changes between runs of the editor.
+# So after each successful parse we save the resulting list of ClassicFanzinesLines as JSON together with the stamp
+# (size and modification time, see FTPStat) of the server file it came from and the digest of the page's table section
+# (see PublishedClassicFanzines).  On the next startup, if the server file's stamp still matches, we use the snapshot and
+# skip the download and parse entirely.
+#
+# The server has a data file of the same kind: PutClassicFanzineList() uploads Classic_Fanzines.json alongside the page.
+# It has one record per fanzine (none of the duplicate rows the page has for a fanzine's other names) and the stamp the
+# page had once uploaded.  So when our snapshot is out of date but the server's data file still matches the page, the
+# list can be loaded from it instead of downloading and scraping the page.
+
+import os
+import json
+
+from ClassicFanzinesLine import ClassicFanzinesLine
+from Log import Log
+
+
+_snapshotVersion=2
+_snapshotFilename="Classic_Fanzines snapshot.json"
+_dataVersion=1
+ClassicFanzinesDataFilename="Classic_Fanzines.json"
+
+
+# The snapshot lives in the editor's home directory alongside the settings files
+def SnapshotPath() -> str:
+    return os.path.join(os.getcwd(), _snapshotFilename)
+
+
+# Return the snapshotted list and table digest if it was taken from serverDir's Classic_Fanzines.html when it had this stamp, else None
+def LoadSnapshot(serverDir: str, stamp: str|None) -> tuple[list[ClassicFanzinesLine], str|None]|None:
+    if stamp is None or not os.path.exists(SnapshotPath()):
+        return None
+    try:
+        with open(SnapshotPath(), "r", encoding="utf-8") as f:
+            snapshot=json.load(f)
+        if snapshot.get("version") != _snapshotVersion or snapshot.get("serverdir") != serverDir or snapshot.get("stamp") != stamp:
+            Log(f"LoadSnapshot(): snapshot is out of date")
+            return None
+        cfllist=[ClassicFanzinesLine.FromDict(x) for x in snapshot["fanzines"]]
+        tableDigest=snapshot["tabledigest"]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        Log(f"LoadSnapshot(): unable to read {SnapshotPath()}: {e}")
+        return None
+
+    Log(f"LoadSnapshot(): {len(cfllist)} fanzines loaded from {SnapshotPath()}")
+    return cfllist, tableDigest
+
+
+# Save the parsed list from serverDir's Classic_Fanzines.html, which has the given stamp
+def SaveSnapshot(serverDir: str, stamp: str|None, cfllist: list[ClassicFanzinesLine], tableDigest: str|None) -> None:
+    if stamp is None:
+        return
+    snapshot={"version": _snapshotVersion, "serverdir": serverDir, "stamp": stamp, "tabledigest": tableDigest,
+              "fanzines": [x.AsDict() for x in cfllist]}
+    try:
+        # Write to a temporary file and then swap it in so a crash can't leave a half-written snapshot behind
+        temppath=SnapshotPath()+".tmp"
+        with open(temppath, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temppath, SnapshotPath())
+    except OSError as e:
+        Log(f"SaveSnapshot(): unable to write {SnapshotPath()}: {e}")
+
+
+# Create the server's data file for the list of fanzines in a Classic_Fanzines.html which (now that it has been uploaded) has the given stamp
+def RenderClassicFanzinesData(stamp: str, cfllist: list[ClassicFanzinesLine], tableDigest: str|None) -> str:
+    data={"version": _dataVersion, "htmlstamp": stamp, "tabledigest": tableDigest, "fanzines": [x.AsDict() for x in cfllist]}
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+# Return the list and table digest in the server's data file if it was written for the Classic_Fanzines.html which has this stamp, else None
+def ParseClassicFanzinesData(text: str, stamp: str|None) -> tuple[list[ClassicFanzinesLine], str|None]|None:
+    if stamp is None:
+        return None
+    try:
+        data=json.loads(text)
+        if data.get("version") != _dataVersion or data.get("htmlstamp") != stamp:
+            Log(f"ParseClassicFanzinesData(): {ClassicFanzinesDataFilename} doesn't match Classic_Fanzines.html")
+            return None
+        cfllist=[ClassicFanzinesLine.FromDict(x) for x in data["fanzines"]]
+        tableDigest=data["tabledigest"]
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        Log(f"ParseClassicFanzinesData(): unable to read {ClassicFanzinesDataFilename}: {e}")
+        return None
+
+    Log(f"ParseClassicFanzinesData(): {len(cfllist)} fanzines loaded from {ClassicFanzinesDataFilename}")
+    return cfllist, tableDigest
@@ -3,6 +3,15 @@ from datetime import datetime
 from FTP import FTP
 from Log import Log
 
+
+# Wrap contents in <tag>...</tag> for an FTPLog item (or return "" if there are no contents)
+def Tagit(tag: str, contents: str) -> str:
+    contents=contents.strip()
+    if contents == "":
+        return ""
+    return f"<{tag}>{contents}</{tag}>"
+
+
 class FTPLog:
     g_ID: str|None=None
     g_Logfilename: str|None=None
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+# Cheap "has this file changed on the server?" checks.
+#
+# The FTP class (shared with the other fanac.org tools) can fetch and store whole files, but it has no way to ask
+# for just a file's size and modification time.  Those two facts are all we need to decide whether a locally cached
+# copy of something is still good, and the server will tell us both in response to a single MLST command.
+# (For servers which don't support MLST we fall back on SIZE+MDTM.)  A whole directory's worth comes from one MLSD.
+#
+# A "stamp" is an opaque string built from the size and mtime.  Two stamps compare equal iff the file is unchanged.
+# Anything that goes wrong yields None, which callers must treat as "unknown -- go to the server" (i.e., check with
+# FTP().FileExists() or download the file, just as they would without a stamp).
+#
+# Since FTP has no public call for any of this, these commands go straight to its ftplib connection.  That is only
+# done in _Connection() and _Send(), which give up (returning None) if FTP isn't connected or the server refuses.
+
+import ftplib
+from typing import Callable, TypeVar
+
+from FTP import FTP
+from Log import Log
+
+
+T=TypeVar("T")
+
+_mlstRefused=False          # Set once the server has said it doesn't know MLST/MLSD, so we don't keep asking
+
+
+# Return FTP's ftplib connection, or None if it isn't connected (yet)
+def _Connection() -> ftplib.FTP|None:
+    ftp=getattr(FTP, "g_ftp", None)
+    if isinstance(ftp, ftplib.FTP):
+        return ftp
+    return None
+
+
+# Send a command (a function of the connection) to the server.  Returns its result, or None if there's no connection
+# or the command fails.
+def _Send(what: str, command: Callable[[ftplib.FTP], T]) -> T|None:
+    global _mlstRefused
+    ftp=_Connection()
+    if ftp is None:
+        Log(f"{what}: not connected")
+        return None
+    try:
+        return command(ftp)
+    except ftplib.error_perm as e:
+        # 500 and 502 mean the server doesn't support the command at all (as opposed to, e.g., 550 for a missing file)
+        if str(e)[:3] in ("500", "502") and what.startswith("MLS"):
+            _mlstRefused=True
+        Log(f"{what}: refused: {e}")
+    except ftplib.all_errors as e:
+        Log(f"{what}: failed: {e}")
+    return None
+
+
+# Parse an MLST/MLSD facts string ('size=1234;modify=20240101120000;type=file; name') into a dict of lowercased facts
+def ParseMLSxFacts(line: str) -> dict[str, str]:
+    facts: dict[str, str]={}
+    factstring=line.strip().split(" ", 1)[0]
+    for fact in factstring.split(";"):
+        if "=" in fact:
+            key, _, val=fact.partition("=")
+            facts[key.strip().lower()]=val.strip()
+    return facts
+
+
+# The stamp of a file, given its MLSx facts.  (None if they don't include both its size and mtime.)
+def StampFromFacts(facts: dict[str, str]) -> str|None:
+    if "size" in facts and "modify" in facts:
+        return f"size={facts['size']};modify={facts['modify']}"
+    return None
+
+
+# Get the size and modification time of serverDir/filename on the server as a stamp string
+def ServerFileStamp(serverDir: str, filename: str) -> str|None:
+    path=f"{serverDir.rstrip('/')}/{filename}"
+
+    if not _mlstRefused:
+        # The response is '250-Listing <path>\n <facts> <path>\n250 End'
+        resp=_Send(f"MLST {path}", lambda ftp: ftp.sendcmd(f"MLST {path}"))
+        if resp is not None:
+            lines=[x for x in resp.splitlines() if not x.startswith("250")]
+            if len(lines) > 0:
+                stamp=StampFromFacts(ParseMLSxFacts(lines[0]))
+                if stamp is not None:
+                    return stamp
+
+    size=_Send(f"SIZE {path}", lambda ftp: ftp.size(path))
+    if size is None:
+        return None
+    modify=_Send(f"MDTM {path}", lambda ftp: ftp.sendcmd(f"MDTM {path}").split(" ", 1)[-1].strip())
+    if modify is None:
+        return None
+    return f"size={size};modify={modify}"
+
+
+# List serverDir on the server (with MLSD): returns a dict of name -> lowercased facts (type, size, modify, ...),
+# or None if the listing can't be had.
+def ServerListing(serverDir: str) -> dict[str, dict[str, str]]|None:
+    if _mlstRefused:
+        return None
+    return _Send(f"MLSD {serverDir}", lambda ftp: {name: {key.lower(): val for key, val in facts.items()} for name, facts in ftp.mlsd(serverDir) if name not in (".", "..")})
@@ -0,0 +1,1050 @@
+from __future__ import annotations
+
+# The data model of a fanzine index page: reading one from the server (GetFanzineIndexPage), writing one
+# (PutFanzineIndexPage), and the column definitions and helpers they share.
+#
+# Nothing here imports wx or puts up a dialog -- problems are logged and reported by the return value -- so it can be
+# used without a display (e.g., in batch jobs).  (Its columns are GridDataModel's rather than WxDataGrid's for the same
+# reason.)  FanzineIndexPageEdit's FanzineIndexPageWindow is the editing view over it.
+# (bs4 and pypdf are slow to import and only needed for PDFs and the old-format pages LegacyHtml can't parse, so they're
+# imported where they're used.)
+
+import os
+import re
+import json
+import hashlib
+from datetime import datetime
+from tempfile import gettempdir
+from typing import TYPE_CHECKING
+
+from FTP import FTP
+from ClassicFanzinesLine import ClassicFanzinesDate
+from FanzineNames import FanzineNames
+from FanzineDateTime import FanzineDate, InterpretRelativeWords
+from FanzineIndexPageTableRow import FanzineIndexPageTableRow
+from GridDataModel import TableDataSource, ColDefinition, ColDefinitionsList, IsEditable
+from HtmlCleanup import CleanDownloadedHtml, RemoveNbspCrap
+from LegacyHtml import ParseLegacyHtml
+from ServerBackups import BackupServerText
+from ServerMirror import ServerMirror
+from SlotTemplate import SlotTemplate, SlotInserter, LoadSlotTemplate
+
+from HelpersPackage import RemoveTopLevelHTMLTags, RegularizeBRTags, CanonicizeColumnHeaders, MakeFancyLink, WikiUrlnameToWikiPagename
+from HelpersPackage import FindLinkInString, FindAndReplaceSingleBracketedText, FindAndReplaceBracketedText, SplitOnSpansOfLineBreaks
+from HelpersPackage import InsertBetweenHTMLComments, SearchAndReplace, RemoveAllHTMLLikeTags, TurnPythonListIntoWordList, StripSpecificTag, RemoveHyperlink
+from HelpersPackage import InsertHTMLUsingFanacStartEndCommentPair, ExtractHTMLUsingFanacStartEndCommentPair, SplitListOfNamesOnPattern, RemoveFancyLink
+from HelpersPackage import ExtractInvisibleTextInsideFanacComment, InsertInvisibleTextInsideFanacComment, ExtractHTMLUsingFanacTagCommentPair
+from HtmlHelpersPackage import HtmlEscapesToUnicode, UnicodeToHtmlEscapes, ConvertHTMLEscapes
+from Log import Log, LogError
+from Settings import Settings
+
+if TYPE_CHECKING:
+    from WxDataGrid import Color
+
+
+# Create default column headers
+gStdColHeaders: ColDefinitionsList=ColDefinitionsList([
+    ColDefinition("Filename", Type="str", IsEditable=IsEditable.Maybe),
+    ColDefinition("Display Text", Type="str"),
+    ColDefinition("Link", Type="url"),
+    ColDefinition("Text", Type="required str"),
+    ColDefinition("Title", Type="str", Preferred="Display Text"),
+    ColDefinition("Whole", Type="int", Width=75),
+    ColDefinition("WholeNum", Type="int", Width=75, Preferred="Whole"),
+    ColDefinition("Vol", Type="int", Width=50),
+    ColDefinition("Volume", Type="int", Width=50, Preferred="Vol"),
+    ColDefinition("Num", Type="int", Width=50),
+    ColDefinition("Number", Type="int", Width=50, Preferred="Num"),
+    ColDefinition("Month", Type="month", Width=75),
+    ColDefinition("Day", Type="day", Width=50),
+    ColDefinition("Year", Type="year", Width=50),
+    ColDefinition("Pages", Type="int", Width=50),
+    ColDefinition("PDF", Type="str", Width=50),
+    ColDefinition("Notes", Type="str", Width=120),
+    ColDefinition("Scanned", Type="str", Width=100),
+    ColDefinition("Scan", Type="str", Width=100, Preferred="Scanned"),
+    ColDefinition("Scanned By", Type="str", Width=100, Preferred="Scanned"),
+    ColDefinition("Country", Type="str", Width=50),
+    ColDefinition("Editor", Type="str", Width=75),
+    ColDefinition("Author", Type="str", Width=75),
+    ColDefinition("Mailing", Type="str", Width=75),
+    ColDefinition("Repro", Type="str", Width=75)
+])
+
+
+def SpecialNameFormatToHtmlFancylink(val: str|None) ->str|None:
+    if val is None:
+        return None
+
+    # "Uncredited" is not linked
+    if "uncredited" in val.lower() or "various" in val.lower():
+        return val
+
+    # If "|" present, input format is <fancyName|displayName>
+    if "|" in val:
+        fancyName, displayName = val.split("|", 1)
+        return MakeFancyLink(fancyName, displayName)
+
+    return MakeFancyLink(val)
+
+
+def HtmlFancylinkToSpecialNameFormat(val: str) -> str:
+    return WikiUrlnameToWikiPagename(val)
+
+
+#*******************************************
+# Take a list of column names and generate a list of ColDefs
+def ColNamesToColDefs(headers: list[str]) -> ColDefinitionsList:
+    colDefs: ColDefinitionsList=ColDefinitionsList([])
+    for header in headers:
+        # First cannonicize the header
+        if header.lower() == "issue":
+            header="Display Text"   # Display text is unique to Fanzines Index Page??
+        elif header.lower() == "title":
+            header="Display Text"   # But a few pages usne "Title"
+        else:
+            header=CanonicizeColumnHeaders(header)
+
+        if header in gStdColHeaders:
+            scd=gStdColHeaders[gStdColHeaders.index(header)]
+        else:
+            header=header.strip("(").strip(")")     # Remove existing parens so when we add one back. there's just one.
+            scd=ColDefinition(f"({header})", Type="str", Width=75)  # The default when it's unrecognizable
+
+        colDefs.append(scd)
+    return colDefs
+
+
+#*******************************************
+# Split a Mailing cell into its mailings, each as (apa, number, postmailing)
+# It may be of the form 'FAPA 103 PM, OMPA 32 & SAPS 76A'.  Mailings which can't be interpreted are dropped.
+def SplitMailings(cell: str) -> list[tuple[str, str, str]]:
+    out: list[tuple[str, str, str]]=[]
+    for mailing in cell.replace(",", "&").replace(";", "&").split("&"):
+        mailing=mailing.strip()
+        if len(mailing) == 0:
+            continue
+        # Split mailing titles like FAPA 103A into an apa name and the mailing number (which may have trailing characters '30A')
+        m=re.match(r"([a-zA-Z'1-9_\- ]*)\s+([0-9]+[a-zA-Z]*)\s*(pm|postmailing)?$", mailing, flags=re.IGNORECASE)
+        if m is not None:
+            out.append((m.groups()[0], m.groups()[1], m.groups()[2] or ""))
+    return out
+
+
+#####################################################################################################
+#####################################################################################################
+# FanzineIndexPage -- the data model for a single fanzine's index page (one fanzine series).
+#
+# PAGE FORMAT VERSIONS
+# --------------------
+# A fanzine index page on the server is an HTML file (index.html) whose format has evolved.
+# The version is recorded in an invisible HTML comment: <!-- fanac fanzine index page V<x> -->
+# and is read back by GetFanzineIndexPage() via ExtractInvisibleTextInsideFanacComment(..., "fanzine index page V").
+#
+#   Version ""   -- Legacy "Jack" pages. No version tag. Free-form HTML: the data lives in
+#                   <h1>/<h2> topmatter, a <fanac-type> locale block, and the 3rd <table>.
+#                   Parsed by GetFanzineIndexPageOld() (BeautifulSoup-based, tolerant of messiness).
+#                   May carry a single "Date" column (split into Month/Day/Year on load) and the
+#                   obsolete "Alphabetize Individually" keyword (mapped to FanzineType "Collection").
+#   Version "2"  -- First generation of FanzinesEditor-written pages. Structured: all fields are
+#                   delimited by fanac HTML comment pairs (header/name/eds/dates/type/club/loc/
+#                   topcomments/table-headers/table-rows/scan/created/updated). Parsed by
+#                   GetFanzineIndexPageNew().
+#   Version "2.1"-- Same structure as V2, but (starting mid-December 2024) guarantees that
+#                   ampersands in issue URLs are encoded correctly. This is the version we WRITE.
+#
+# READ vs WRITE
+# -------------
+# Reads may encounter any of the three versions; GetFanzineIndexPage() dispatches on the tag.
+# Writes are always emitted as V2.1 (see PutFanzineIndexPage(), which sets the tag to "2.1" and
+# percent-encodes '#' and '&' in hrefs). So opening any older page and re-uploading migrates it forward.
+#
+# THE DATA FILE (index.json)
+# --------------------------
+# Along with index.html, PutFanzineIndexPage() uploads index.json: the page's model (header fields, column headers,
+# and each row's cells, flags and UpdatedComment) as written by RenderFanzineIndexData(), with the digest of the
+# index.html it was written with.  Pages written with it are marked <!-- fanac-data index.json-->.  When loading a page
+# so marked, GetFanzineIndexPage() uses index.json instead of parsing the HTML -- but only if its digest matches the
+# HTML, since the page may have been edited by hand (or its data file not uploaded) since.  Otherwise the HTML is parsed.
+# (The mirror's copy of index.json is tried first: the digest check makes it safe to use without asking the server.)
+#
+# THE V2 AMPERSAND FIXUP (load-bearing -- do not remove casually)
+# --------------------------------------------------------------
+# V2 pages mis-encoded the '&' in URLs (e.g. a file like "Laurel & Hardy.pdf"). When a page is
+# read as V2 (self._version == "2"), GetFanzineIndexPageNew() normalizes "&amp;" back to "&" in
+# each row's URL so the link matches the real filename on the server. V2.1+ pages skip this.
+# Because every save rewrites the page as V2.1 with correct encoding, this branch only matters the
+# first time a genuine V2 page is opened; getting it wrong corrupts issue links, so leave it intact.
+#####################################################################################################
+
+# The patterns which pick apart the table of a new-style page (see GetFanzineIndexPageNew()), compiled just once
+_headerCellPattern=re.compile(r"<TH>(.+?)</TH>", flags=re.DOTALL|re.IGNORECASE)
+_tableRowPattern=re.compile(r"<TR>(.+?)</TR>", flags=re.DOTALL|re.IGNORECASE)
+# A row whose cells are all merged into one: either a link row (groups 1 and 2 are the link's URL and text) or a text row (group 3)
+_spannedRowPattern=re.compile(r'<TD colspan=\"[0-9]+\">(?:<a href=\"(.*?)">(.*?)</a></TD>|(.*?)</TD>)', flags=re.DOTALL|re.IGNORECASE)
+_tableCellPattern=re.compile(r"<TD(:?.*?)>(.*?)</TD>", flags=re.DOTALL|re.IGNORECASE)
+_updatedCommentPattern=re.compile(r"<!-- Up: [0-9 -]*-->")
+
+
+_dataFilename="index.json"
+_dataFormat=1
+
+
+# The digest of a page's HTML which is recorded in its index.json.  (Line ends are normalized since FTP may change them.)
+def HtmlDigest(html: str) -> str:
+    return hashlib.sha256(html.replace("\r\n", "\n").encode("utf-8")).hexdigest()
+
+
+# The digest of a page's HTML leaving out its Updated footer, so two renderings of the same page on different days match
+_updatedFooterPattern=re.compile(r"<!--\s*fanac-updated\s+start\s*-->.*?<!--\s*fanac-updated\s+end\s*-->", re.IGNORECASE|re.DOTALL)
+
+def PageDigest(html: str) -> str:
+    return HtmlDigest(_updatedFooterPattern.sub("", html))
+
+
+# The Fanzine Index Page template, compiled into static text plus the places a page's contents go (see SlotTemplate).
+# The slots are located by the same helper calls, in the same order, which once filled them in one after another.
+# Only the ones whose absence was always an error must be there; if one of the others is missing, that part of the
+# template is left as it is.  (Older copies of the template have no place for the data file mark, for instance.)
+_templateFilename="Template - Fanzine Index Page.html"
+_requiredSlots={"topcomments", "keywords", "table-headers", "table-rows"}
+
+def LoadFanzineIndexPageTemplate() -> SlotTemplate|None:
+    slots: list[tuple[str, SlotInserter]]=[
+        ("meta", lambda s, val: FindAndReplaceSingleBracketedText(s, "meta name=", f"<{val}>")),
+        ("title", lambda s, val: FindAndReplaceBracketedText(s, "title", f"<title>{val}</title>", caseInsensitive=True)[0]),
+        ("name", lambda s, val: InsertBetweenHTMLComments(s, "name", val)),
+        ("other", lambda s, val: InsertBetweenHTMLComments(s, "other", val)),
+        ("eds", lambda s, val: InsertBetweenHTMLComments(s, "eds", val)),
+        ("dates", lambda s, val: InsertBetweenHTMLComments(s, "dates", val)),
+        ("complete", lambda s, val: InsertBetweenHTMLComments(s, "complete", val)),
+        ("type", lambda s, val: InsertBetweenHTMLComments(s, "type", val)),
+        ("club", lambda s, val: InsertBetweenHTMLComments(s, "club", val)),
+        ("loc", lambda s, val: InsertBetweenHTMLComments(s, "loc", val)),
+        ("sig", lambda s, val: InsertInvisibleTextInsideFanacComment(s, "sig", val)),
+        ("ordering", lambda s, val: InsertInvisibleTextInsideFanacComment(s, "ordering", val)),
+        ("data", lambda s, val: InsertInvisibleTextInsideFanacComment(s, "data", val)),
+        ("topcomments", lambda s, val: InsertHTMLUsingFanacStartEndCommentPair(s, "topcomments", val)),
+        ("keywords", lambda s, val: InsertInvisibleTextInsideFanacComment(s, "keywords", val)),
+        ("table-headers", lambda s, val: InsertHTMLUsingFanacStartEndCommentPair(s, "table-headers", val)),
+        ("table-rows", lambda s, val: InsertHTMLUsingFanacStartEndCommentPair(s, "table-rows", val)),
+        ("scan", lambda s, val: InsertHTMLUsingFanacStartEndCommentPair(s, "scan", val)),
+        ("updated", lambda s, val: InsertHTMLUsingFanacStartEndCommentPair(s, "updated", val)),
+    ]
+    return LoadSlotTemplate(_templateFilename, slots, optional={x for x, _ in slots if x not in _requiredSlots})
+
+
+class FanzineIndexPage(TableDataSource):
+    def __init__(self):
+        TableDataSource.__init__(self)
+        self._fanzineList: list[FanzineIndexPageTableRow]=[]
+        self._gridDataRowClass=FanzineIndexPageTableRow
+        self._specialTextColor: Color|None=None
+        self.TopComments: str=""
+        self._locale: list[str]=[]
+        self._name: FanzineNames=FanzineNames()
+        self._clubname: str=""
+        self._betterScanNeeded: bool=False
+        self._Editors: str=""
+        self._version: str=""
+        self.Dates: str=""
+        self.Significance: str="Unclassified"
+        self.Ordering: str="Normal"     # Row-ordering mode: "Normal", "Collection", or "Other". Ordering checks run only for "Normal".
+        self.FanzineType: str=""
+        self.Complete=False     # Is this fanzine series complete?
+        self.Credits=""         # Who is to be credited for this affair?
+        self.Updated: ClassicFanzinesDate=ClassicFanzinesDate("Long, long ago")
+        self.Created: ClassicFanzinesDate=ClassicFanzinesDate("Long, long ago")
+        self.SourceHtml: str=""         # The page as downloaded by GetFanzineIndexPage()
+        self.ServerPath: str=""         # ...and the server directory it was downloaded from
+        self.LastUpload: str=""         # What PutFanzineIndexPage() last did: "uploaded" or "unchanged"
+        self.LastBackup: str=""         # ...and the backup of the page it replaced (see ServerBackups), if any
+
+
+    def Signature(self) -> int:        
+        s=0
+        if self._colDefs is not None:
+            s+=self._colDefs.Signature()
+        s+=hash(f"{self._name};{self.TopComments.strip()};{' '.join(self.Locale).strip()}")
+        s+=hash(f"{self.TopComments.strip()};{self.Significance}")
+        s+=hash(f"{self.Name.MainName};{self.Editors};{self.Dates};{self.FanzineType};{self.Clubname};{self.Credits};{self.Ordering}")
+        s+=sum([x.Signature()*(i+1) for i, x in enumerate(self._fanzineList)])
+        s+=hash(self._specialTextColor)
+        return s
+
+
+    # The rows, which TableDataSource (and, in the editor, GridDataSource) works on
+    @property
+    def Rows(self) -> list[FanzineIndexPageTableRow]:        
+        return self._fanzineList
+    @Rows.setter
+    def Rows(self, rows: list) -> None:        
+        self._fanzineList=rows
+
+
+    @property
+    def NumRows(self) -> int:        
+        return len(self._fanzineList)
+
+    def __getitem__(self, index: int) -> FanzineIndexPageTableRow:        
+        return self.Rows[index]
+
+    def __setitem__(self, index: int, val: FanzineIndexPageTableRow) -> None:        
+        self._fanzineList[index]=val
+
+
+    @property
+    def SpecialTextColor(self) -> Color|None:        
+        return self._specialTextColor
+    @SpecialTextColor.setter
+    def SpecialTextColor(self, val: Color|None) -> None:        
+        self._specialTextColor=val
+
+
+    def __str__(self) -> str:
+        return str(self.Updated)
+
+
+    # The format version of the page as it was read ("" for old-style pages)
+    @property
+    def PageVersion(self) -> str:
+        return self._version
+
+
+    def CanAddColumns(self) -> bool:        
+        return True
+
+
+    def InsertEmptyRows(self, insertat: int, num: int=1) -> None:        
+        for i in range(num):
+            ftr=FanzineIndexPageTableRow(self._colDefs)
+            self._fanzineList.insert(insertat+i, ftr)
+
+
+    @property
+    def Name(self) -> FanzineNames:
+        return self._name
+    @Name.setter
+    def Name(self, val: FanzineNames) -> None:
+        assert isinstance(val, FanzineNames)
+        self._name=val
+
+
+    @property
+    def Locale(self) -> list[str]:
+        return self._locale
+    @Locale.setter
+    def Locale(self, val: list[str]|str) -> None:
+        if isinstance(val, str):
+            val=[val]
+        self._locale=val
+    @property
+    def LocaleAsText(self) -> str:
+        return "\n".join(self._locale)
+
+    @property
+    def Clubname(self) -> str:
+        if self.FanzineType.lower() == "clubzine":
+            return self._clubname.strip()
+        return ""
+    @Clubname.setter
+    def Clubname(self, val: str) -> None:
+        # We want to ignore leading spaces or a leading hyphen
+        val=val.strip()
+        if len(val) > 0 and val[0] == "-":
+            val=val[1:].strip()
+        self._clubname=val
+
+
+    @property
+    def TextAndHrefCols(self) -> tuple[int, int]:
+        return self._colDefs.index("Display Text"), self._colDefs.index("Link")
+
+
+    @staticmethod
+    def SelectNonNavigableStrings(soupstuff) -> list:        
+        import bs4
+        return [x for x in soupstuff if not isinstance(x, bs4.element.NavigableString)]
+
+
+    # Download a fanzine index page fanac.org/fanzines/URL and fill in the class
+    def GetFanzineIndexPage(self, url: str) -> bool:
+        fanzineServerDir=""
+        testRootDirectory=Settings().Get("Test Root directory")
+        html=None
+        if Settings().Get("Test mode", "False") == "True":
+            if testRootDirectory != "":
+                # If there is a test directory, try loading from there, first
+                fanzineServerDir=f"/{testRootDirectory}/{url}"
+                html=ServerMirror.GetFileAsString(fanzineServerDir, "index.html", TestLoad=True)
+        if html is None:
+            # If we're not in test mode or if that failed (or there wasn't one) load from the default server directory
+            fanzineServerDir=f"/{Settings().Get("Root directory")}/{url}"
+            html=ServerMirror.GetFileAsString(fanzineServerDir, "index.html")
+        if html is None:
+            LogError(f"Unable to download 'index.html' from '{url}' because {FTP().LastMessage}")
+            return False
+        self.SourceHtml=html
+        self.ServerPath=fanzineServerDir
+
+        # If the page was uploaded along with its data file, and that's the data file for this very page, use it
+        if ExtractInvisibleTextInsideFanacComment(html, "data").strip() == _dataFilename and self.GetFanzineIndexPageFromData(fanzineServerDir, html):
+            for row in self.Rows:
+                row.SavedSignature=row.Signature()
+            return True
+
+        # Remove the &amp;amp;amp;amp;amp;... that has crept in to some pages, and the non-breaking space crap, too.
+        html, ampRuns=CleanDownloadedHtml(html)
+        if ampRuns > 0:
+            Log(f"redundant 'amp;'s removed from {url}")
+
+        # This is the tag that marks a new-style page and its version.
+        # e.g., <!-- fanac fanzine index page V1.0-->
+        # Version " " -- old (Jack) pages
+        # Version "2" -- The first batch of FanzinesEditor pages
+        # Version "2.1" -- starting mid-December 2024, pages where we have guaranteed that ampersands in URLs are correctly written
+        self._version=ExtractInvisibleTextInsideFanacComment(html, "fanzine index page V").strip()
+        if self._version == "":
+            success=self.GetFanzineIndexPageOld(html)
+        else:
+            success=self.GetFanzineIndexPageNew(html)
+
+        if not success:
+            return False
+
+        # Get the signatures of each line to later use to see if the line has been updated.
+        for row in self.Rows:
+            row.SavedSignature=row.Signature()
+
+        return True
+
+    # Load the page from the index.json in fanzineServerDir (see THE DATA FILE, above).  Returns False (having changed
+    # nothing) if there isn't one or it isn't the data file for html, in which case the HTML needs to be parsed.
+    def GetFanzineIndexPageFromData(self, fanzineServerDir: str, html: str) -> bool:
+        digest=HtmlDigest(html)
+        data=None
+        for text in [ServerMirror.GetMirroredCopy(fanzineServerDir, _dataFilename), None]:
+            if text is None:
+                text=ServerMirror.GetFileAsString(fanzineServerDir, _dataFilename)
+            if text is None:
+                continue
+            try:
+                data=json.loads(text)
+            except ValueError as e:
+                Log(f"GetFanzineIndexPageFromData({fanzineServerDir}): {_dataFilename} can't be read: {e}")
+                data=None
+                continue
+            if isinstance(data, dict) and data.get("format") == _dataFormat and data.get("htmldigest") == digest:
+                break
+            data=None
+        if data is None:
+            Log(f"GetFanzineIndexPageFromData({fanzineServerDir}): no {_dataFilename} matching index.html, so the HTML will be parsed")
+            return False
+
+        try:
+            colDefs=ColDefinitionsList([ColDefinition("Link", 100, "url", IsEditable.Maybe)])+ColNamesToColDefs(["Issue"]+data["columns"])
+            rows=[]
+            for r in data["rows"]:
+                fipr=FanzineIndexPageTableRow(colDefs)
+                if len(r["cells"]) != len(colDefs):
+                    raise ValueError(f"a row has {len(r['cells'])} cells but there are {len(colDefs)} columns")
+                fipr.Cells=list(r["cells"])
+                fipr.IsTextRow=r.get("text", False)
+                fipr.IsLinkRow=r.get("link", False)
+                fipr.UpdatedComment=r.get("up", "")
+                rows.append(fipr)
+            names=FanzineNames()
+            names.MainName=data["name"]
+            names.Othernames=data["othernames"]
+            header=(names, data["editors"], data["dates"], data["complete"], data["type"], data["club"], data["locale"],
+                    data["significance"], data["ordering"], data["topcomments"], data["credits"], data["created"], data["updated"])
+        except (KeyError, TypeError, ValueError) as e:
+            Log(f"GetFanzineIndexPageFromData({fanzineServerDir}): {_dataFilename} is malformed: {e}")
+            return False
+
+        (self.Name, self.Editors, self.Dates, self.Complete, self.FanzineType, self.Clubname, self.Locale,
+         self.Significance, self.Ordering, self.TopComments, self.Credits, created, updated)=header
+        self.Created=ClassicFanzinesDate(created)
+        self.Updated=ClassicFanzinesDate(updated)
+        self._version=data.get("version", "2.1")
+        self._colDefs=colDefs
+        self.Rows=rows
+        return True
+
+
+    # Dunno why this keeps croping up in some of the html...
+    def RemoveA0C2Crap(self, s: str) -> str:
+        return RemoveNbspCrap(s)
+
+
+    def GetFanzineIndexPageOld(self, html: str) -> bool:
+        # Parse it with the fast legacy parser if it can, and with BeautifulSoup (which builds the same tree) if it can't
+        soup=ParseLegacyHtml(html)
+        if soup is None:
+            Log("GetFanzineIndexPageOld(): parsing with BeautifulSoup")
+            from bs4 import BeautifulSoup
+            soup=BeautifulSoup(html, 'html.parser')
+        body=soup.findAll("body")
+        if len(body) == 0:
+            LogError("GetFanzineIndexPageOld(): the page has no <body> -- it isn't a Fanzine Index Page and can't be edited with FanzinesEditor.")
+            return False
+        bodytexts=[str(x) for x in body]
+        bodytext="["+", ".join(bodytexts)+"]"       # (As str(body) would have it, without stringifying the body twice)
+
+        bodytext=self.RemoveA0C2Crap(bodytext)
+        _, bodytext=SearchAndReplace(r"(<script>.+?</script>)", bodytext, "", ignorenewlines=True)
+
+        # A standard old-style FIP has (at least) three tables: the topmatter, a spacer, and the issue table.
+        # Special pages (e.g. the APA_Mailings hub) don't -- they aren't FIPs and can't be edited here.
+        tables=body[0].findAll("table")
+        if len(tables) < 3:
+            LogError(f"GetFanzineIndexPageOld(): this page has {len(tables)} table(s) where a Fanzine Index Page has at least 3. "
+                     f"It isn't a standard FIP and can't be edited with FanzinesEditor.")
+            return False
+        top=tables[0]
+        theTable=tables[2]
+        #bottom=tables[3]
+
+        locale=""
+        localeStuff=body[0].findAll("fanac-type")
+        if len(localeStuff) > 0:
+            localeStuff=str(localeStuff[0])
+            _, localeStuff=SearchAndReplace(r"(</?fanac-type>)", localeStuff, "")
+            _, locale=SearchAndReplace(r"(</?h2/?>)", localeStuff, "")
+
+        # Check for the (now obsolete) Alphabetize Individually flag
+        # If we find it set, we set the type choice to "Collection".  We never write out an FIP with the Alphabetize Individually flag set
+        m=re.search(r"<!-- Fanac-keywords: (.*?) -->", bodytexts[0], flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
+        if m is not None:
+            if len(m.groups()[0]) > 10:     # Arbitrary, since the keyword should be "Alphabetize Individually", but has been added by hand so might be mosta nyhting
+                self.FanzineType="Collection"
+
+        name=FanzineNames()
+        editors=""
+        dates=""
+        fanzinetype=""
+        # Extract the fanzine Name, Editors, Dates and Type
+        if len(top.findAll("td")) > 1:
+            topmatter=top.findAll("td")[1]
+            # This looks like:
+            # '<td border="none" class="fmz"><h1 class="sansserif">Apollo<br/><h2>Joe Hensley <br/> Lionel Innman<br/><h2>1943 - 1946<br/><br/>Genzine</h2></h2></h1></td>'
+            # Split it first by <h[12].
+            topmattersplit=re.split(r"</?h[12]/?>", str(topmatter))
+            name.IntepretOldHeader(topmattersplit[0])
+
+            for i, stuff in enumerate(topmattersplit):
+                stuff=re.sub(r"</?br/?>", "\n", stuff)
+                _, stuff=SearchAndReplace(r"(<.*?>)", stuff, "")        # Replace all HTML <xxxx> with empty string
+                topmattersplit[i]=stuff
+            topmattersplit=[x.replace("\n\n", "\n").removesuffix("\n") for x in topmattersplit if x != ""]
+            if len(topmattersplit) == 0:
+                LogError(f"Malformed top matter on page.")
+            # Editors can be separated by "\n", "'", ";" and other stuff.  Split on spans of these characters
+            editors=SplitListOfNamesOnPattern(topmattersplit[1], r", and |,|/|;|and |&|\n|<br>")
+            dates, fanzinetype=topmattersplit[2].replace("&nbsp;", " ").replace("&NBSP;", " ").split("\n")
+
+        # We look for a block of free-form comments.  It should lie between the <fanac-type>...</fanac-type> block and the start of the rows table.
+        loc=html.find("</fanac-type>")
+        if loc != -1:
+            locend=html.find("<TABLE", loc)
+            if locend != -1:
+                s=html[loc+len("</fanac-type>"):locend]
+                s=s.replace("<p>", "\n")
+                s=RemoveAllHTMLLikeTags(s)
+                self.TopComments=s.strip()
+
+        # Now interpret the table to generate the column headers and data rows
+        theRows=theTable.findAll("tr")
+        headers: list[str]=[]
+        if len(theRows) > 0:
+            row0=theRows[0].findAll("th")
+            if len(row0) > 0:
+                headers=[RemoveAllHTMLLikeTags(str(x)) for x in row0]
+
+        # And construct the grid
+        # Column #1 is always a link to the fanzine, and we split this into two parts, the URL and the display text
+        # We prepend a URL column before the Issue column. This will hold the filename which is the URL for the link
+        self._colDefs=ColDefinitionsList([ColDefinition("Link", 100, "url", IsEditable.Maybe)])
+        self._colDefs.append(ColNamesToColDefs(headers))
+
+        # Get the column number of the Mailing column, if any.
+        iMailingCol=None
+        if "Mailing" in self._colDefs:
+            iMailingCol=self._colDefs.index("Mailing")
+
+        if len(theRows) > 1:
+            for thisrow in theRows[1:]:
+                cols=thisrow.findAll("td")
+
+                # We treat column 0 specially, extracting its hyperref and turning it into two
+                cols0=str(cols[0])
+                cols0=self.RemoveA0C2Crap(cols0)
+                _, url, text, _=FindLinkInString(cols0)
+                url=HtmlEscapesToUnicode(url, isURL=True)
+                if url == "" and text == "":
+                    cols0=RemoveAllHTMLLikeTags(cols0)
+                    row=["", cols0]
+                else:
+                    row=[url, text]
+
+                cols=[RegularizeBRTags(str(x)) for x in cols[1:]]   # Turn all <br/> and </br> to <br>
+                cols=[RemoveTopLevelHTMLTags(x, LeaveLinks=True) for x in cols]     # Remove non-link HTML
+                cols=[x if x.strip().lower() != "<br>" else "" for x in cols]   # Remove all <br> (old FIPs sometimes has this in blank cells)
+
+                # We treat the Mailing column (if present) specially by removing the hyperlink to the issue -- it will be returned when it is loaded back to the server.
+                if iMailingCol is not None:
+                    cols[iMailingCol-2]=RemoveAllHTMLLikeTags(cols[iMailingCol-2])      # The -2 is because the first two columns were handled separately, above.
+
+                row.extend(cols)
+                self.Rows.append(FanzineIndexPageTableRow(self._colDefs, row) )
+
+        credits=""
+        loc=bodytext.rfind("</table>")
+        if loc >= 0:
+            lasttext=bodytext[loc+len("</table>"):]
+            lasttext=re.split(r"</?br/?", lasttext)
+            lasttext=[RemoveAllHTMLLikeTags(x) for x in lasttext]
+            lasttext=[x.replace(r"/n", "").replace("\n", "") for x in lasttext]
+            lasttext=[x for x in lasttext if len(x) > 0]
+            if len(lasttext) == 2:
+                credits=lasttext[0]
+
+        # Some old FIPs have a Date column: Try to split it up into Day+Month+Year
+        datecol=max(self.ColHeaderIndex("Date"), self.ColHeaderIndex("(Date)"))
+        if datecol != -1:
+            # OK, first try to add Day, Month and Year cols
+            if self.ColHeaderIndex("Year") == -1:
+                self.InsertColumn2(datecol, gStdColHeaders["Year"])
+            if self.ColHeaderIndex("Day") == -1:
+                self.InsertColumn2(datecol, gStdColHeaders["Day"])
+            if self.ColHeaderIndex("Month") == -1:
+                self.InsertColumn2(datecol, gStdColHeaders["Month"])
+
+            datecol=max(self.ColHeaderIndex("Date"), self.ColHeaderIndex("(Date)"))     # The inserts will shuffle columns, so need to re-evaluate this
+            daycol=self.ColHeaderIndex("Day")
+            monthcol=self.ColHeaderIndex("Month")
+            yearcol=self.ColHeaderIndex("Year")
+            for row in self.Rows:
+                if row[datecol] != "":
+                    date=FanzineDate().Match(row[datecol])
+                    d=InterpretRelativeWords(date.DayText)
+                    if d is None:
+                        d=date.DayText
+                    row[daycol]=d
+                    row[monthcol]=date.MonthText
+                    row[yearcol]=date.YearText
+
+
+
+        Log(f"GetFanzinePageOld():")
+        Log(f"     {len(self.Rows)} rows")
+        Log(f"     {credits=}")
+        Log(f"     {dates=}")
+        Log(f"     {editors=}")
+        Log(f"     {fanzinetype=}")
+        Log(f"     {locale=}")
+        Log(f"     {name.MainName=}")
+        self.Credits=credits
+        self.Dates=dates
+        self.Editors=editors
+        self.FanzineType=fanzinetype
+        self.Locale=locale
+        self._name=name
+
+        return True
+
+
+    @property
+    def Editors(self):
+        return self._Editors
+    @Editors.setter
+    def Editors(self, val: str|list):
+        # Editors are stored canonically as a single newline-separated string (one editor per line).
+        # Some callers (the old/new page loaders) hand us a list, so normalize it here -- this lets
+        # consumers like PutFanzineIndexPage rely on self.Editors being a string (it does .split("\n")).
+        if isinstance(val, list):
+            val="\n".join(val)
+        self._Editors=val
+
+
+
+    def GetFanzineIndexPageNew(self, html: str) -> bool:
+
+        def CleanUnicodeText(s: str) -> str:
+            return HtmlEscapesToUnicode(RemoveFancyLink(s)).strip()
+
+        #html2=CleanUnicodeText(html)        #TODO: What's this all about?
+
+        # (The A0/C2 crap was removed by GetFanzineIndexPage())
+
+        # Update the version number
+        html=InsertInvisibleTextInsideFanacComment(html, "fanzine index page V", "2.1")   # Version being written.  self._version is what was read.
+
+        # f"{self.Name.MainName}<BR><H2>{self.Editors}<BR><H2>{self.Dates}<BR><BR>{self.FanzineType}"
+        topstuff=ExtractHTMLUsingFanacStartEndCommentPair(html, "header")
+        if topstuff == "":
+            LogError(f"GetFanzineIndexPageNew() failed: ExtractHTMLUsingFanacComments('header')")
+            return False
+
+        self.Name.MainName=CleanUnicodeText(ExtractHTMLUsingFanacTagCommentPair(topstuff, "name"))
+        other=ExtractHTMLUsingFanacTagCommentPair(topstuff, "other")
+        other=[CleanUnicodeText(x) for x in [y for y in SplitOnSpansOfLineBreaks(other)]]
+        self.Name.Othernames=other
+        self.Editors=[CleanUnicodeText(x) for x in RemoveHyperlink(ExtractHTMLUsingFanacTagCommentPair(topstuff, "eds"), repeat=True).split("<br>")]
+        self.Dates=ExtractHTMLUsingFanacTagCommentPair(topstuff, "dates")
+        self.Complete="complete" in ExtractHTMLUsingFanacTagCommentPair(topstuff, "complete").lower()
+        self.FanzineType=ExtractHTMLUsingFanacTagCommentPair(topstuff, "type")
+        self.Clubname=CleanUnicodeText(ExtractHTMLUsingFanacTagCommentPair(topstuff, "club"))
+
+        self.Significance=ExtractInvisibleTextInsideFanacComment(html, "sig")
+        self.Ordering=ExtractInvisibleTextInsideFanacComment(html, "ordering") or "Normal"      # Absent on pre-feature pages -> Normal
+
+        # f"<H2>{TurnPythonListIntoWordList(self.Locale)}</H2>"
+        self.Locale=CleanUnicodeText(ExtractHTMLUsingFanacTagCommentPair(html, "loc"))
+        if self.Locale == "":
+            Log(f"GetFanzineIndexPageNew(): ExtractHTMLUsingFanacComments('Locale') -- No locale found")
+        # Remove the <h2>s that tend to decorate it
+
+        comments=ExtractHTMLUsingFanacStartEndCommentPair(html, "topcomments")
+        if comments is not None:
+            self.TopComments=comments.replace("<br>", "\n")
+
+        # Now interpret the table to generate the column headers and data rows
+        headers=ExtractHTMLUsingFanacStartEndCommentPair(html, "table-headers")
+        if headers == "":
+            LogError(f"GetFanzineIndexPageNew() failed: ExtractHTMLUsingFanacComments('table-headers')")
+            return False
+        # Interpret the column headers
+        # f "\n<TR>\n<TH>{self.ColHeaders[1]}</TH>\n"...insert+=f"<TH>{header}</TH>\n" (repeats)..."</TR>\n"
+        headers=_headerCellPattern.findall(headers)
+        self._colDefs=ColNamesToColDefs(headers)
+        # In a normal row, column #1 is always a link to the fanzine, and so for every row, we split this into two parts,
+        # the URL and the display text.
+        # We prepend a URL column before the Issue column. This will hold the filename which is the URL for the link
+        self._colDefs=ColDefinitionsList([ColDefinition("Link", 100, "url", IsEditable.Maybe)])+self._colDefs
+
+        self.Created=ClassicFanzinesDate(ExtractInvisibleTextInsideFanacComment(html, "created"))
+        self.Updated=ClassicFanzinesDate(ExtractHTMLUsingFanacTagCommentPair(html, "updated"))
+
+        # Now the rows
+        rows=ExtractHTMLUsingFanacStartEndCommentPair(html, "table-rows")
+        rows=_tableRowPattern.findall(rows)
+        if rows == "":
+            LogError(f"GetFanzineIndexPageNew() failed: ExtractHTMLUsingFanacComments('table-rows')")
+            return False
+        # Interpret the rows
+        for row in rows:
+
+            # Link rows and text rows are detected by the colspan= which merges all the row's cells into one
+            m=_spannedRowPattern.match(row)
+            if m is not None:
+                fipr=FanzineIndexPageTableRow(self._colDefs)
+                if m.group(3) is None:
+                    # A link row: <TD colspan=...><a href="col 0">col 1</a></TD>
+                    fipr.Cells[0]=m.group(1)
+                    fipr.Cells[1]=m.group(2)
+                    fipr.IsLinkRow=True
+                else:
+                    # It isn't a link row, so it's a pure text row
+                    contents=StripSpecificTag(m.group(3), "b")
+                    contents=ConvertHTMLEscapes(contents)
+                    fipr.Cells[0]=contents
+                    fipr.IsTextRow=True
+                self.Rows.append(fipr)
+                continue
+
+            # OK, it's a regular row.
+
+            # The final "column" is actually a comment containing an updated datetime for the row. (It really isn't a table column at all.)
+            # It may or may not exist.  If it exists, save it for later use.
+            # (If there's more than one, it's the last one on the first line which has any.  This used to be found by
+            # searching for ".*(<!-- Up: ...-->)", which got the same answer but was most of the time taken to parse a page.)
+            updated=""
+            m=_updatedCommentPattern.search(row)
+            if m is not None:
+                eol=row.find("\n", m.end())
+                updated=_updatedCommentPattern.findall(row, m.start(), len(row) if eol < 0 else eol)[-1]
+
+            rowsfound=_tableCellPattern.findall(row)
+            cols=[x[1] for x in rowsfound]
+
+            # We treat the web page's column 0 specially, extracting its hyperref and display name and showing them as two column in FanzinesEditor
+            # The first col is complicated, because it needs to have URLs which match the actual filename on the server. This is only an issue the first time we write a V2.1 or later FIP.
+            # Expand the first col in the FIP into two columns for display
+            cols0=str(cols[0])
+            _, url, text, _=FindLinkInString(cols0)
+
+            # UGLY! Kludge!
+            # Edie requests that links to gostak.org.uk be treated specially and have a hard-wored http:
+            if "gostak.org.uk" in url:
+                url="http:"+url
+
+            # There are at least a few pages which have "&amp;nbsp;" in text -- this should be displayed as "&nbsp;"
+            text=text.replace("&amp;nbsp;", "&nbsp;")
+            if self._version == "2":
+                url=HtmlEscapesToUnicode(url, isURL=True).replace("&amp;", "&")
+            else:
+                url=HtmlEscapesToUnicode(url, isURL=True)
+            if url == "" and text == "":
+                cols=["", cols0]+cols[1:]
+            else:
+                cols=[url, text]+cols[1:]
+
+            if cols is not None:
+                # Remove HTML tags from the columns
+                row=cols[:2]+[RemoveAllHTMLLikeTags(str(x)) for x in cols[2:]]
+                fipr=FanzineIndexPageTableRow(self._colDefs, row)
+            else:
+                fipr=FanzineIndexPageTableRow(self._colDefs)
+                fipr.IsTextRow=True
+
+            fipr.UpdatedComment=updated
+            self.Rows.append(fipr)
+
+        self.Credits=ExtractHTMLUsingFanacStartEndCommentPair(html, "scan").strip()
+
+        # Log(f"GetFanzinePageNew():")
+        # Log(f"     {self.Credits=}")
+        # Log(f"     {self.Dates=}")
+        # Log(f"     {self.Editors=}")
+        # Log(f"     {self.FanzineType=}")
+        # Log(f"     {self.Clubname=}")
+        # Log(f"     {self.Locale=}")
+        # Log(f"     {self.Name.MainName=}")
+
+        return True
+
+
+    # Turn any mailing info into hyperlinks to the mailing on fanac.org
+    def ProcessAPALinks(self, cell: str) -> str:
+        out=[]
+        for apa, number, pm in SplitMailings(cell):
+            if pm:
+                pm=" "+pm
+            out.append(f'<a href="https://fanac.org/fanzines/APA_Mailings/{apa}/{number}.html">{apa} {number}</a>{pm}')
+        return ", ".join(out)
+
+
+    # Using the fanzine index page template, create a page and upload it, first backing up the page it replaces (see ServerBackups).
+    # A page which is the same as the one on the server (but for its Updated footer) isn't uploaded.  LastUpload says which happened.
+    # This puts a Version 2.1 page
+    def PutFanzineIndexPage(self, root: str, url: str) -> bool:        
+        self.LastUpload=""
+        self.LastBackup=""
+        output=self.RenderFanzineIndexPage(url)
+        if output is None:
+            return False
+
+        # If the server's page is the same but for the date in its Updated footer, there's nothing to back up or upload
+        current=ServerMirror.GetFileAsString(f"/{root}/{url}", "index.html", TestLoad=True)
+        if current is None and FTP().FileExists(f"/{root}/{url}/index.html"):
+            LogError(f"Could not download FIP '/{root}/{url}/index.html' to back it up because {FTP().LastMessage}")
+            return False
+        if current is not None:
+            if PageDigest(current) == PageDigest(output):
+                Log(f"PutFanzineIndexPage({url}): the page on the server is unchanged, so it was not uploaded")
+                self.LastUpload="unchanged"
+                return True
+            backup=BackupServerText(f"/{root}/{url}", "index.html", current)
+            if backup is None:
+                return False
+            self.LastBackup=backup
+
+        ret=FTP().PutFileAsString(f"/{root}/{url}", "index.html", output, create=True)
+        if not ret:
+            LogError(f"Could not FTP().PutFileAsString FIP '/{root}/{url}/index.html' because {FTP().LastMessage}")
+            return False
+        ServerMirror.Store(f"/{root}/{url}", "index.html", output)
+        self.LastUpload="uploaded"
+
+        # Now the data file.  (If this fails, it doesn't matter much: its digest won't match the new page, so it won't be used.)
+        if ExtractInvisibleTextInsideFanacComment(output, "data").strip() == _dataFilename:
+            data=self.RenderFanzineIndexData(output)
+            if FTP().PutFileAsString(f"/{root}/{url}", _dataFilename, data, create=True):
+                ServerMirror.Store(f"/{root}/{url}", _dataFilename, data)
+            else:
+                Log(f"Could not FTP().PutFileAsString '/{root}/{url}/{_dataFilename}' because {FTP().LastMessage}")
+
+        return ret
+
+
+    # Create the index.json data file which goes with the page's HTML, html (see THE DATA FILE, above)
+    def RenderFanzineIndexData(self, html: str) -> str:
+        rows=[]
+        for row in self.Rows:
+            r={"cells": row.Cells}
+            if row.IsTextRow:
+                r["text"]=True
+            if row.IsLinkRow:
+                r["link"]=True
+            if row.UpdatedComment != "":
+                r["up"]=row.UpdatedComment
+            rows.append(r)
+        # The created and updated dates are taken from the HTML so they're just what parsing it would find
+        data={"format": _dataFormat, "htmldigest": HtmlDigest(html), "version": "2.1",
+              "name": self.Name.MainName, "othernames": self.Name.Othernames, "editors": self.Editors, "dates": self.Dates,
+              "complete": self.Complete, "type": self.FanzineType, "club": self._clubname, "locale": self.Locale,
+              "significance": self.Significance, "ordering": self.Ordering, "topcomments": self.TopComments, "credits": self.Credits,
+              "created": ExtractInvisibleTextInsideFanacComment(html, "created"), "updated": ExtractHTMLUsingFanacTagCommentPair(html, "updated"),
+              "columns": self.ColHeaders[2:], "rows": rows}
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+    # Using the fanzine index page template, create the page's HTML.  Returns None if that fails.
+    def RenderFanzineIndexPage(self, url: str) -> str|None:
+
+        # Get the Fanzine Index Page template
+        template=LoadFanzineIndexPageTemplate()
+        if template is None:
+            LogError(f"PutFanzineIndexPage({url}) failed: unable to load '{_templateFilename}'")
+            return None
+        if len(self.ColHeaders) < 2:
+            LogError(f"PutFanzineIndexPage({url}) failed: {len(self.ColHeaders)=}")
+            return None
+
+        # The <head> matter: <meta name="description"...> and <title>
+        edlist=", ".join([x for x in self.Editors.split("\n")])
+        names=[self.Name.MainName]
+        names.extend(self.Name.Othernames)
+        namelist=", ".join(names)
+        content=f'{namelist}, {edlist}, {self.Dates.strip()}, {self.FanzineType.strip()}'
+        if self.Clubname != "":
+            content+=f", {self.Clubname}"
+        meta=f'meta name="description" content="{content}"'
+
+        values: dict[str, str]={
+            "meta": UnicodeToHtmlEscapes(meta),
+            "title": UnicodeToHtmlEscapes(self.Name.MainName),
+            "name": UnicodeToHtmlEscapes(self.Name.MainName),
+            "other": self.Name.OthernamesAsHTML,
+            "eds": "<br>".join([SpecialNameFormatToHtmlFancylink(UnicodeToHtmlEscapes(x.strip())) for x in self.Editors.split("\n")]),
+            "dates": UnicodeToHtmlEscapes(self.Dates.strip()),
+            "complete": "(Complete)" if self.Complete else "",
+            "type": self.FanzineType.strip(),
+            "club": f" - {UnicodeToHtmlEscapes(self.Clubname)}" if self.Clubname != "" else "",
+            "loc": TurnPythonListIntoWordList(self.Locale),
+            "sig": self.Significance,
+            "ordering": self.Ordering,
+            "data": _dataFilename,
+            "topcomments": self.TopComments.replace("\n", "<br>").strip(),
+            "keywords": "",     # Not currently being used
+            "table-headers": self.RenderTableHeaders(),
+            "table-rows": self.RenderTableRows(),
+            "scan": UnicodeToHtmlEscapes(self.Credits),
+            "updated": f"Updated {ClassicFanzinesDate().Now()}",
+        }
+        # (We don't always have a credit in the file, so a missing "scan" isn't worth a mention.)
+        if "updated" not in template.Slots:
+            LogError(f"Could not InsertUsingFanacComments('updated')")
+
+        return template.Render(values)
+
+
+    # The table's column headers
+    def RenderTableHeaders(self) -> str:
+        # The 1st col is the URL, and it gets mixed with the 2nd to form an Href.
+        headers=["\n<TR>\n", f"<TH>Issue</TH>\n"]
+        for header in self.ColHeaders[2:]:
+            headers.append(f"<TH>{header}</TH>\n")
+        headers.append("</TR>\n")
+        return "".join(headers)
+
+
+    # The table's rows.
+    # Each row keeps the HTML it was last rendered as (see FanzineIndexPageTableRow.Rendered), and it is re-rendered only if
+    # it has changed since: if its cells, its kind, its updated comment or the table's columns are different.  So
+    # re-uploading a page after a few edits re-renders just the rows edited.
+    def RenderTableRows(self) -> str:
+        headers=self.ColHeaders
+        layout=(self.NumCols, tuple(headers))
+        # Accumulate the table lines in <rows>
+        rows: list[str]=[]
+        for row in self.Rows:
+            # Record the update date of an ordinary line
+            if not row.IsEmptyRow and not row.IsTextRow and not row.IsLinkRow and row.SavedSignature != row.Signature():
+                # We have to update the updated comment before rendering it
+                row.UpdatedComment=f"<!-- Up: {datetime.now():%Y-%m-%d}-->"
+
+            key=(layout, tuple(row.Cells), row.IsTextRow, row.IsLinkRow, row.UpdatedComment)
+            if row.Rendered is None or row.Rendered[0] != key:
+                row.Rendered=(key, self.RenderTableRow(row, headers))
+            rows.append(row.Rendered[1])
+
+        return "".join(rows)
+
+
+    def RenderTableRow(self, row: FanzineIndexPageTableRow, headers: list[str]) -> str:
+        if row.IsEmptyRow:
+            return "\n<TR>"+"<TD>&nbsp;</TD>\n"*(self.NumCols-1)+"</TR>\n"
+
+        if row.IsTextRow:
+            # If the row is an anchor for an in-page href, we need to detect it and handle it correctly.
+            contents=row.Cells[0]
+            if not re.match(r"<a name=.*>", contents, flags=re.IGNORECASE):
+                contents=UnicodeToHtmlEscapes(contents)
+            return f'\n<TR><TD colspan="{self.NumCols}"><b>{contents}</b></TD></TR>'
+
+        if row.IsLinkRow:
+            return fr'\n<TR><TD colspan="{self.NumCols}"><a href="{row.Cells[0]}">{UnicodeToHtmlEscapes(row.Cells[1])}</a></TD></TR>'
+
+        # OK, it's an ordinary row
+        # Unfortunately, some legacy ordinary rows don't have a file to point to -- they're just place holders.
+        # We must handle them specially.
+        # Format cols 0 and 1 into a single column for the website
+        out=[f"\n<TR>"]
+        href=row.Cells[0].replace("#", "%23").replace("&", "%26").strip()
+        if href != "":
+            out.append(f'\n<TD><a href="{href}">{row.Cells[1]}</A></TD>\n')
+        else:
+            out.append(f'\n<TD>{row.Cells[1]}</TD>\n')
+        # And now the rest
+        for i, cell in enumerate(row.Cells[2:]):
+            if headers[i+2].lower() == "mailing":
+                out.append(f"<TD CLASS='left'>{self.ProcessAPALinks(cell)}</TD>\n")
+            else:
+                out.append(f"<TD CLASS='left'>{cell}</TD>\n")
+        out.append(row.UpdatedComment+"\n")
+        out.append(f"</TR>\n")
+        return "".join(out)
+
+
+def SetPDFMetadata(pdfPathFilename: str, row: FanzineIndexPageTableRow, colNames: ColDefinitionsList, editors: str="", mainName: str="", country: str="") -> str:
+
+    from pypdf import PdfWriter
+    try:
+        writer=PdfWriter(clone_from=pdfPathFilename)
+    except FileNotFoundError:
+        LogError(f"SetPDFMetadata: Unable to open file {pdfPathFilename}")
+        return ""
+
+    # Title, issue, date, editors, country code, apa
+    metadata={"/Title": row.Cells[colNames.index("Display Text")], "/Author": editors.replace("<br>", ", ")}
+    if len(editors) > 0:
+        metadata["/Author"]=editors
+
+    keywords=f"{mainName}, "
+    if "Year" in colNames:
+        keywords+=f", {row.Cells[colNames.index('Year')]}"
+    if "Mailing" in colNames:
+        keywords+=f", {row.Cells[colNames.index('Mailing')]}"
+    if len(country) > 0:
+        keywords+=f", {country}"
+    metadata["/Keywords"]=keywords
+
+    # Add the metadata.
+    try:
+        writer.add_metadata(metadata)
+    except:
+        LogError(f"SetPDFMetadata().writer.add_metadata(metadata) with file {pdfPathFilename} threw an exception: Ignored")
+
+    # Use the temporary directory
+    tmpdirname=gettempdir()
+    Log(f"Temporary directory: {tmpdirname}")
+    filename=os.path.basename(pdfPathFilename)
+    Log(f"{filename=}")
+    newfilepath=os.path.join(tmpdirname, filename)
+    Log(f"{newfilepath=}")
+
+    with open(newfilepath, 'wb') as fp:
+        writer.write(fp)
+    return newfilepath
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+# Background prefetch of fanzine index pages.
+#
+# Opening a fanzine means downloading and parsing its index page while the user waits.  When it looks like the user is
+# about to open one (a search has narrowed the list to a few fanzines, or a fanzine has been clicked or hovered over),
+# the main window asks for it to be prefetched: it is loaded on a background thread into an in-memory cache, and
+# FanzineIndexPageWindow takes it from there instead of loading it itself.
+#
+# The cache is an LRU bounded by the total size of its pages (as measured by their HTML) -- the "Prefetch cache MB"
+# setting, default 32.  (0 turns prefetching off.)  A cached page is only used if its index.html's stamp on the server
+# (see FTPStat) hasn't changed since it was loaded, and it is removed from the cache when it is taken, since it's about
+# to be edited.
+#
+# There is only the one connection to the server, and it mustn't be used by two threads at once.  So there is a single
+# prefetch thread (not a pool), and anything on the main thread which uses the server while prefetching may be going on
+# must do so inside Paused(), which waits for the page being loaded (if any) and holds off further prefetching.
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from FTPStat import ServerFileStamp
+from Log import Log
+from Settings import Settings
+
+if TYPE_CHECKING:
+    from FanzineIndexPage import FanzineIndexPage     # (Imported by the prefetch thread when it first needs it, to keep the page model out of startup)
+
+
+_maxPending=8       # Prefetch requests which haven't been started yet beyond this many are dropped, oldest first
+
+
+class FanzineIndexPageCache:
+    g_pages: OrderedDict[str, tuple[FanzineIndexPage, str, int]]=OrderedDict()     # serverDir -> (page, stamp, size), least recently wanted first
+    g_size: int=0
+    g_pending: list[str]=[]                 # The serverDirs waiting to be prefetched, most wanted last
+    g_paused: int=0
+    g_condition=threading.Condition()       # Guards all of the above
+    g_serverLock=threading.Lock()           # Held by the prefetch thread while it's using the server
+    g_thread: threading.Thread|None=None
+
+
+    @staticmethod
+    def MaxSize() -> int:
+        try:
+            return int(float(Settings().Get("Prefetch cache MB", "32"))*1024*1024)
+        except ValueError:
+            return 32*1024*1024
+
+
+    # Ask for some fanzines' pages to be loaded in the background, the most wanted first
+    @staticmethod
+    def Prefetch(serverDirs: list[str]) -> None:
+        if FanzineIndexPageCache.MaxSize() <= 0:
+            return
+        cache=FanzineIndexPageCache
+        with cache.g_condition:
+            for serverDir in reversed(serverDirs):
+                if serverDir in cache.g_pages:
+                    cache.g_pages.move_to_end(serverDir)
+                    continue
+                if serverDir in cache.g_pending:
+                    cache.g_pending.remove(serverDir)
+                cache.g_pending.append(serverDir)
+            del cache.g_pending[:-_maxPending]
+            if cache.g_thread is None:
+                cache.g_thread=threading.Thread(target=FanzineIndexPageCache._Prefetcher, daemon=True)
+                cache.g_thread.start()
+            cache.g_condition.notify()
+
+
+    # Take a fanzine's page from the cache.  Returns None if it isn't there or is out of date.
+    @staticmethod
+    def Take(serverDir: str) -> FanzineIndexPage|None:
+        cache=FanzineIndexPageCache
+        with cache.g_condition:
+            entry=cache.g_pages.pop(serverDir, None)
+            if entry is None:
+                return None
+            cache.g_size-=entry[2]
+
+        fip, stamp, _=entry
+        with FanzineIndexPageCache.Paused():
+            current=ServerFileStamp(fip.ServerPath, "index.html")
+        if current is None or current != stamp:
+            Log(f"FanzineIndexPageCache.Take({serverDir}): the prefetched page is out of date")
+            return None
+        Log(f"FanzineIndexPageCache.Take({serverDir}): using the prefetched page")
+        return fip
+
+
+    # Use the server on this thread: wait for the prefetch thread to finish with it, and keep it from starting again until done
+    @staticmethod
+    @contextmanager
+    def Paused():
+        cache=FanzineIndexPageCache
+        with cache.g_condition:
+            cache.g_paused+=1
+        with cache.g_serverLock:
+            pass
+        try:
+            yield
+        finally:
+            with cache.g_condition:
+                cache.g_paused-=1
+                cache.g_condition.notify()
+
+
+    # Stop prefetching for good (e.g., at shutdown, before the server connection is closed)
+    @staticmethod
+    def Stop() -> None:
+        cache=FanzineIndexPageCache
+        with cache.g_condition:
+            cache.g_paused+=1
+            cache.g_pending.clear()
+        with cache.g_serverLock:
+            pass
+
+
+    @staticmethod
+    def _Prefetcher() -> None:
+        from FanzineIndexPage import FanzineIndexPage       # Not needed until something is prefetched, so not imported at startup
+        cache=FanzineIndexPageCache
+        while True:
+            with cache.g_condition:
+                while len(cache.g_pending) == 0 or cache.g_paused > 0:
+                    cache.g_condition.wait()
+                serverDir=cache.g_pending.pop()
+                if serverDir in cache.g_pages:
+                    continue
+                cache.g_serverLock.acquire()        # (Taken while holding the condition, so Paused() can't slip in between)
+
+            stamp=None
+            fip=FanzineIndexPage()
+            try:
+                if fip.GetFanzineIndexPage(serverDir):
+                    stamp=ServerFileStamp(fip.ServerPath, "index.html")
+            except Exception as e:
+                Log(f"FanzineIndexPageCache: prefetching {serverDir} failed: {e}")
+            finally:
+                cache.g_serverLock.release()
+            if stamp is not None:
+                FanzineIndexPageCache._Add(serverDir, fip, stamp)
+
+
+    @staticmethod
+    def _Add(serverDir: str, fip: FanzineIndexPage, stamp: str) -> None:
+        cache=FanzineIndexPageCache
+        size=len(fip.SourceHtml)
+        maxSize=FanzineIndexPageCache.MaxSize()
+        with cache.g_condition:
+            cache.g_pages[serverDir]=(fip, stamp, size)
+            cache.g_size+=size
+            # Evict the least recently wanted pages until it fits (but always keep the one just loaded)
+            while cache.g_size > maxSize and len(cache.g_pages) > 1:
+                _, (_, _, evicted)=cache.g_pages.popitem(last=False)
+                cache.g_size-=evicted
+        Log(f"FanzineIndexPageCache: prefetched {serverDir}  ({len(cache.g_pages)} pages, {cache.g_size//1024}K cached)")
@@ -5,40 +5,36 @@ import wx
 import wx.grid
 import re
 import shutil
+import sqlite3
 from datetime import datetime
 from math import floor, ceil
-from tempfile import gettempdir
 
-from bs4 import BeautifulSoup
-import bs4
-from pypdf import PdfWriter
-import pyperclip
+# pypdf (via PDFHelpers) and pyperclip are slow to import and needed only for PDFs and the clipboard,
+# so they're imported where they're used rather than here.
 
-from FTPLog import FTPLog
+from FTPLog import FTPLog, Tagit
 from GenGUIClass import FanzineIndexPageEditGen
-from ClassicFanzinesLine import ClassicFanzinesLine, ClassicFanzinesDate
+from ClassicFanzinesLine import ClassicFanzinesLine
 from DeltaTracker import DeltaTracker
 from FanzineNames import FanzineNames
-from FanzineDateTime import FanzineDate, InterpretRelativeWords
+from FanzineDateTime import FanzineDate
 from FanzineIndexPageTableRow import FanzineIndexPageTableRow
+from FanzineIndexPage import FanzineIndexPage, SetPDFMetadata, gStdColHeaders
+from FanzineIndexPageCache import FanzineIndexPageCache
+from FanzinesCatalog import FanzinesCatalog, CatalogPath
 from FanzineIndexPageOrdering import AnalyzeOrdering as AnalyzeFIPOrdering, ParseMessyNumber
 
 from FTP import FTP
 
-from WxDataGrid import DataGrid, Color, GridDataSource, ColDefinition, ColDefinitionsList, IsEditable
+from GridDataModel import ColDefinition, ColDefinitionsList, IsEditable
+from WxDataGrid import DataGrid, GridDataSource, Color
 from WxHelpers import OnCloseHandling3, ProcessChar, GuardReentry, SetWindowIcon
 from WxHelpers import ModalDialogManager, ProgressMessage2
-from HelpersPackage import IsInt, Int0, Int, ZeroIfNone, RemoveTopLevelHTMLTags, RegularizeBRTags, Pluralize, PyiResourcePath
+from HelpersPackage import IsInt, Int0, Int, ZeroIfNone, Pluralize, PyiResourcePath
 from HelpersPackage import SortMessyNumber, SortTitle, SortPersonsName
-from HelpersPackage import  FindLinkInString, FindIndexOfStringInList, FindIndexOfStringInList2, FindAndReplaceSingleBracketedText, FindAndReplaceBracketedText
-from HelpersPackage import InsertBetweenHTMLComments, RemoveHyperlinkContainingPattern, CanonicizeColumnHeaders, RemoveArticles
-from HelpersPackage import MakeFancyLink, RemoveFancyLink, WikiUrlnameToWikiPagename, SplitOnSpansOfLineBreaks
-from HelpersPackage import SearchAndReplace, RemoveAllHTMLLikeTags, TurnPythonListIntoWordList, StripSpecificTag, RemoveHyperlink
-from HelpersPackage import InsertHTMLUsingFanacStartEndCommentPair, ExtractHTMLUsingFanacStartEndCommentPair, SplitListOfNamesOnPattern
-from HelpersPackage import  ExtractInvisibleTextInsideFanacComment, TimestampFilename, InsertInvisibleTextInsideFanacComment, ExtractHTMLUsingFanacTagCommentPair
-from HelpersPackage import RemoveAccents, ExtractTrailingSequenceNumber
-from PDFHelpers import GetPdfPageCount
-from HtmlHelpersPackage import HtmlEscapesToUnicode, UnicodeToHtmlEscapes, ConvertHTMLEscapes
+from HelpersPackage import  FindLinkInString, FindIndexOfStringInList, FindIndexOfStringInList2
+from HelpersPackage import RemoveHyperlinkContainingPattern, CanonicizeColumnHeaders, RemoveArticles, RemoveHyperlink
+from HelpersPackage import RemoveAccents, ExtractTrailingSequenceNumber, TimestampFilename
 from Log import Log, LogError
 from Settings import Settings
 from FanzineDateTime import MonthNameToInt
@@ -131,41 +127,7 @@ def _AnalyzeSpelling(rows, nameCol: int, declaredNames: list[str],
                 break
     return flagged
 
-# Create default column headers
-gStdColHeaders: ColDefinitionsList=ColDefinitionsList([
-    ColDefinition("Filename", Type="str", IsEditable=IsEditable.Maybe),
-    ColDefinition("Display Text", Type="str"),
-    ColDefinition("Link", Type="url"),
-    ColDefinition("Text", Type="required str"),
-    ColDefinition("Title", Type="str", Preferred="Display Text"),
-    ColDefinition("Whole", Type="int", Width=75),
-    ColDefinition("WholeNum", Type="int", Width=75, Preferred="Whole"),
-    ColDefinition("Vol", Type="int", Width=50),
-    ColDefinition("Volume", Type="int", Width=50, Preferred="Vol"),
-    ColDefinition("Num", Type="int", Width=50),
-    ColDefinition("Number", Type="int", Width=50, Preferred="Num"),
-    ColDefinition("Month", Type="month", Width=75),
-    ColDefinition("Day", Type="day", Width=50),
-    ColDefinition("Year", Type="year", Width=50),
-    ColDefinition("Pages", Type="int", Width=50),
-    ColDefinition("PDF", Type="str", Width=50),
-    ColDefinition("Notes", Type="str", Width=120),
-    ColDefinition("Scanned", Type="str", Width=100),
-    ColDefinition("Scan", Type="str", Width=100, Preferred="Scanned"),
-    ColDefinition("Scanned By", Type="str", Width=100, Preferred="Scanned"),
-    ColDefinition("Country", Type="str", Width=50),
-    ColDefinition("Editor", Type="str", Width=75),
-    ColDefinition("Author", Type="str", Width=75),
-    ColDefinition("Mailing", Type="str", Width=75),
-    ColDefinition("Repro", Type="str", Width=75)
-])
-
-
-def Tagit(tag: str, contents: str) -> str:
-    contents=contents.strip()
-    if contents == "":
-        return ""
-    return f"<{tag}>{contents}</{tag}>"
+
 
 def ColSelect(row: FanzineIndexPageTableRow, coldefs: ColDefinitionsList, colname: str) -> str:
     if colname in coldefs:
@@ -215,26 +177,6 @@ def IssueNumber(row: FanzineIndexPageTableRow, coldefs: ColDefinitionsList) -> s
 
 
 
-def SpecialNameFormatToHtmlFancylink(val: str|None) ->str|None:
-    if val is None:
-        return None
-
-    # "Uncredited" is not linked
-    if "uncredited" in val.lower() or "various" in val.lower():
-        return val
-
-    # If "|" present, input format is <fancyName|displayName>
-    if "|" in val:
-        fancyName, displayName = val.split("|", 1)
-        return MakeFancyLink(fancyName, displayName)
-
-    return MakeFancyLink(val)
-
-
-def HtmlFancylinkToSpecialNameFormat(val: str) -> str:
-    return WikiUrlnameToWikiPagename(val)
-
-
 #####################################################################################
 # Background tint marking the row a drag-and-drop would land above (see _UpdateDragHighlight).
 gColorDragHighlight=wx.Colour(198, 224, 255)   # light blue, distinct from the grid's pink/yellow/purple colors
@@ -255,6 +197,21 @@ class _GridFileDropTarget(wx.FileDropTarget):
         self._win._ClearDragHighlight()
 
 
+# The window's DataGrid works on the page model with WxDataGrid's GridDataSource underneath it, for whatever else the
+# DataGrid needs.  (The model's own methods, including its column handling from GridDataModel, come first.)
+class FanzineIndexPageGridSource(FanzineIndexPage, GridDataSource):
+    def __init__(self):
+        GridDataSource.__init__(self)
+        FanzineIndexPage.__init__(self)
+
+    # A page which has already been loaded (e.g., prefetched by FanzineIndexPageCache), as a grid source
+    @staticmethod
+    def FromPage(fip: FanzineIndexPage) -> FanzineIndexPageGridSource:
+        source=FanzineIndexPageGridSource()
+        source.__dict__.update(fip.__dict__)
+        return source
+
+
 class FanzineIndexPageWindow(FanzineIndexPageEditGen):
     def __init__(self, parent, serverDir: str= "", ExistingFanzinesServerDirs: list[str]|None=None) -> None:
         FanzineIndexPageEditGen.__init__(self, parent)
@@ -320,7 +277,7 @@ class FanzineIndexPageWindow(FanzineIndexPageEditGen):
         self._spellNameCol: int=1       # The column checked for mis-spelled fanzine names (normally Display Text)
 
         self._dataGrid: DataGrid=DataGrid(self.wxGrid, ColorSingleCellByValue=self.ColorSingleCellByValueOverride)
-        self.Datasource=FanzineIndexPage()
+        self.Datasource=FanzineIndexPageGridSource()
 
         # Dynamic per-cell tooltips: when the mouse hovers a colored (problem) cell, explain the problem.
         # This is runtime-only (wxFormBuilder can't do dynamic cell tooltips), so it lives here in the subclass.
@@ -366,12 +323,16 @@ class FanzineIndexPageWindow(FanzineIndexPageEditGen):
 
         else:
             # This is an existing directory
-            # Load the fanzine index page
-            with ModalDialogManager(ProgressMessage2,f"Downloading Fanzine Index Page: '{serverDir}'", parent=parent):
-                self.failure=False
-                if not self.Datasource.GetFanzineIndexPage(serverDir):
-                    self.failure=True
-                    return
+            # Load the fanzine index page (unless the main window has already prefetched it)
+            self.failure=False
+            fip=FanzineIndexPageCache.Take(serverDir)
+            if fip is not None:
+                self.Datasource=fip
+            else:
+                with ModalDialogManager(ProgressMessage2,f"Downloading Fanzine Index Page: '{serverDir}'", parent=parent):
+                    if not self.Datasource.GetFanzineIndexPage(serverDir):
+                        self.failure=True
+                        return
 
             # Now load the fanzine issue data
             #self._dataGrid.HideRowLabels()
@@ -434,10 +395,12 @@ class FanzineIndexPageWindow(FanzineIndexPageEditGen):
 
 
     @property
-    def Datasource(self) -> FanzineIndexPage:   
+    def Datasource(self) -> FanzineIndexPageGridSource:   
         return self._Datasource
     @Datasource.setter
     def Datasource(self, val: FanzineIndexPage):
+        if not isinstance(val, FanzineIndexPageGridSource):
+            val=FanzineIndexPageGridSource.FromPage(val)
         self._Datasource=val
         self._dataGrid.Datasource=val
 
@@ -455,6 +418,22 @@ class FanzineIndexPageWindow(FanzineIndexPageEditGen):
         return self.tServerDirectory.GetValue()
 
 
+    # Put the cursor on (and scroll to) a row found by the main window's search of the catalog.  The page may have been
+    # edited since it was catalogued, so the row whose display text matches nearest to irow is preferred to irow itself.
+    def ShowRow(self, irow: int, displayText: str="") -> None:
+        rows=self.Datasource.Rows
+        if displayText != "":
+            col=lambda row: 0 if row.IsTextRow else 1      # (A text row's text is all in its first cell)
+            matches=[i for i, row in enumerate(rows) if len(row.Cells) > col(row) and row.Cells[col(row)] == displayText]
+            if len(matches) > 0:
+                irow=min(matches, key=lambda i: abs(i-irow))
+        if irow < 0 or irow >= min(len(rows), self._dataGrid.NumRows):
+            return
+        self.wxGrid.SetGridCursor(irow, 1)
+        self.wxGrid.MakeCellVisible(irow, 1)
+        self._dataGrid.SelectRows(irow, irow)
+
+
     # Look at information available and color buttons and fields accordingly.
     def EnableDialogFields(self):                      
         # See also UpdateDialogComponentEnabledStatus
@@ -674,6 +653,7 @@ class FanzineIndexPageWindow(FanzineIndexPageEditGen):
     # Check the rows to see if any of the files are a pdf
     # If a pdf is found possibly add a PDF column and fill the PDF column in for those rows.
     def FillInPagesColumn(self) -> None:                
+        from PDFHelpers import GetPdfPageCount      # (Imports pypdf)
         iPages=self.Datasource.ColHeaderIndex("pages")
 
         if iPages == -1:
@@ -891,14 +871,6 @@ class FanzineIndexPageWindow(FanzineIndexPageEditGen):
                     if not FTP().CopyFile(f"/fanzines/{self.ServerDir}", f"/{self.RootDir}/{self.ServerDir}", "index.html", Create=True):
                         wx.MessageBox(f"Attempt to copy index.html from /fanzines/{self.ServerDir} to /{self.RootDir}/{self.ServerDir} failed with error message {FTP().LastMessage}.")
 
-            # Make a dated backup copy of the existing index page
-            ret=FTP().BackupServerFile(f"/{self.RootDir}/{self.ServerDir}/index.html")
-            if not ret:
-                Log(f"Could not make a backup copy: {self.RootDir}/{self.ServerDir}/{TimestampFilename('index.html')} because {FTP().LastMessage}")
-                self.failure=True
-                return
-            FTPLog().AppendItemVerb("backup index.html", f"{Tagit("RootDir", self.RootDir)} {Tagit("ServerDir", self.ServerDir)}", Flush=True)
-
             pm.Update(f"Uploading new Fanzine Index Page: {self.ServerDir}")
 
             def MoveToLocalDirectory(sourcepath: str, localdirpath: str, filename: str):
@@ -1013,12 +985,31 @@ class FanzineIndexPageWindow(FanzineIndexPageEditGen):
                 Log("Failed\n")
                 return
 
-            Log("All uploads succeeded.")
-            FTPLog().AppendItemVerb("upload FIP succeeded", f"{Tagit("RootDir", self.RootDir)} {Tagit("ServerDir", self.ServerDir)}", Flush=True)
-
-            self.CFL=cfl
-
-            self._uploaded=True
+            # (PutFanzineIndexPage() backs up the existing index page itself, unless the page is unchanged and nothing was uploaded)
+            if self.Datasource.LastBackup != "":
+                FTPLog().AppendItemVerb("backup index.html", f"{Tagit("RootDir", self.RootDir)} {Tagit("ServerDir", self.ServerDir)} {Tagit("Backup", self.Datasource.LastBackup)}", Flush=True)
+            if self.Datasource.LastUpload == "unchanged":
+                Log("The index page is unchanged, so it was not uploaded.")
+                FTPLog().AppendItemVerb("upload FIP unchanged", f"{Tagit("RootDir", self.RootDir)} {Tagit("ServerDir", self.ServerDir)}", Flush=True)
+            else:
+                Log("All uploads succeeded.")
+                FTPLog().AppendItemVerb("upload FIP succeeded", f"{Tagit("RootDir", self.RootDir)} {Tagit("ServerDir", self.ServerDir)}", Flush=True)
+
+            # Bring the local catalog's entry for this fanzine up to date.  (It's only a local convenience, so a failure is just logged.)
+            # If there's no catalog, one isn't started here: a catalog of just the fanzines uploaded since would look complete to
+            # searches, so it must be built by the batch mode's bulk import.
+            if os.path.exists(CatalogPath()):
+                try:
+                    with FanzinesCatalog() as catalog:
+                        catalog.Update(self.ServerDir, self.Datasource)
+                except sqlite3.Error as e:
+                    LogError(f"Unable to update the catalog for {self.ServerDir}: {e}")
+
+            # The Classic Fanzines list's entry only changes (and gets a new Updated date) if the page was actually uploaded
+            if self.Datasource.LastUpload != "unchanged":
+                self.CFL=cfl
+
+            self._uploaded=True     # (Even if unchanged, the server now has the page as it stands)
             self.MarkAsSaved()
 
             # Once a new fanzine has been uploaded, the server and local directories are no longer changeable
@@ -1046,6 +1037,8 @@ class FanzineIndexPageWindow(FanzineIndexPageEditGen):
             if "Editor" in self.Datasource.ColDefs:  # Editor in the row overrides editors for the whole zine series
                 editors=row[self.Datasource.ColDefs.index("Editor")]
             copyfilepath=SetPDFMetadata(sourcepath+"/"+sourcefilename, row, self.Datasource.ColDefs, editors=editors, mainName=mainName, country=country)
+            if copyfilepath == "":
+                wx.MessageBox(f"Unable to open file {sourcepath}/{sourcefilename}")
             assert copyfilepath != ""
         else:
             copyfilepath=os.path.join(sourcepath, sourcefilename)
@@ -1357,6 +1350,7 @@ class FanzineIndexPageWindow(FanzineIndexPageEditGen):
 
 
     def OnButtonClickCopyServerDir(self, event):
+        import pyperclip
         pyperclip.copy(self.tServerDirectory.GetValue())
         event.Skip()
 
@@ -2572,779 +2566,3 @@ class FanzineIndexPageWindow(FanzineIndexPageEditGen):
         self.RefreshWindow()
 
 
-#*******************************************
-# Take a list of column names and generate a list of ColDefs
-def ColNamesToColDefs(headers: list[str]) -> ColDefinitionsList:
-    colDefs: ColDefinitionsList=ColDefinitionsList([])
-    for header in headers:
-        # First cannonicize the header
-        if header.lower() == "issue":
-            header="Display Text"   # Display text is unique to Fanzines Index Page??
-        elif header.lower() == "title":
-            header="Display Text"   # But a few pages usne "Title"
-        else:
-            header=CanonicizeColumnHeaders(header)
-
-        if header in gStdColHeaders:
-            scd=gStdColHeaders[gStdColHeaders.index(header)]
-        else:
-            header=header.strip("(").strip(")")     # Remove existing parens so when we add one back. there's just one.
-            scd=ColDefinition(f"({header})", Type="str", Width=75)  # The default when it's unrecognizable
-
-        colDefs.append(scd)
-    return colDefs
-
-
-#####################################################################################################
-#####################################################################################################
-# FanzineIndexPage -- the data model for a single fanzine's index page (one fanzine series).
-#
-# PAGE FORMAT VERSIONS
-# --------------------
-# A fanzine index page on the server is an HTML file (index.html) whose format has evolved.
-# The version is recorded in an invisible HTML comment: <!-- fanac fanzine index page V<x> -->
-# and is read back by GetFanzineIndexPage() via ExtractInvisibleTextInsideFanacComment(..., "fanzine index page V").
-#
-#   Version ""   -- Legacy "Jack" pages. No version tag. Free-form HTML: the data lives in
-#                   <h1>/<h2> topmatter, a <fanac-type> locale block, and the 3rd <table>.
-#                   Parsed by GetFanzineIndexPageOld() (BeautifulSoup-based, tolerant of messiness).
-#                   May carry a single "Date" column (split into Month/Day/Year on load) and the
-#                   obsolete "Alphabetize Individually" keyword (mapped to FanzineType "Collection").
-#   Version "2"  -- First generation of FanzinesEditor-written pages. Structured: all fields are
-#                   delimited by fanac HTML comment pairs (header/name/eds/dates/type/club/loc/
-#                   topcomments/table-headers/table-rows/scan/created/updated). Parsed by
-#                   GetFanzineIndexPageNew().
-#   Version "2.1"-- Same structure as V2, but (starting mid-December 2024) guarantees that
-#                   ampersands in issue URLs are encoded correctly. This is the version we WRITE.
-#
-# READ vs WRITE
-# -------------
-# Reads may encounter any of the three versions; GetFanzineIndexPage() dispatches on the tag.
-# Writes are always emitted as V2.1 (see PutFanzineIndexPage(), which sets the tag to "2.1" and
-# percent-encodes '#' and '&' in hrefs). So opening any older page and re-uploading migrates it forward.
-#
-# THE V2 AMPERSAND FIXUP (load-bearing -- do not remove casually)
-# --------------------------------------------------------------
-# V2 pages mis-encoded the '&' in URLs (e.g. a file like "Laurel & Hardy.pdf"). When a page is
-# read as V2 (self._version == "2"), GetFanzineIndexPageNew() normalizes "&amp;" back to "&" in
-# each row's URL so the link matches the real filename on the server. V2.1+ pages skip this.
-# Because every save rewrites the page as V2.1 with correct encoding, this branch only matters the
-# first time a genuine V2 page is opened; getting it wrong corrupts issue links, so leave it intact.
-#####################################################################################################
-
-class FanzineIndexPage(GridDataSource):
-    def __init__(self):
-        GridDataSource.__init__(self)
-        self._colDefs: ColDefinitionsList=ColDefinitionsList([])
-        self._fanzineList: list[FanzineIndexPageTableRow]=[]
-        self._gridDataRowClass=FanzineIndexPageTableRow
-        self._specialTextColor: Color|None=None
-        self.TopComments: str=""
-        self._locale: list[str]=[]
-        self._name: FanzineNames=FanzineNames()
-        self._clubname: str=""
-        self._betterScanNeeded: bool=False
-        self._Editors: str=""
-        self._version: str=""
-        self.Dates: str=""
-        self.Significance: str="Unclassified"
-        self.Ordering: str="Normal"     # Row-ordering mode: "Normal", "Collection", or "Other". Ordering checks run only for "Normal".
-        self.FanzineType: str=""
-        self.Complete=False     # Is this fanzine series complete?
-        self.Credits=""         # Who is to be credited for this affair?
-        self.Updated: ClassicFanzinesDate=ClassicFanzinesDate("Long, long ago")
-        self.Created: ClassicFanzinesDate=ClassicFanzinesDate("Long, long ago")
-
-
-    def Signature(self) -> int:        
-        s=0
-        if self._colDefs is not None:
-            s+=self._colDefs.Signature()
-        s+=hash(f"{self._name};{self.TopComments.strip()};{' '.join(self.Locale).strip()}")
-        s+=hash(f"{self.TopComments.strip()};{self.Significance}")
-        s+=hash(f"{self.Name.MainName};{self.Editors};{self.Dates};{self.FanzineType};{self.Clubname};{self.Credits};{self.Ordering}")
-        s+=sum([x.Signature()*(i+1) for i, x in enumerate(self._fanzineList)])
-        s+=hash(self._specialTextColor)
-        return s
-
-
-    # Inherited from GridDataSource
-    @property
-    def Rows(self) -> list[FanzineIndexPageTableRow]:        
-        return self._fanzineList
-    @Rows.setter
-    def Rows(self, rows: list) -> None:        
-        self._fanzineList=rows
-
-
-    @property
-    def NumRows(self) -> int:        
-        return len(self._fanzineList)
-
-    def __getitem__(self, index: int) -> FanzineIndexPageTableRow:        
-        return self.Rows[index]
-
-    def __setitem__(self, index: int, val: FanzineIndexPageTableRow) -> None:        
-        self._fanzineList[index]=val
-
-
-    @property
-    def SpecialTextColor(self) -> Color|None:        
-        return self._specialTextColor
-    @SpecialTextColor.setter
-    def SpecialTextColor(self, val: Color|None) -> None:        
-        self._specialTextColor=val
-
-
-    def __str__(self) -> str:
-        return str(self.Updated)
-
-
-    def CanAddColumns(self) -> bool:        
-        return True
-
-
-    def InsertEmptyRows(self, insertat: int, num: int=1) -> None:        
-        for i in range(num):
-            ftr=FanzineIndexPageTableRow(self._colDefs)
-            self._fanzineList.insert(insertat+i, ftr)
-
-
-    @property
-    def Name(self) -> FanzineNames:
-        return self._name
-    @Name.setter
-    def Name(self, val: FanzineNames) -> None:
-        assert isinstance(val, FanzineNames)
-        self._name=val
-
-
-    @property
-    def Locale(self) -> list[str]:
-        return self._locale
-    @Locale.setter
-    def Locale(self, val: list[str]|str) -> None:
-        if isinstance(val, str):
-            val=[val]
-        self._locale=val
-    @property
-    def LocaleAsText(self) -> str:
-        return "\n".join(self._locale)
-
-    @property
-    def Clubname(self) -> str:
-        if self.FanzineType.lower() == "clubzine":
-            return self._clubname.strip()
-        return ""
-    @Clubname.setter
-    def Clubname(self, val: str) -> None:
-        # We want to ignore leading spaces or a leading hyphen
-        val=val.strip()
-        if len(val) > 0 and val[0] == "-":
-            val=val[1:].strip()
-        self._clubname=val
-
-
-    @property
-    def TextAndHrefCols(self) -> tuple[int, int]:
-        return self._colDefs.index("Display Text"), self._colDefs.index("Link")
-
-
-    @staticmethod
-    def SelectNonNavigableStrings(soupstuff) -> list:        
-        return [x for x in soupstuff if not isinstance(x, bs4.element.NavigableString)]
-
-
-    # Download a fanzine index page fanac.org/fanzines/URL and fill in the class
-    def GetFanzineIndexPage(self, url: str) -> bool:
-        fanzineServerDir=""
-        testRootDirectory=Settings().Get("Test Root directory")
-        html=None
-        if Settings().Get("Test mode", "False") == "True":
-            if testRootDirectory != "":
-                # If there is a test directory, try loading from there, first
-                fanzineServerDir=f"/{testRootDirectory}/{url}"
-                html=FTP().GetFileAsString(fanzineServerDir, "index.html", TestLoad=True)
-        if html is None:
-            # If we're not in test mode or if that failed (or there wasn't one) load from the default server directory
-            fanzineServerDir=f"/{Settings().Get("Root directory")}/{url}"
-            html=FTP().GetFileAsString(fanzineServerDir, "index.html")
-        if html is None:
-            LogError(f"Unable to download 'index.html' from '{url}' because {FTP().LastMessage}")
-            return False
-
-        # Remove the &amp;amp;amp;amp;amp;... that has crept in to some pages.
-        while "&amp;amp;" in html:
-            html=html.replace("amp;amp;", "amp;")
-            Log(f"redundant 'amp;'s removed from {url}")
-
-        # This is the tag that marks a new-style page and its version.
-        # e.g., <!-- fanac fanzine index page V1.0-->
-        # Version " " -- old (Jack) pages
-        # Version "2" -- The first batch of FanzinesEditor pages
-        # Version "2.1" -- starting mid-December 2024, pages where we have guaranteed that ampersands in URLs are correctly written
-        self._version=ExtractInvisibleTextInsideFanacComment(html, "fanzine index page V").strip()
-        if self._version == "":
-            success=self.GetFanzineIndexPageOld(html)
-        else:
-            success=self.GetFanzineIndexPageNew(html)
-
-        if not success:
-            return False
-
-        # Get the signatures of each line to later use to see if the line has been updated.
-        for row in self.Rows:
-            row.SavedSignature=row.Signature()
-
-        return True
-
-    # Dunno why this keeps croping up in some of the html...
-    def RemoveA0C2Crap(self, s: str) -> str:
-        x=s.replace("\xc2\xa0", " ").replace(u"\u00A0", " ")
-        x=x.replace("0xa0", " ").replace("0xc2", " ")
-        return x
-
-
-    def GetFanzineIndexPageOld(self, html: str) -> bool:
-        soup=BeautifulSoup(html, 'html.parser')
-        body=soup.findAll("body")
-        if len(body) == 0:
-            LogError("GetFanzineIndexPageOld(): the page has no <body> -- it isn't a Fanzine Index Page and can't be edited with FanzinesEditor.")
-            return False
-        bodytext=str(body)
-
-        bodytext=self.RemoveA0C2Crap(bodytext)
-        _, bodytext=SearchAndReplace(r"(<script>.+?</script>)", bodytext, "", ignorenewlines=True)
-
-        # A standard old-style FIP has (at least) three tables: the topmatter, a spacer, and the issue table.
-        # Special pages (e.g. the APA_Mailings hub) don't -- they aren't FIPs and can't be edited here.
-        tables=body[0].findAll("table")
-        if len(tables) < 3:
-            LogError(f"GetFanzineIndexPageOld(): this page has {len(tables)} table(s) where a Fanzine Index Page has at least 3. "
-                     f"It isn't a standard FIP and can't be edited with FanzinesEditor.")
-            return False
-        top=tables[0]
-        theTable=tables[2]
-        #bottom=tables[3]
-
-        locale=""
-        localeStuff=body[0].findAll("fanac-type")
-        if len(localeStuff) > 0:
-            localeStuff=str(localeStuff[0])
-            _, localeStuff=SearchAndReplace(r"(</?fanac-type>)", localeStuff, "")
-            _, locale=SearchAndReplace(r"(</?h2/?>)", localeStuff, "")
-
-        # Check for the (now obsolete) Alphabetize Individually flag
-        # If we find it set, we set the type choice to "Collection".  We never write out an FIP with the Alphabetize Individually flag set
-        m=re.search(r"<!-- Fanac-keywords: (.*?) -->", str(body[0]), flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
-        if m is not None:
-            if len(m.groups()[0]) > 10:     # Arbitrary, since the keyword should be "Alphabetize Individually", but has been added by hand so might be mosta nyhting
-                self.FanzineType="Collection"
-
-        name=FanzineNames()
-        editors=""
-        dates=""
-        fanzinetype=""
-        # Extract the fanzine Name, Editors, Dates and Type
-        if len(top.findAll("td")) > 1:
-            topmatter=top.findAll("td")[1]
-            # This looks like:
-            # '<td border="none" class="fmz"><h1 class="sansserif">Apollo<br/><h2>Joe Hensley <br/> Lionel Innman<br/><h2>1943 - 1946<br/><br/>Genzine</h2></h2></h1></td>'
-            # Split it first by <h[12].
-            topmattersplit=re.split(r"</?h[12]/?>", str(topmatter))
-            name.IntepretOldHeader(topmattersplit[0])
-
-            for i, stuff in enumerate(topmattersplit):
-                stuff=re.sub(r"</?br/?>", "\n", stuff)
-                _, stuff=SearchAndReplace(r"(<.*?>)", stuff, "")        # Replace all HTML <xxxx> with empty string
-                topmattersplit[i]=stuff
-            topmattersplit=[x.replace("\n\n", "\n").removesuffix("\n") for x in topmattersplit if x != ""]
-            if len(topmattersplit) == 0:
-                LogError(f"Malformed top matter on page.")
-            # Editors can be separated by "\n", "'", ";" and other stuff.  Split on spans of these characters
-            editors=SplitListOfNamesOnPattern(topmattersplit[1], r", and |,|/|;|and |&|\n|<br>")
-            dates, fanzinetype=topmattersplit[2].replace("&nbsp;", " ").replace("&NBSP;", " ").split("\n")
-
-        # We look for a block of free-form comments.  It should lie between the <fanac-type>...</fanac-type> block and the start of the rows table.
-        loc=html.find("</fanac-type>")
-        if loc != -1:
-            locend=html.find("<TABLE", loc)
-            if locend != -1:
-                s=html[loc+len("</fanac-type>"):locend]
-                s=s.replace("<p>", "\n")
-                s=RemoveAllHTMLLikeTags(s)
-                self.TopComments=s.strip()
-
-        # Now interpret the table to generate the column headers and data rows
-        theRows=theTable.findAll("tr")
-        headers: list[str]=[]
-        if len(theRows) > 0:
-            row0=theRows[0].findAll("th")
-            if len(row0) > 0:
-                headers=[RemoveAllHTMLLikeTags(str(x)) for x in row0]
-
-        # And construct the grid
-        # Column #1 is always a link to the fanzine, and we split this into two parts, the URL and the display text
-        # We prepend a URL column before the Issue column. This will hold the filename which is the URL for the link
-        self._colDefs=ColDefinitionsList([ColDefinition("Link", 100, "url", IsEditable.Maybe)])
-        self._colDefs.append(ColNamesToColDefs(headers))
-
-        # Get the column number of the Mailing column, if any.
-        iMailingCol=None
-        if "Mailing" in self._colDefs:
-            iMailingCol=self._colDefs.index("Mailing")
-
-        if len(theRows) > 1:
-            for thisrow in theRows[1:]:
-                Log(f"Row: {thisrow}")
-
-                cols=thisrow.findAll("td")
-
-                # We treat column 0 specially, extracting its hyperref and turning it into two
-                cols0=str(cols[0])
-                cols0=self.RemoveA0C2Crap(cols0)
-                _, url, text, _=FindLinkInString(cols0)
-                url=HtmlEscapesToUnicode(url, isURL=True)
-                if url == "" and text == "":
-                    cols0=RemoveAllHTMLLikeTags(cols0)
-                    row=["", cols0]
-                else:
-                    row=[url, text]
-
-                cols=[RegularizeBRTags(str(x)) for x in cols[1:]]   # Turn all <br/> and </br> to <br>
-                cols=[RemoveTopLevelHTMLTags(x, LeaveLinks=True) for x in cols]     # Remove non-link HTML
-                cols=[x if x.strip().lower() != "<br>" else "" for x in cols]   # Remove all <br> (old FIPs sometimes has this in blank cells)
-
-                # We treat the Mailing column (if present) specially by removing the hyperlink to the issue -- it will be returned when it is loaded back to the server.
-                if iMailingCol is not None:
-                    cols[iMailingCol-2]=RemoveAllHTMLLikeTags(cols[iMailingCol-2])      # The -2 is because the first two columns were handled separately, above.
-
-                row.extend(cols)
-                self.Rows.append(FanzineIndexPageTableRow(self._colDefs, row) )
-
-        credits=""
-        loc=bodytext.rfind("</table>")
-        if loc >= 0:
-            lasttext=bodytext[loc+len("</table>"):]
-            lasttext=re.split(r"</?br/?", lasttext)
-            lasttext=[RemoveAllHTMLLikeTags(x) for x in lasttext]
-            lasttext=[x.replace(r"/n", "").replace("\n", "") for x in lasttext]
-            lasttext=[x for x in lasttext if len(x) > 0]
-            if len(lasttext) == 2:
-                credits=lasttext[0]
-
-        # Some old FIPs have a Date column: Try to split it up into Day+Month+Year
-        datecol=max(self.ColHeaderIndex("Date"), self.ColHeaderIndex("(Date)"))
-        if datecol != -1:
-            # OK, first try to add Day, Month and Year cols
-            if self.ColHeaderIndex("Year") == -1:
-                self.InsertColumn2(datecol, gStdColHeaders["Year"])
-            if self.ColHeaderIndex("Day") == -1:
-                self.InsertColumn2(datecol, gStdColHeaders["Day"])
-            if self.ColHeaderIndex("Month") == -1:
-                self.InsertColumn2(datecol, gStdColHeaders["Month"])
-
-            datecol=max(self.ColHeaderIndex("Date"), self.ColHeaderIndex("(Date)"))     # The inserts will shuffle columns, so need to re-evaluate this
-            daycol=self.ColHeaderIndex("Day")
-            monthcol=self.ColHeaderIndex("Month")
-            yearcol=self.ColHeaderIndex("Year")
-            for row in self.Rows:
-                if row[datecol] != "":
-                    date=FanzineDate().Match(row[datecol])
-                    d=InterpretRelativeWords(date.DayText)
-                    if d is None:
-                        d=date.DayText
-                    row[daycol]=d
-                    row[monthcol]=date.MonthText
-                    row[yearcol]=date.YearText
-
-
-
-        Log(f"GetFanzinePageOld():")
-        Log(f"     {credits=}")
-        Log(f"     {dates=}")
-        Log(f"     {editors=}")
-        Log(f"     {fanzinetype=}")
-        Log(f"     {locale=}")
-        Log(f"     {name.MainName=}")
-        self.Credits=credits
-        self.Dates=dates
-        self.Editors=editors
-        self.FanzineType=fanzinetype
-        self.Locale=locale
-        self._name=name
-
-        return True
-
-
-    @property
-    def Editors(self):
-        return self._Editors
-    @Editors.setter
-    def Editors(self, val: str|list):
-        # Editors are stored canonically as a single newline-separated string (one editor per line).
-        # Some callers (the old/new page loaders) hand us a list, so normalize it here -- this lets
-        # consumers like PutFanzineIndexPage rely on self.Editors being a string (it does .split("\n")).
-        if isinstance(val, list):
-            val="\n".join(val)
-        self._Editors=val
-
-
-
-    def GetFanzineIndexPageNew(self, html: str) -> bool:
-
-        def CleanUnicodeText(s: str) -> str:
-            return HtmlEscapesToUnicode(RemoveFancyLink(s)).strip()
-
-        #html2=CleanUnicodeText(html)        #TODO: What's this all about?
-
-        html=self.RemoveA0C2Crap(html)
-
-        # Update the version number
-        html=InsertInvisibleTextInsideFanacComment(html, "fanzine index page V", "2.1")   # Version being written.  self._version is what was read.
-
-        # f"{self.Name.MainName}<BR><H2>{self.Editors}<BR><H2>{self.Dates}<BR><BR>{self.FanzineType}"
-        topstuff=ExtractHTMLUsingFanacStartEndCommentPair(html, "header")
-        if topstuff == "":
-            LogError(f"GetFanzineIndexPageNew() failed: ExtractHTMLUsingFanacComments('header')")
-            return False
-
-        self.Name.MainName=CleanUnicodeText(ExtractHTMLUsingFanacTagCommentPair(topstuff, "name"))
-        other=ExtractHTMLUsingFanacTagCommentPair(topstuff, "other")
-        other=[CleanUnicodeText(x) for x in [y for y in SplitOnSpansOfLineBreaks(other)]]
-        self.Name.Othernames=other
-        self.Editors=[CleanUnicodeText(x) for x in RemoveHyperlink(ExtractHTMLUsingFanacTagCommentPair(topstuff, "eds"), repeat=True).split("<br>")]
-        self.Dates=ExtractHTMLUsingFanacTagCommentPair(topstuff, "dates")
-        self.Complete="complete" in ExtractHTMLUsingFanacTagCommentPair(topstuff, "complete").lower()
-        self.FanzineType=ExtractHTMLUsingFanacTagCommentPair(topstuff, "type")
-        self.Clubname=CleanUnicodeText(ExtractHTMLUsingFanacTagCommentPair(topstuff, "club"))
-
-        self.Significance=ExtractInvisibleTextInsideFanacComment(html, "sig")
-        self.Ordering=ExtractInvisibleTextInsideFanacComment(html, "ordering") or "Normal"      # Absent on pre-feature pages -> Normal
-
-        # f"<H2>{TurnPythonListIntoWordList(self.Locale)}</H2>"
-        self.Locale=CleanUnicodeText(ExtractHTMLUsingFanacTagCommentPair(html, "loc"))
-        if self.Locale == "":
-            Log(f"GetFanzineIndexPageNew(): ExtractHTMLUsingFanacComments('Locale') -- No locale found")
-        # Remove the <h2>s that tend to decorate it
-
-        comments=ExtractHTMLUsingFanacStartEndCommentPair(html, "topcomments")
-        if comments is not None:
-            self.TopComments=comments.replace("<br>", "\n")
-
-        # Now interpret the table to generate the column headers and data rows
-        headers=ExtractHTMLUsingFanacStartEndCommentPair(html, "table-headers")
-        if headers == "":
-            LogError(f"GetFanzineIndexPageNew() failed: ExtractHTMLUsingFanacComments('table-headers')")
-            return False
-        # Interpret the column headers
-        # f "\n<TR>\n<TH>{self.ColHeaders[1]}</TH>\n"...insert+=f"<TH>{header}</TH>\n" (repeats)..."</TR>\n"
-        headers=re.findall(r"<TH>(.+?)</TH>", headers, flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
-        self._colDefs=ColNamesToColDefs(headers)
-        # In a normal row, column #1 is always a link to the fanzine, and so for every row, we split this into two parts,
-        # the URL and the display text.
-        # We prepend a URL column before the Issue column. This will hold the filename which is the URL for the link
-        self._colDefs=ColDefinitionsList([ColDefinition("Link", 100, "url", IsEditable.Maybe)])+self._colDefs
-
-        self.Created=ClassicFanzinesDate(ExtractInvisibleTextInsideFanacComment(html, "created"))
-        self.Updated=ClassicFanzinesDate(ExtractHTMLUsingFanacTagCommentPair(html, "updated"))
-
-        # Now the rows
-        rows=ExtractHTMLUsingFanacStartEndCommentPair(html, "table-rows")
-        rows=re.findall(r"<TR>(.+?)</TR>", rows, flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
-        if rows == "":
-            LogError(f"GetFanzineIndexPageNew() failed: ExtractHTMLUsingFanacComments('table-rows')")
-            return False
-        # Interpret the rows
-        for row in rows:
-
-            # First look for a link row
-            # This starts with colspan= and is followed by <a href="col 0">col 1</a></TD>
-            m=re.match(r'<TD colspan=\"[0-9]+\">(<a href=\"(.*?)">(.*?)</a>)</TD>', row, flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
-            if m is not None:
-                fipr=FanzineIndexPageTableRow(self._colDefs)
-                fipr.Cells[0]=m.groups()[1]
-                fipr.Cells[1]=m.groups()[2]
-                fipr.IsLinkRow=True
-                self.Rows.append(fipr)
-                continue
-
-            # Next look for a row which is a pure text row
-            # We detect the colspan= which merges all the row's cells into one, and since it isn't a link row, it's a text row
-            m=re.match(r'<TD colspan=\"[0-9]+\">(.*?)</TD>', row, flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
-            if m is not None:
-                fipr=FanzineIndexPageTableRow(self._colDefs)
-                contents=StripSpecificTag(m.groups()[0], "b")
-                contents=ConvertHTMLEscapes(contents)
-                fipr.Cells[0]=contents
-
-                fipr.IsTextRow=True
-                self.Rows.append(fipr)
-                continue
-
-            # OK, it's a regular row.
-
-            # The final "column" is actually a comment containing an updated datetime for the row. (It really isn't a table column at all.)
-            # It may or may not exist.  If it exists, save it for later use.
-            updated=""
-            m=re.search(".*(<!-- Up: [0-9 -]*-->)", row)
-            if m is not None:
-                updated=m.groups()[0]
-
-            rowsfound=re.findall(r"<TD(:?.*?)>(.*?)</TD>", row, flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
-            cols=[x[1] for x in rowsfound]
-
-            # We treat the web page's column 0 specially, extracting its hyperref and display name and showing them as two column in FanzinesEditor
-            # The first col is complicated, because it needs to have URLs which match the actual filename on the server. This is only an issue the first time we write a V2.1 or later FIP.
-            # Expand the first col in the FIP into two columns for display
-            cols0=str(cols[0])
-            _, url, text, _=FindLinkInString(cols0)
-
-            # UGLY! Kludge!
-            # Edie requests that links to gostak.org.uk be treated specially and have a hard-wored http:
-            if "gostak.org.uk" in url:
-                url="http:"+url
-
-            # There are at least a few pages which have "&amp;nbsp;" in text -- this should be displayed as "&nbsp;"
-            text=text.replace("&amp;nbsp;", "&nbsp;")
-            if self._version == "2":
-                url=HtmlEscapesToUnicode(url, isURL=True).replace("&amp;", "&")
-            else:
-                url=HtmlEscapesToUnicode(url, isURL=True)
-            if url == "" and text == "":
-                cols=["", cols0]+cols[1:]
-            else:
-                cols=[url, text]+cols[1:]
-
-            if cols is not None:
-                # Remove HTML tags from the columns
-                row=cols[:2]+[RemoveAllHTMLLikeTags(str(x)) for x in cols[2:]]
-                fipr=FanzineIndexPageTableRow(self._colDefs, row)
-            else:
-                fipr=FanzineIndexPageTableRow(self._colDefs)
-                fipr.IsTextRow=True
-
-            fipr.UpdatedComment=updated
-            self.Rows.append(fipr)
-
-        self.Credits=ExtractHTMLUsingFanacStartEndCommentPair(html, "scan").strip()
-
-        # Log(f"GetFanzinePageNew():")
-        # Log(f"     {self.Credits=}")
-        # Log(f"     {self.Dates=}")
-        # Log(f"     {self.Editors=}")
-        # Log(f"     {self.FanzineType=}")
-        # Log(f"     {self.Clubname=}")
-        # Log(f"     {self.Locale=}")
-        # Log(f"     {self.Name.MainName=}")
-
-        return True
-
-
-    # Turn any mailing info into hyperlinks to the mailing on fanac.org
-    def ProcessAPALinks(self, cell: str) -> str:
-        if len(cell) == 0:
-            return ""
-
-        mailings=cell.replace(",", "&").replace(";", "&").split("&")     # It may be of the form 'FAPA 103 PM, OMPA 32 & SAPS 76A'
-        out=[]
-        for mailing in mailings:
-            mailing=mailing.strip()
-            if len(mailing) == 0:
-                continue
-            # Split mailing titles like FAPA 103A into an apa name and the mailing number (which may have trailing characters '30A')
-            m=re.match(r"([a-zA-Z'1-9_\- ]*)\s+([0-9]+[a-zA-Z]*)\s*(pm|postmailing)?$", mailing, flags=re.IGNORECASE)
-            if m is not None:
-                apa=m.groups()[0]
-                number=m.groups()[1]
-                pm=m.groups()[2]
-                if pm:
-                    pm=" "+pm
-                else:
-                    pm=""
-                out.append(f'<a href="https://fanac.org/fanzines/APA_Mailings/{apa}/{number}.html">{apa} {number}</a>{pm}')
-        return ", ".join(out)
-
-
-    # Using the fanzine index page template, create a page and upload it.
-    # This puts a Version 2.1 page
-    def PutFanzineIndexPage(self, root: str, url: str) -> bool:        
-
-        # Get the Fanzine Index Page template
-        if not os.path.exists("Template - Fanzine Index Page.html"):
-            LogError(f"PutFanzineIndexPage() can't find ';'Template - Fanzine Index Page.html' at {os.path.curdir}")
-            return False
-        with open("Template - Fanzine Index Page.html") as f:
-            output=f.read()
-
-        # Insert the <head> matter: <meta name="description"...> and <title>
-        edlist=", ".join([x for x in self.Editors.split("\n")])
-        names=[self.Name.MainName]
-        names.extend(self.Name.Othernames)
-        namelist=", ".join(names)
-        content=f'{namelist}, {edlist}, {self.Dates.strip()}, {self.FanzineType.strip()}'
-        if self.Clubname != "":
-            content+=f", {self.Clubname}"
-        meta=f'meta name="description" content="{content}"'
-        output=FindAndReplaceSingleBracketedText(output, "meta name=", f"<{UnicodeToHtmlEscapes(meta)}>")
-
-        output, rslt=FindAndReplaceBracketedText(output, "title", f"<title>{UnicodeToHtmlEscapes(self.Name.MainName)}</title>", caseInsensitive=True)
-
-        output=InsertBetweenHTMLComments(output, "name", UnicodeToHtmlEscapes(self.Name.MainName))
-        output=InsertBetweenHTMLComments(output, "other", self.Name.OthernamesAsHTML)
-        output=InsertBetweenHTMLComments(output, "eds", "<br>".join([SpecialNameFormatToHtmlFancylink(UnicodeToHtmlEscapes(x.strip())) for x in self.Editors.split("\n")]))
-        output=InsertBetweenHTMLComments(output, "dates", UnicodeToHtmlEscapes(self.Dates.strip()))
-        output=InsertBetweenHTMLComments(output, "complete", "(Complete)" if self.Complete else "")
-        output=InsertBetweenHTMLComments(output, "type", self.FanzineType.strip())
-        output=InsertBetweenHTMLComments(output, "club", f" - {UnicodeToHtmlEscapes(self.Clubname)}" if self.Clubname != "" else "")
-        output=InsertBetweenHTMLComments(output, "loc", TurnPythonListIntoWordList(self.Locale))
-
-        output=InsertInvisibleTextInsideFanacComment(output, "sig", self.Significance)
-        output=InsertInvisibleTextInsideFanacComment(output, "ordering", self.Ordering)
-
-        #insert=UnicodeToHtmlEscapes(self.TopComments).replace("\n", "<br>")
-        insert=self.TopComments.replace("\n", "<br>")
-        temp=InsertHTMLUsingFanacStartEndCommentPair(output, "topcomments", insert.strip())
-        if temp == "":
-            LogError(f"PutFanzineIndexPage({url}) failed: InsertHTMLUsingFanacComments('topcomments')")
-            return False
-        output=temp
-
-        keywords=""     # Not currently being used
-        temp=InsertInvisibleTextInsideFanacComment(output, "keywords", keywords)
-        if temp == "":
-            LogError(f"PutFanzineIndexPage({url}) failed: InsertInvisibleTextUsingFanacComments('fanac-keywords')")
-            return False
-        output=temp
-
-        # Now interpret the table to generate the column headers and data rows
-        # The 1st col is the URL, and it gets mixed with the 2nd to form an Href.
-        insert="\n<TR>\n"
-        if len(self.ColHeaders) < 2:
-            LogError(f"PutFanzineIndexPage({url}) failed: {len(self.ColHeaders)=}")
-            return False
-        insert+=f"<TH>Issue</TH>\n"
-        for header in self.ColHeaders[2:]:
-            insert+=f"<TH>{header}</TH>\n"
-        insert+="</TR>\n"
-        temp=InsertHTMLUsingFanacStartEndCommentPair(output, "table-headers", insert)
-        if temp == "":
-            LogError(f"PutFanzineIndexPage({url}) failed: InsertHTMLUsingFanacComments('table-headers')")
-            return False
-        output=temp
-
-        # Now the rows:
-        # Accumulate the table lines in <insert>
-        insert=""
-        for row in self.Rows:
-
-            if row.IsEmptyRow:
-                insert+=f"\n<TR>"
-                for i in range(self.NumCols-1):
-                    insert+=f"<TD>&nbsp;</TD>\n"
-                insert+=f"</TR>\n"
-                continue
-
-            if row.IsTextRow:
-                # If the row is an anchor for an in-page href, we need to detect it and handle it correctly.
-                contents=row.Cells[0]
-                if not re.match(r"<a name=.*>", contents, flags=re.IGNORECASE):
-                    contents=UnicodeToHtmlEscapes(contents)
-                insert+=f'\n<TR><TD colspan="{self.NumCols}"><b>{contents}</b></TD></TR>'
-                continue
-
-            if row.IsLinkRow:
-                insert+=fr'\n<TR><TD colspan="{self.NumCols}"><a href="{row.Cells[0]}">{UnicodeToHtmlEscapes(row.Cells[1])}</a></TD></TR>'
-                continue
-
-            # OK, it's an ordinary row
-            # Unfortunately, some legacy ordinary rows don't have a file to point to -- they're just place holders.
-            # We must handle them specially.
-            # Format cols 0 and 1 into a single column for the website
-            insert+=f"\n<TR>"
-            href=row.Cells[0].replace("#", "%23").replace("&", "%26").strip()
-            if href != "":
-                insert+=f'\n<TD><a href="{href}">{row.Cells[1]}</A></TD>\n'
-            else:
-                insert+=f'\n<TD>{row.Cells[1]}</TD>\n'
-            # And now the rest
-            for i, cell in enumerate(row.Cells[2:]):
-                if self.ColHeaders[i+2].lower() == "mailing":
-                    insert+=f"<TD CLASS='left'>{self.ProcessAPALinks(cell)}</TD>\n"
-                else:
-                    insert+=f"<TD CLASS='left'>{cell}</TD>\n"
-
-            # Record the update date of this line
-            if row.SavedSignature != row.Signature():
-                # We have to update the updated comment before appending it
-                row.UpdatedComment=f"<!-- Up: {datetime.now():%Y-%m-%d}-->"
-            insert+=row.UpdatedComment+"\n"
-            insert+=f"</TR>\n"
-
-        # Insert the accumulated table lines into the template
-        temp=InsertHTMLUsingFanacStartEndCommentPair(output, "table-rows", insert)
-        if temp == "":
-            LogError(f"PutFanzineIndexPage({url}) failed: InsertHTMLUsingFanacComments('table-rows')")
-            return False
-        output=temp
-
-        temp=InsertHTMLUsingFanacStartEndCommentPair(output, "scan", UnicodeToHtmlEscapes(self.Credits))
-        # Different test because we don't always have a credit in the file.
-        if len(temp) > 0:
-            output=temp
-
-        # Update the updated text at the bottom of the page
-        temp=InsertHTMLUsingFanacStartEndCommentPair(output, "updated", f"Updated {ClassicFanzinesDate().Now()}")
-        if temp == "":
-            LogError(f"Could not InsertUsingFanacComments('updated')")
-        else:
-            output=temp
-
-        ret=FTP().PutFileAsString(f"/{root}/{url}", "index.html", output, create=True)
-        if not ret:
-            LogError(f"Could not FTP().PutFileAsString FIP '/{root}/{url}/index.html' because {FTP().LastMessage}")
-
-        return ret
-
-
-
-def SetPDFMetadata(pdfPathFilename: str, row: FanzineIndexPageTableRow, colNames: ColDefinitionsList, editors: str="", mainName: str="", country: str="") -> str:
-
-    try:
-        writer=PdfWriter(clone_from=pdfPathFilename)
-    except FileNotFoundError:
-        wx.MessageBox(f"Unable to open file {pdfPathFilename}")
-        LogError(f"SetPDFMetadata: Unable to open file {pdfPathFilename}")
-        return ""
-
-    # Title, issue, date, editors, country code, apa
-    metadata={"/Title": row.Cells[colNames.index("Display Text")], "/Author": editors.replace("<br>", ", ")}
-    if len(editors) > 0:
-        metadata["/Author"]=editors
-
-    keywords=f"{mainName}, "
-    if "Year" in colNames:
-        keywords+=f", {row.Cells[colNames.index('Year')]}"
-    if "Mailing" in colNames:
-        keywords+=f", {row.Cells[colNames.index('Mailing')]}"
-    if len(country) > 0:
-        keywords+=f", {country}"
-    metadata["/Keywords"]=keywords
-
-    # Add the metadata.
-    try:
-        writer.add_metadata(metadata)
-    except:
-        LogError(f"SetPDFMetadata().writer.add_metadata(metadata) with file {pdfPathFilename} threw an exception: Ignored")
-
-    # Use the temporary directory
-    tmpdirname=gettempdir()
-    Log(f"Temporary directory: {tmpdirname}")
-    filename=os.path.basename(pdfPathFilename)
-    Log(f"{filename=}")
-    newfilepath=os.path.join(tmpdirname, filename)
-    Log(f"{newfilepath=}")
-
-    with open(newfilepath, 'wb') as fp:
-        writer.write(fp)
-    return newfilepath
\ No newline at end of file
@@ -1,19 +1,20 @@
 from __future__ import annotations
 
-from WxDataGrid import ColDefinitionsList, GridDataRowClass
+from GridDataModel import ColDefinitionsList
 from HelpersPackage import CanonicizeColumnHeaders
 
 #=============================================================
 # An individual fanzine to be listed in a fanzine index table
-# This is a single row
-class FanzineIndexPageTableRow(GridDataRowClass):
+# This is a single row.  (It isn't derived from WxDataGrid's GridDataRowClass, so that the model can be used without wx --
+# see GridDataModel.)
+class FanzineIndexPageTableRow:
 
     def __init__(self, coldefs: ColDefinitionsList, row: None | list[str]=None) -> None:
-        GridDataRowClass.__init__(self)
         self.FileSourcePath: str=""
         self._tableColdefs=coldefs
         self.SavedSignature: int=0
         self.UpdatedComment: str=""
+        self.Rendered: tuple[tuple, str]|None=None     # What the row was last rendered from and the HTML it was rendered as (see FanzineIndexPage.RenderTableRows())
         # Analysis verdicts are stored on the row itself (not in row-index sets) so that when rows are moved,
         # their coloring travels with them and stays correct without a whole-grid recolor.
         self.MisorderedReason: str=""       # Non-empty -> row is out of order (yellow); the text is the tooltip
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+# Command-line batch maintenance of fanzine index pages.
+#
+#   FanzinesEditor --batch <transform> [fanzine server dir ...] [--all] [--list <file>] [--workers <n>]
+#                                      [--dry-run] [--diff <file>] [--checkpoint <file>] [--resume] [--sync] [--catalog]
+#
+# Each fanzine's index page is loaded with GetFanzineIndexPage(), the transform is applied to it, and if the transform
+# changed it, it is backed up and re-uploaded with PutFanzineIndexPage() -- just as the Upload button would, except that
+# the Classic Fanzines list is not updated.  The pages are processed by a pool of worker processes, each with its own
+# connection to the server.  (The FTP log is written only by the main process, since workers appending to it
+# simultaneously would lose entries.)
+#
+# The transform is one of
+#       none                    Change nothing (e.g., to fill in the catalog: --batch none --all --catalog)
+#       rerender                Re-upload the page unchanged (which also brings it up to the current page version)
+#       addcolumn:<name>        Add a column at the right, if the page doesn't already have one by that name
+#       settype:<type>          Set the fanzine type
+#       <file>.py               A script defining Transform(fip: FanzineIndexPage) -> bool, which returns True if it
+#                               changed the page
+#
+# --dry-run uploads nothing and instead writes a diff of each page that would change to the --diff file.
+# Every page completed (whether changed or not) is appended to the checkpoint file, and --resume skips the pages already
+# there, so an interrupted run can be picked up where it left off.  A dry run leaves the checkpoint file alone, since a
+# page it has diffed still has to be uploaded by a real run.
+# Pages are read through the local mirror (see ServerMirror); --sync brings the whole mirror up to date first.
+# Each page uploaded is updated in the local catalog (see FanzinesCatalog), and with --catalog so is each page that
+# the transform leaves unchanged.  Only --catalog creates the catalog if there isn't one yet, since a catalog holding
+# just the pages some other transform happened to upload would look complete to searches.
+
+import os
+import argparse
+import difflib
+import sqlite3
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable
+
+from FTP import FTP, Lock
+from FTPLog import FTPLog, Tagit
+from FanzineIndexPage import FanzineIndexPage, gStdColHeaders
+from GridDataModel import ColDefinition
+from Log import Log, LogError, LogOpen, LogClose
+from Settings import Settings
+from ServerMirror import ServerMirror
+from FanzinesCatalog import FanzinesCatalog, CatalogRecords, CatalogPath
+
+
+#--------------------------------------------------
+# The transforms
+
+def _None(fip: FanzineIndexPage, arg: str) -> bool:
+    return False
+
+
+def _Rerender(fip: FanzineIndexPage, arg: str) -> bool:
+    return True
+
+
+def _AddColumn(fip: FanzineIndexPage, name: str) -> bool:
+    if fip.ColHeaderIndex(name) != -1:
+        return False
+    coldef=gStdColHeaders[gStdColHeaders.index(name)] if name in gStdColHeaders else ColDefinition(name)
+    fip.InsertColumn2(fip.NumCols, coldef)
+    return True
+
+
+def _SetType(fip: FanzineIndexPage, fanzineType: str) -> bool:
+    if fip.FanzineType == fanzineType:
+        return False
+    fip.FanzineType=fanzineType
+    return True
+
+
+_builtinTransforms: dict[str, Callable[[FanzineIndexPage, str], bool]]={"none": _None, "rerender": _Rerender, "addcolumn": _AddColumn, "settype": _SetType}
+
+
+# Turn the transform named on the command line into a function of a FanzineIndexPage.  Returns None if there's no such transform.
+def LoadTransform(spec: str) -> Callable[[FanzineIndexPage], bool]|None:
+    if spec.lower().endswith(".py"):
+        if not os.path.exists(spec):
+            LogError(f"LoadTransform(): can't find '{spec}'")
+            return None
+        modspec=importlib.util.spec_from_file_location("FanzinesBatchTransform", spec)
+        module=importlib.util.module_from_spec(modspec)
+        modspec.loader.exec_module(module)
+        if not callable(getattr(module, "Transform", None)):
+            LogError(f"LoadTransform(): '{spec}' does not define Transform(fip)")
+            return None
+        return module.Transform
+
+    name, _, arg=spec.partition(":")
+    transform=_builtinTransforms.get(name.strip().lower())
+    if transform is None:
+        LogError(f"LoadTransform(): unknown transform '{spec}'")
+        return None
+    return lambda fip: transform(fip, arg.strip())
+
+
+#--------------------------------------------------
+# The workers
+
+g_transform: Callable[[FanzineIndexPage], bool]|None=None      # (Per worker process)
+
+
+# Set up a worker process: it needs its own log, settings, connection to the server and transform
+def _InitWorker(homedir: str, transformSpec: str) -> None:
+    global g_transform
+    os.chdir(homedir)
+    logname=f"FanzinesEditor batch worker {os.getpid()}"
+    LogOpen(os.path.join(homedir, f"Log -- {logname}.txt"), os.path.join(homedir, f"Log (Errors) -- {logname}.txt"))
+    Settings().Load(os.path.join(homedir, "FanzinesEditor settings.txt"), MustExist=True)
+    FTP.g_dologging=Settings().Get("FTP Logging", False)
+    FTP().LoggingOff()
+    if not FTP().OpenConnection("FTP Credentials.json"):
+        raise RuntimeError("Unable to connect to the server")
+    g_transform=LoadTransform(transformSpec)
+    if g_transform is None:
+        raise RuntimeError(f"Unable to load transform '{transformSpec}'")
+
+
+# Process a single fanzine.  Returns (serverDir, status, text, catalog records) where status is one of "unchanged",
+# "uploaded" (text is the backup of the page it replaced, if any), "diff" (text is the diff) or "failed" (text is why).  The catalog records (see FanzinesCatalog) are
+# returned for uploaded pages, and for unchanged ones if catalog is set.
+def _ProcessFanzine(serverDir: str, rootDir: str, dryRun: bool, catalog: bool) -> tuple[str, str, str, dict|None]:
+    try:
+        fip=FanzineIndexPage()
+        if not fip.GetFanzineIndexPage(serverDir):
+            return serverDir, "failed", "unable to load the page", None
+        if not g_transform(fip):
+            return serverDir, "unchanged", "", CatalogRecords(serverDir, fip) if catalog else None
+
+        if dryRun:
+            output=fip.RenderFanzineIndexPage(serverDir)
+            if output is None:
+                return serverDir, "failed", "unable to render the page", None
+            diff=difflib.unified_diff(fip.SourceHtml.splitlines(keepends=True), output.splitlines(keepends=True),
+                                      fromfile=f"/{rootDir}/{serverDir}/index.html", tofile=f"/{rootDir}/{serverDir}/index.html (new)")
+            return serverDir, "diff", "".join(diff), None
+
+        # As in FanzineIndexPageWindow.OnUpload(), a test root may not yet have a copy of the page to back up
+        if rootDir.lower() != "fanzines" and not FTP().FileExists(f"/{rootDir}/{serverDir}/index.html"):
+            if not FTP().CopyFile(f"/fanzines/{serverDir}", f"/{rootDir}/{serverDir}", "index.html", Create=True):
+                return serverDir, "failed", f"unable to copy index.html into /{rootDir}: {FTP().LastMessage}", None
+        if not fip.PutFanzineIndexPage(rootDir, serverDir):
+            return serverDir, "failed", f"unable to back up or upload the page: {FTP().LastMessage}", None
+        if fip.LastUpload == "unchanged":
+            return serverDir, "unchanged", "", CatalogRecords(serverDir, fip) if catalog else None
+        return serverDir, "uploaded", fip.LastBackup, CatalogRecords(serverDir, fip)
+
+    except Exception as e:
+        return serverDir, "failed", f"exception: {e}", None
+
+
+#--------------------------------------------------
+# Run a batch job.  args are the command line arguments following --batch; listFanzines returns the Classic Fanzines list
+# (for --all).  Returns the process exit code.
+def BatchMain(args: list[str], listFanzines: Callable[[], list|None]) -> int:
+    parser=argparse.ArgumentParser(prog="FanzinesEditor --batch", description="Apply a transform to many fanzine index pages.")
+    parser.add_argument("transform", help="rerender, addcolumn:<name>, settype:<type> or a .py file defining Transform(fip)")
+    parser.add_argument("serverdirs", nargs="*", help="the server directories of the fanzines to process")
+    parser.add_argument("--all", action="store_true", help="process every fanzine on the Classic Fanzines list")
+    parser.add_argument("--list", help="a file of server directories to process, one per line")
+    parser.add_argument("--workers", type=int, default=None, help="the number of pages to process at once")
+    parser.add_argument("--dry-run", action="store_true", help="upload nothing; write the changes as a diff instead")
+    parser.add_argument("--diff", default="FanzinesEditor batch diff.txt", help="where --dry-run writes its diff")
+    parser.add_argument("--checkpoint", default="FanzinesEditor batch checkpoint.txt", help="the record of the pages completed (not written by --dry-run)")
+    parser.add_argument("--resume", action="store_true", help="skip the pages already in the checkpoint file")
+    parser.add_argument("--sync", action="store_true", help="bring the local mirror of the server up to date first")
+    parser.add_argument("--catalog", action="store_true", help="also update the local catalog with the pages left unchanged")
+    options=parser.parse_args(args)
+
+    homedir=os.getcwd()
+    LogOpen(os.path.join(homedir, "Log -- FanzinesEditor batch.txt"), os.path.join(homedir, "Log (Errors) -- FanzinesEditor batch.txt"))
+    Log(f"BatchMain({args})")
+
+    Settings().Load(os.path.join(homedir, "FanzinesEditor settings.txt"), MustExist=True)
+    FTP.g_dologging=Settings().Get("FTP Logging", False)
+    FTP().LoggingOff()
+
+    # Check the transform before doing anything else
+    global g_transform
+    g_transform=LoadTransform(options.transform)
+    if g_transform is None:
+        LogClose()
+        return 2
+
+    id=Settings().Get("ID")
+    rootDir="fanzines"
+    if Settings().IsTrue("Test mode"):
+        rootDir=Settings().Get("Test Root Directory", rootDir)
+    FTPLog().Init(id, f"/{rootDir}/FanzinesEditor Log.txt")
+
+    if not FTP().OpenConnection("FTP Credentials.json"):
+        LogError("BatchMain(): unable to connect to the server")
+        LogClose()
+        return 1
+    rslt=Lock().SetLock(f"/{rootDir}", id)
+    if rslt != "":
+        LogError(f"BatchMain(): the fanzines directory is locked by {rslt}")
+        LogClose()
+        return 1
+
+    try:
+        if options.sync:
+            ServerMirror.Sync(rootDir)
+
+        # Assemble the list of fanzines to process
+        serverDirs: list[str]=list(options.serverdirs)
+        if options.list is not None:
+            with open(options.list, encoding="utf-8") as f:
+                serverDirs.extend([x.strip() for x in f if x.strip() != ""])
+        if options.all:
+            cfllist=listFanzines()
+            if cfllist is None:
+                LogError("BatchMain(): unable to load the Classic Fanzines list")
+                return 1
+            serverDirs.extend([x.ServerDir for x in cfllist])
+        serverDirs=list(dict.fromkeys(serverDirs))      # Drop duplicates, keeping the order
+
+        # Skip what's already been done
+        if options.resume and os.path.exists(options.checkpoint):
+            with open(options.checkpoint, encoding="utf-8") as f:
+                done={x.strip() for x in f}
+            Log(f"BatchMain(): resuming -- {len(done)} fanzines were completed earlier")
+            serverDirs=[x for x in serverDirs if x not in done]
+        if len(serverDirs) == 0:
+            Log("BatchMain(): nothing to do")
+            return 0
+
+        workers=options.workers or Settings().Get("Batch workers", 4)
+        workers=max(1, min(int(workers), len(serverDirs)))
+        Log(f"BatchMain(): {options.transform} on {len(serverDirs)} fanzines with {workers} workers{' (dry run)' if options.dry_run else ''}")
+
+        counts: dict[str, int]={}
+        checkpoint=open(options.checkpoint, "a" if options.resume else "w", encoding="utf-8") if not options.dry_run else None
+        diff=open(options.diff, "w", encoding="utf-8") if options.dry_run else None
+        catalog=FanzinesCatalog() if options.catalog or os.path.exists(CatalogPath()) else None
+        try:
+            def Record(serverDir: str, status: str, text: str, records: dict|None) -> None:
+                counts[status]=counts.get(status, 0)+1
+                Log(f"{sum(counts.values())}/{len(serverDirs)}: {serverDir}: {status}")
+                if records is not None and catalog is not None:
+                    try:
+                        catalog.Store(records)
+                    except sqlite3.Error as e:
+                        LogError(f"BatchMain(): unable to update the catalog for {serverDir}: {e}")
+                if status == "failed":
+                    LogError(f"BatchMain(): {serverDir} failed: {text}")
+                    return
+                if status == "diff":
+                    diff.write(text)
+                if status == "uploaded":
+                    if text != "":
+                        FTPLog().AppendItemVerb("backup index.html", f"{Tagit("RootDir", rootDir)} {Tagit("ServerDir", serverDir)} {Tagit("Backup", text)}", Flush=True)
+                    FTPLog().AppendItemVerb("upload FIP succeeded", f"{Tagit("RootDir", rootDir)} {Tagit("ServerDir", serverDir)} {Tagit("Batch", options.transform)}", Flush=True)
+                if checkpoint is not None:
+                    checkpoint.write(serverDir+"\n")
+                    checkpoint.flush()
+
+            if workers == 1:
+                # Just do it here, using our own connection
+                for serverDir in serverDirs:
+                    Record(*_ProcessFanzine(serverDir, rootDir, options.dry_run, options.catalog))
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_InitWorker, initargs=(homedir, options.transform)) as pool:
+                    futures=[pool.submit(_ProcessFanzine, x, rootDir, options.dry_run, options.catalog) for x in serverDirs]
+                    for future in as_completed(futures):
+                        Record(*future.result())
+        finally:
+            if catalog is not None:
+                catalog.Close()
+            if checkpoint is not None:
+                checkpoint.close()
+            if diff is not None:
+                diff.close()
+
+        Log(f"BatchMain(): done: {', '.join([f'{v} {k}' for k, v in counts.items()])}")
+        return 1 if counts.get("failed", 0) > 0 else 0
+
+    finally:
+        Lock().ReleaseLock(f"/{rootDir}", id)
+        LogClose()
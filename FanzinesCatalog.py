@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+# A local SQLite catalog of every fanzine index page: its fanzine, its issues (one per FanzineIndexPageTableRow),
+# their editors and their apa mailings.
+#
+# Site-wide questions ("every issue edited by X", "everything in FAPA 103", "all the issues from 1953") would otherwise
+# mean downloading and parsing every index.html.  The catalog is filled in by the batch mode's bulk import
+# ("FanzinesEditor --batch none --all --catalog") and each fanzine is brought up to date whenever its page is uploaded.
+# (Only the bulk import creates the catalog.  Uploads just keep an existing one up to date, since a catalog holding only the
+# fanzines uploaded since would look complete to searches.)
+#
+# The issues' display text, notes, editors and mailings are also indexed in an FTS5 table, issues_fts (whose rowids are
+# those of the issues table), for the main window's full-text search.
+#
+# The records for a fanzine are built by CatalogRecords() -- a plain dict, so that batch worker processes can build them
+# and hand them to the main process, which is the only one which writes the catalog.
+
+import os
+import re
+import json
+import sqlite3
+
+from FanzineIndexPage import FanzineIndexPage, SplitMailings
+from HelpersPackage import SplitListOfNamesOnPattern
+from Log import Log
+from Settings import Settings
+
+
+_schema='''
+CREATE TABLE IF NOT EXISTS fanzines (
+    serverdir TEXT PRIMARY KEY COLLATE NOCASE,
+    name TEXT, othernames TEXT, editors TEXT, dates TEXT, type TEXT, clubname TEXT, locale TEXT,
+    significance TEXT, complete INTEGER, updated TEXT, pageversion TEXT
+);
+CREATE TABLE IF NOT EXISTS issues (
+    serverdir TEXT COLLATE NOCASE, seq INTEGER, kind TEXT,
+    filename TEXT, displaytext TEXT, whole TEXT, vol TEXT, num TEXT, year TEXT, month TEXT, day TEXT,
+    pages TEXT, mailing TEXT, editor TEXT, notes TEXT, cells TEXT,
+    PRIMARY KEY (serverdir, seq)
+);
+CREATE TABLE IF NOT EXISTS editors (serverdir TEXT COLLATE NOCASE, seq INTEGER, name TEXT COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS mailings (serverdir TEXT COLLATE NOCASE, seq INTEGER, apa TEXT COLLATE NOCASE, number TEXT COLLATE NOCASE, postmailing TEXT);
+CREATE INDEX IF NOT EXISTS issues_year ON issues (year);
+CREATE INDEX IF NOT EXISTS editors_name ON editors (name);
+CREATE INDEX IF NOT EXISTS editors_serverdir ON editors (serverdir);
+CREATE INDEX IF NOT EXISTS mailings_apa ON mailings (apa, number);
+CREATE INDEX IF NOT EXISTS mailings_serverdir ON mailings (serverdir);
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5 (
+    serverdir UNINDEXED, seq UNINDEXED, displaytext, notes, editor, mailing,
+    tokenize="unicode61 remove_diacritics 2"
+);
+'''
+_schemaVersion=2       # 2: Added issues_fts
+
+_ftsColumns="serverdir, seq, displaytext, notes, editor, mailing"
+
+# The issue table's columns and the FIP columns they come from (the first of each list which the page has)
+_issueColumns: dict[str, list[str]]={
+    "whole": ["Whole", "WholeNum"], "vol": ["Vol", "Volume"], "num": ["Num", "Number"],
+    "year": ["Year"], "month": ["Month"], "day": ["Day"], "pages": ["Pages"],
+    "mailing": ["Mailing"], "editor": ["Editor"], "notes": ["Notes"],
+}
+
+# (The same separators as are used to split the editors on old-style pages)
+_editorSeparators=r", and |,|/|;|and |&|\n|<br>"
+
+
+def CatalogPath() -> str:
+    path=Settings().Get("Catalog file", "")
+    if path == "":
+        path=os.path.join(os.getcwd(), "FanzinesEditor catalog.sqlite")
+    return path
+
+
+# Build the catalog's records for one fanzine from its index page
+def CatalogRecords(serverDir: str, fip: FanzineIndexPage) -> dict:
+    headers=fip.ColHeaders
+    colIndex={x.lower(): i for i, x in reversed(list(enumerate(headers)))}
+    def Cell(row, names: list[str]) -> str:
+        for name in names:
+            i=colIndex.get(name.lower())
+            if i is not None and i < len(row.Cells):
+                return row.Cells[i]
+        return ""
+
+    fanzine=(serverDir, fip.Name.MainName, "\n".join(fip.Name.Othernames), fip.Editors, fip.Dates, fip.FanzineType, fip.Clubname,
+             fip.LocaleAsText, fip.Significance, 1 if fip.Complete else 0, str(fip.Updated), fip.PageVersion)
+
+    issues=[]
+    editors=[(serverDir, None, x.strip()) for x in fip.Editors.split("\n") if x.strip() != ""]
+    mailings=[]
+    for seq, row in enumerate(fip.Rows):
+        kind="text" if row.IsTextRow else "link" if row.IsLinkRow else "empty" if row.IsEmptyRow else "issue"
+        if kind == "text":
+            issue=[serverDir, seq, kind, "", row.Cells[0] if len(row.Cells) > 0 else ""]     # A text row's text is all in its first cell
+        else:
+            issue=[serverDir, seq, kind, row.Cells[0] if len(row.Cells) > 0 else "", row.Cells[1] if len(row.Cells) > 1 else ""]
+        issue.extend([Cell(row, x) for x in _issueColumns.values()])
+        issue.append(json.dumps(dict(zip(headers, row.Cells)), ensure_ascii=False))
+        issues.append(tuple(issue))
+        if kind != "issue":
+            continue
+        editor=Cell(row, _issueColumns["editor"])
+        if editor.strip() != "":
+            editors.extend([(serverDir, seq, x.strip()) for x in SplitListOfNamesOnPattern(editor, _editorSeparators) if x.strip() != ""])
+        mailings.extend([(serverDir, seq, apa.strip(), number, pm) for apa, number, pm in SplitMailings(Cell(row, _issueColumns["mailing"]))])
+
+    return {"serverdir": serverDir, "fanzine": fanzine, "issues": issues, "editors": editors, "mailings": mailings}
+
+
+class FanzinesCatalog:
+    def __init__(self, path: str|None=None) -> None:
+        self._path=path if path is not None else CatalogPath()
+        self._db=sqlite3.connect(self._path)
+        self._db.row_factory=sqlite3.Row
+        self._db.executescript(_schema)
+        # A catalog from before issues_fts existed needs to have it filled in
+        if self._db.execute("PRAGMA user_version").fetchone()[0] < _schemaVersion:
+            with self._db:
+                self._db.execute("DELETE FROM issues_fts")
+                self._db.execute(f"INSERT INTO issues_fts (rowid, {_ftsColumns}) SELECT rowid, {_ftsColumns} FROM issues")
+                self._db.execute(f"PRAGMA user_version = {_schemaVersion}")
+
+    def __enter__(self) -> FanzinesCatalog:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.Close()
+
+    def Close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db=None
+
+
+    # Replace everything the catalog has on a fanzine with records (see CatalogRecords)
+    def Store(self, records: dict) -> None:
+        serverDir=records["serverdir"]
+        with self._db:      # (One transaction)
+            self._Delete(serverDir)
+            self._db.execute(f"INSERT INTO fanzines VALUES ({', '.join(['?']*12)})", records["fanzine"])
+            self._db.executemany(f"INSERT INTO issues VALUES ({', '.join(['?']*(5+len(_issueColumns)+1))})", records["issues"])
+            self._db.executemany("INSERT INTO editors VALUES (?, ?, ?)", records["editors"])
+            self._db.executemany("INSERT INTO mailings VALUES (?, ?, ?, ?, ?)", records["mailings"])
+            self._db.execute(f"INSERT INTO issues_fts (rowid, {_ftsColumns}) SELECT rowid, {_ftsColumns} FROM issues WHERE serverdir = ?", (serverDir,))
+        Log(f"FanzinesCatalog.Store({serverDir}): {len(records['issues'])} rows")
+
+    def Update(self, serverDir: str, fip: FanzineIndexPage) -> None:
+        self.Store(CatalogRecords(serverDir, fip))
+
+    def Remove(self, serverDir: str) -> None:
+        with self._db:
+            self._Delete(serverDir)
+
+    def _Delete(self, serverDir: str) -> None:
+        # (issues_fts must go first, since its rows are found by way of the issues table)
+        self._db.execute("DELETE FROM issues_fts WHERE rowid IN (SELECT rowid FROM issues WHERE serverdir = ?)", (serverDir,))
+        for table in ["fanzines", "issues", "editors", "mailings"]:
+            self._db.execute(f"DELETE FROM {table} WHERE serverdir = ?", (serverDir,))
+
+
+    def Query(self, sql: str, params: tuple|dict=()) -> list[sqlite3.Row]:
+        return self._db.execute(sql, params).fetchall()
+
+
+    # Full-text search of the issues.  Each word in text must be found (as a word or the start of one) in the issue's
+    # display text, notes, editor or mailing.  Returns up to limit matches, sorted by fanzine and then by row, each with
+    # the issue's serverdir, seq and displaytext, its fanzine's name, and a snippet with the matching words in [brackets].
+    # (They're not ordered by rank: ranking has to score every match before the limit applies, which takes too long when
+    # a common word matches much of the site.)
+    def SearchIssues(self, text: str, limit: int=200) -> list[sqlite3.Row]:
+        words=re.findall(r"\w+", text)
+        if len(words) == 0:
+            return []
+        match=" ".join([f'"{x}"*' for x in words])      # Quoting each word keeps FTS5's query syntax out of it
+        hits=self._db.execute("SELECT f.serverdir, f.seq, i.displaytext, z.name, snippet(issues_fts, -1, '[', ']', '...', 10) AS snippet "
+                              "FROM issues_fts f JOIN issues i ON i.rowid = f.rowid LEFT JOIN fanzines z ON z.serverdir = f.serverdir "
+                              "WHERE issues_fts MATCH ? LIMIT ?", (match, limit)).fetchall()
+        return sorted(hits, key=lambda x: ((x["name"] or x["serverdir"]).lower(), x["seq"]))
@@ -1,33 +1,56 @@
 from __future__ import annotations
 
+from StartupTiming import StartupPhase, LogStartupMilestone, LogStartupProfile     # Imported first, as this starts the startup clock
+
 import os
+import time
+import threading
+import multiprocessing
 import wx
 import wx.grid
 import sys
 import re
 import html
+from datetime import datetime
 
 from FTP import FTP, Lock
 
-from FTPLog import FTPLog
+from FTPLog import FTPLog, Tagit
 from WxDataGrid import DataGrid, GridDataSource, ColDefinitionsList, GridDataRowClass, ColDefinition, IsEditable
 from WxHelpers import OnCloseHandling3, ProgressMessage2, ModalDialogManager, GuardReentry, SetWindowIcon
-from HelpersPackage import ExtractInvisibleTextInsideFanacComment, ConvertHTMLishCharacters, PyiResourcePath
+from HelpersPackage import ExtractInvisibleTextInsideFanacComment, ConvertHTMLishCharacters, PyiResourcePath, ExtractHTMLUsingFanacStartEndCommentPair
 from HelpersPackage import InsertHTMLUsingFanacStartEndCommentPair, UnicodeToHtml, StripSpecificTag, Int0, TimestampFilename
 from Log import LogOpen, LogClose, LogError
 from Log import Log as RealLog
 from Settings import Settings
 from FanacFanzinesHelpers import ReadClassicFanzinesTable
 
-from FanzineIndexPageEdit import FanzineIndexPageWindow, ClassicFanzinesDate, Tagit
 from FanzineNames import FanzineNames
 from GenGUIClass import FanzinesGridGen
 from GenLogDialogClass import LogDialog
-from ClassicFanzinesLine import ClassicFanzinesLine
+from ClassicFanzinesLine import ClassicFanzinesLine, ClassicFanzinesDate
+from ClassicFanzinesList import ClassicFanzinesList
+from ClassicFanzinesSnapshot import LoadSnapshot, SaveSnapshot, ClassicFanzinesDataFilename, RenderClassicFanzinesData, ParseClassicFanzinesData
+from FanzinesSearchIndex import FanzinesSearchIndex
+from FanzineIndexPageCache import FanzineIndexPageCache
+from FTPStat import ServerFileStamp
+from HtmlCleanup import CollapseRedundantAmps
+from PublishedClassicFanzines import PublishedClassicFanzines, TableDigest
+from SlotTemplate import SlotTemplate, LoadSlotTemplate
 
 
 def main():
 
+    # "FanzinesEditor --batch ..." runs a batch job on fanzine index pages without the GUI.  (See FanzinesBatch.)
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        from FanzinesBatch import BatchMain
+        sys.exit(BatchMain(sys.argv[2:], GetClassicFanzinesList))
+
+    # "FanzinesEditor --check-legacy <folder>" checks the fast legacy page parser against BeautifulSoup.  (See LegacyHtml.)
+    if len(sys.argv) > 1 and sys.argv[1] == "--check-legacy":
+        from LegacyHtml import CheckLegacyMain
+        sys.exit(CheckLegacyMain(sys.argv[2:]))
+
     # Initialize wx
     app=wx.App(False)
 
@@ -63,11 +86,12 @@ def main():
     Log(f"{sys.executable=}")
 
     # Load the global settings dictionary
-    Log(f"Settings().Load({os.path.join(homedir, 'FanzinesEditor settings.txt')})")
-    Settings().Load(os.path.join(homedir, "FanzinesEditor settings.txt"), MustExist=True)
-    Log(Settings().Dump())
-    Settings("FanzinesEditor positions.json").Load(os.path.join(homedir, "FanzinesEditor positions.json"), MustExist=True, SuppressMessageBox=True)
-    Log(Settings("FanzinesEditor positions.json").Dump())
+    with StartupPhase("Load settings"):
+        Log(f"Settings().Load({os.path.join(homedir, 'FanzinesEditor settings.txt')})")
+        Settings().Load(os.path.join(homedir, "FanzinesEditor settings.txt"), MustExist=True)
+        Log(Settings().Dump())
+        Settings("FanzinesEditor positions.json").Load(os.path.join(homedir, "FanzinesEditor positions.json"), MustExist=True, SuppressMessageBox=True)
+        Log(Settings("FanzinesEditor positions.json").Dump())
 
     # Allow turning off of routine FTP logging
     FTP.g_dologging=Settings().Get("FTP Logging", False)
@@ -87,33 +111,22 @@ def main():
         msg=f"Unable to find file 'FTP Credentials.json' file.\nExpected to find it in {os.getcwd()}"
         Log(msg, isCritical=True)
 
+    # Initialize the GUI
+    # The window appears right away in a "loading" state. Connecting to the server, establishing a lock on the Fanzines
+    # directories and loading the list of fanzines all happen in the background. (See FanzinesEditorWindow.)
+    with StartupPhase("Create main window"):
+        FanzinesEditorWindow(None, rootDir, id)
 
-    if not FTP().OpenConnection("FTP Credentials.json"):
-        Log("Main: OpenConnection('FTP Credentials.json' failed")
-        Log("Unable to open connection to FTP server fanac.org", isCritical=True)
-
-
-    # Attempt to establish a lock on the Fanzines directories
-    lockEstablished=False
-    if id is not None:
-        rslt=Lock().SetLock(rootDir, id)
-        if rslt == "":
-            lockEstablished=True
-        else:
-            dlg=wx.MessageDialog(None, f"Unable to establish a lock for id '{id}' in directory '{rootDir}' because: \n{rslt}. \n\n Do you wish to proceed, anyway? ", "Continue (and risk disaster)?", wx.YES_NO|wx.ICON_QUESTION)
-            result=dlg.ShowModal()
-            dlg.Destroy()
-            if result == wx.ID_YES:
-                lockEstablished=True
-
-    if lockEstablished:
-        # Initialize the GUI
-        FanzinesEditorWindow(None)
-
-        # Run the event loop
-        app.MainLoop()
+    # Run the event loop
+    app.MainLoop()
 
-    Lock().ReleaseLock(rootDir, id)
+    # If the user exited during startup, a startup thread may still be taking the lock (or using the connection).
+    # Releasing the lock before it's taken would leave it behind, so wait for them first.
+    if StartupThreads.Join(_startupThreadsTimeout):
+        Lock().ReleaseLock(rootDir, id)
+    else:
+        LogError(f"main(): startup was still using the server after {_startupThreadsTimeout} seconds, so the lock on {rootDir} was not released. "
+                 f"It may need to be removed by hand.")
 
     LogClose()
     sys.exit(0)
@@ -135,6 +148,8 @@ def Log(text: str, isError: bool=False, noNewLine: bool=False, Print=True, Clear
 # '&amp;#225;' -> ...), so decoding to a fixpoint both reads correct data and repairs escalated entries.
 # (Tags such as <br> are left alone; only character entities are decoded.)
 def DecodeHtmlEntitiesFully(s: str) -> str:
+    if "&" not in s:    # Most cells have no entities at all
+        return s
     for _ in range(4):
         t=html.unescape(s)
         if t == s:
@@ -143,27 +158,68 @@ def DecodeHtmlEntitiesFully(s: str) -> str:
     return s
 
 
+#==========================================================================================================
+# Split a single row of the Classic Fanzines table into its cells in one pass.
+# Each <td...>...</td> yields its contents; whatever lies between and after the cells is gathered up and yielded
+# last (if non-empty) as a final cell, just as the old search-and-remove loop left it behind.
+# (The old loop re-copied the rest of the row once per cell, which made long rows quadratic.)
+_classicCellPattern=re.compile(r"<td.*?>(.*?)</td>", flags=re.IGNORECASE | re.DOTALL)
+def TokenizeClassicFanzinesRow(srow: str):
+    leftovers: list[str]=[]
+    pos=0
+    for m in _classicCellPattern.finditer(srow):
+        leftovers.append(srow[pos:m.start()])
+        yield m.group(1)
+        pos=m.end()
+    leftovers.append(srow[pos:])
+    rest="".join(leftovers)
+    if len(rest) > 0:
+        yield rest
+
+
 #==========================================================================================================
 # Read the classic fanzine list on fanac.org and return a list of all *fanzine directory names*
 def GetClassicFanzinesList() -> list[ClassicFanzinesLine]|None:
-    html=None
+    serverDirs=[]
     if Settings().Get("Test mode", "False") == "True":
         testRootDirectory=Settings().Get("Test Root directory")
         if testRootDirectory != "":
-            testRootDirectory="/"+testRootDirectory
             # If there is a test directory, try loading from there, first
-            html=FTP().GetFileAsString(testRootDirectory, "Classic_Fanzines.html")
-    if html is None:
-        # If we're not in test mode or if that failed (or there wasn't one) load from the default
-        html=FTP().GetFileAsString("/fanzines", "Classic_Fanzines.html")
+            serverDirs.append("/"+testRootDirectory)
+    # If we're not in test mode or if that failed (or there wasn't one) load from the default
+    serverDirs.append("/fanzines")
+
+    html=None
+    stamp=None
+    serverDir=""
+    for serverDir in serverDirs:
+        # If the server's copy hasn't changed since we last parsed it, the local snapshot is all we need
+        stamp=ServerFileStamp(serverDir, "Classic_Fanzines.html")
+        snapshot=LoadSnapshot(serverDir, stamp)
+        if snapshot is not None:
+            cfllist, tableDigest=snapshot
+            PublishedClassicFanzines.Record(serverDir, tableDigest, cfllist)
+            return cfllist
+        # Failing that, if the data file uploaded with the page was written for the page as it is now, use it
+        if stamp is not None:
+            text=FTP().GetFileAsString(serverDir, ClassicFanzinesDataFilename)
+            data=ParseClassicFanzinesData(text, stamp) if text is not None else None
+            if data is not None:
+                cfllist, tableDigest=data
+                PublishedClassicFanzines.Record(serverDir, tableDigest, cfllist)
+                SaveSnapshot(serverDir, stamp, cfllist, tableDigest)
+                return cfllist
+        html=FTP().GetFileAsString(serverDir, "Classic_Fanzines.html")
+        if html is not None:
+            break
     if html is None:
         LogError(f"Unable to download 'Classic_Fanzines.html' because: {FTP().LastMessage}")
 
         return None
 
     # Remove the &amp;amp;amp;amp;amp;... that has crept in to some pages.
-    while "&amp;amp;" in html:
-        html=html.replace("amp;amp;", "amp;")
+    html, ampRuns=CollapseRedundantAmps(html)
+    if ampRuns > 0:
         Log(f"redundant 'amp;'s removed from Classic_Fanzines.html")
 
     rows=ReadClassicFanzinesTable(html)
@@ -181,17 +237,7 @@ def GetClassicFanzinesList() -> list[ClassicFanzinesLine]|None:
         if loc >= 0:
             srow=srow[loc:]
         # Break the remainder into section bounced by <td...> and </td> plus whatever's left
-
-        cells=[]
-        while True:
-            colpat=r"<td.*?>(.*?)</td>"
-            m=re.search(colpat, srow, flags=re.IGNORECASE | re.DOTALL)
-            if m is None:
-                if len(srow) > 0:
-                    cells.append(srow)
-                break
-            cells.append(m.groups()[0])
-            srow=re.sub(colpat, "", srow, count=1, flags=re.IGNORECASE | re.DOTALL)
+        cells=list(TokenizeClassicFanzinesRow(srow))
 
         #Log(str(cols))
         rowtable.append(cells)
@@ -297,33 +343,35 @@ def GetClassicFanzinesList() -> list[ClassicFanzinesLine]|None:
             #Log(f"{row[1]=}    {cfl.ServerDir=}    {cfl.Name=}")
         #Log(str(row))
 
+    # Remember what the server's table looks like so an upload of an unchanged list can be skipped
+    table=ExtractHTMLUsingFanacStartEndCommentPair(html, "table")
+    tableDigest=TableDigest(table) if table != "" else None
+    PublishedClassicFanzines.Record(serverDir, tableDigest, namelist)
+
+    SaveSnapshot(serverDir, stamp, namelist, tableDigest)
     return namelist
 
 
-def PutClassicFanzineList(fanzinesList: list[ClassicFanzinesLine], rootDir: str) -> bool:
-    if not os.path.exists("Template - Classic_Fanzines.html"):
-        LogError(f"PutFanzineIndexPage() can't find 'Template - Classic_Fanzines.html' at {os.path.curdir}")
-        return False
-    with open("Template - Classic_Fanzines.html") as f:
-        output=f.read()
+# The Classic Fanzines template, compiled into static text plus the two places we fill in (see SlotTemplate)
+def LoadClassicFanzinesTemplate() -> SlotTemplate|None:
+    return LoadSlotTemplate("Template - Classic_Fanzines.html",
+                            [("table", lambda s, val: InsertHTMLUsingFanacStartEndCommentPair(s, "table", val)),
+                             ("updated", lambda s, val: InsertHTMLUsingFanacStartEndCommentPair(s, "updated", val))])
 
-    # There is a single entry for each fanzine, including ones with multiple titles. We want to create an entry for each title.
-    # The strategy will be to duplicate any ClassicFanzinesLine with multiple names, marking the extras as duplicate so they are ignored when doing the GetFanzinesList
-    duplicatelist=[]
-    for fanzine in fanzinesList:
-        duplicatelist.append(fanzine)
-        if len(fanzine.Name.Othernames) > 0:
-            # Duplicate the fanzine's entry, swapping each of the other names in turn as the main name
-            for i in range(len(fanzine.Name.Othernames)):
-                fz=fanzine.Deepcopy()
-                if fz.Name.SwapMainNameAndOtherName(i):
-                    fz.DuplicateCopy=True
-                    duplicatelist.append(fz)
 
-    duplicatelist.sort(key=lambda x:x.DisplayNameSort)
+# Generate the table rows of the Classic Fanzines page
+def RenderClassicFanzinesRows(fanzines: list[ClassicFanzinesLine]) -> str:
+    # These are the same for every row, so look them up just once
+    howOldIsUpdated=Int0(Settings().Get("How old is updated", 90))
+    howOldIsNew=Int0(Settings().Get("How old is new", 90))
+    now=datetime.now()
 
-    insert=""
-    for fanzine in duplicatelist:
+    def IsRecent(date: ClassicFanzinesDate, howOld: int) -> bool:
+        daysAgo=date.DaysAgo(now)
+        return daysAgo is not None and daysAgo < howOld
+
+    rows: list[str]=[]
+    for fanzine in fanzines:
         # <!-- fanac.table start -->
         # <TR VALIGN="top">
         # <TD><IMG SRC="blue.gif" HEIGHT="14" WIDTH="21" ALT="[BB]"></TD>
@@ -337,69 +385,90 @@ def PutClassicFanzineList(fanzinesList: list[ClassicFanzinesLine], rootDir: str)
         # <TD><X CLASS="complete">Complete</X></TD>
         # </TR>
         # <!-- fanac.table end -->
-        row='<TR VALIGN="top">\n'
-        row+='<TD><IMG SRC="blue.gif" HEIGHT="14" WIDTH="21" ALT="[BB]"></TD>\n'
-        row+=f'<TD sorttable_customkey="{fanzine.DisplayNameSort}"><A HREF="{fanzine.ServerDir}/"><STRONG>{UnicodeToHtml(fanzine.Name.MainName)}</STRONG></A>'
+        rows.append('<TR VALIGN="top">\n')
+        rows.append('<TD><IMG SRC="blue.gif" HEIGHT="14" WIDTH="21" ALT="[BB]"></TD>\n')
+        rows.append(f'<TD sorttable_customkey="{fanzine.DisplayNameSort}"><A HREF="{fanzine.ServerDir}/"><STRONG>{UnicodeToHtml(fanzine.Name.MainName)}</STRONG></A>')
         if len(fanzine.Name.Othernames) > 0:
-            row+="<br>"+fanzine.Name.OthernamesAsHTML
-        row+=f'</TD>'
-        row+=f'<TD sorttable_customkey="{fanzine.EditorsSort}">{UnicodeToHtml(fanzine.Editors)}</TD>\n'
-        row+=f'<TD sorttable_customkey="{fanzine.DatesSort}">{fanzine.Dates}</TD>\n'
-        row+=f'<TD>{fanzine.Type}</TD>\n'
-        row+=f'<TD CLASS="right" sorttable_customkey="{fanzine.IssuesSort}">{fanzine.Issues}</TD>\n'
-
-        updatedFlag=fanzine.Updated.DaysAgo() < Int0(Settings().Get("How old is updated", 90))
-        newFlag=fanzine.Created.DaysAgo() < Int0(Settings().Get("How old is new", 90))
+            rows.append("<br>"+fanzine.Name.OthernamesAsHTML)
+        rows.append(f'</TD>')
+        rows.append(f'<TD sorttable_customkey="{fanzine.EditorsSort}">{UnicodeToHtml(fanzine.Editors)}</TD>\n')
+        rows.append(f'<TD sorttable_customkey="{fanzine.DatesSort}">{fanzine.Dates}</TD>\n')
+        rows.append(f'<TD>{fanzine.Type}</TD>\n')
+        rows.append(f'<TD CLASS="right" sorttable_customkey="{fanzine.IssuesSort}">{fanzine.Issues}</TD>\n')
+
+        updated=fanzine.Updated
+        created=fanzine.Created
+        updatedFlag=IsRecent(updated, howOldIsUpdated)
+        newFlag=IsRecent(created, howOldIsNew)
 
         flags=("n" if newFlag else "")+("u" if updatedFlag else "")+("c" if fanzine.Complete else "")
 
         # A single flag goes on the cell's first line; multiple flags get one line each.
         match flags:
             case "":
-                row+=f'<TD sorttable_customkey="zzzz"><BR>&nbsp;<br>\n'
+                rows.append(f'<TD sorttable_customkey="zzzz"><BR>&nbsp;<br>\n')
             case "c":
-                row+=f'<TD sorttable_customkey="complete"><X CLASS="complete">Complete</X><br>\n'
+                rows.append(f'<TD sorttable_customkey="complete"><X CLASS="complete">Complete</X><br>\n')
             case "u":
-                row+=f'<TD sorttable_customkey="updated"><X CLASS="updated">Updated</X><br>\n'
+                rows.append(f'<TD sorttable_customkey="updated"><X CLASS="updated">Updated</X><br>\n')
             case "n":
-                row+=f'<TD sorttable_customkey="new"><X CLASS="new">New</X><br>\n'
+                rows.append(f'<TD sorttable_customkey="new"><X CLASS="new">New</X><br>\n')
             case "uc":
-                row+=f'<TD sorttable_customkey="complete+updated"><X CLASS="complete">Complete</X><br><X CLASS="updated">Updated</X><br>\n'
+                rows.append(f'<TD sorttable_customkey="complete+updated"><X CLASS="complete">Complete</X><br><X CLASS="updated">Updated</X><br>\n')
             case "nc":
-                row+=f'<TD sorttable_customkey="complete+new"><X CLASS="complete">Complete</X><br><X CLASS="new">New</X><br>\n'
+                rows.append(f'<TD sorttable_customkey="complete+new"><X CLASS="complete">Complete</X><br><X CLASS="new">New</X><br>\n')
             case "nu":
-                row+=f'<TD sorttable_customkey="new+updated"><X CLASS="updated">Updated</X><br><X CLASS="new">New</X><br>\n'
+                rows.append(f'<TD sorttable_customkey="new+updated"><X CLASS="updated">Updated</X><br><X CLASS="new">New</X><br>\n')
             case "nuc":
-                row+=f'<TD sorttable_customkey="complete+updated+new"><X CLASS="complete">Complete</X><br><X CLASS="updated">Updated</X><br><X CLASS="new">New</X><br>\n'
+                rows.append(f'<TD sorttable_customkey="complete+updated+new"><X CLASS="complete">Complete</X><br><X CLASS="updated">Updated</X><br><X CLASS="new">New</X><br>\n')
 
-        flu=""
-        if fanzine.Updated is not None:
-            flu=str(fanzine.Updated)
-        row+=f'<!-- fanac-updated {flu} -->\n'
-
-        flu=""
-        if fanzine.Created is not None:
-            flu=str(fanzine.Created)
-        row+=f'<!-- fanac-created {flu} -->\n'
+        rows.append(f'<!-- fanac-updated {str(updated)} -->\n')
+        rows.append(f'<!-- fanac-created {str(created)} -->\n')
 
         # When a fanzine is entered more than once (e.g., due to multiple names) al but one must be ignored
-        row+=f'<!-- fanac-duplicate {"yes" if fanzine.DuplicateCopy else "no"} -->\n'
+        rows.append(f'<!-- fanac-duplicate {"yes" if fanzine.DuplicateCopy else "no"} -->\n')
 
-        row+=f'</TD></TR>\n'
-        insert+=row
+        rows.append(f'</TD></TR>\n')
 
-    temp=InsertHTMLUsingFanacStartEndCommentPair(output, "table", insert)
-    if temp == "":
-        LogError(f"Could not InsertUsingFanacComments('table')")
-        return False
-    output=temp
+    return "".join(rows)
 
-    insert=f"Updated {ClassicFanzinesDate().Now()}"
-    temp=InsertHTMLUsingFanacStartEndCommentPair(output, "updated", insert)
-    if temp == "":
-        LogError(f"Could not InsertUsingFanacComments('updated')")
+
+def PutClassicFanzineList(fanzinesList: list[ClassicFanzinesLine]|ClassicFanzinesList, rootDir: str) -> bool:
+    # (If the template is missing or can't be compiled, LoadSlotTemplate() has already said which.)
+    template=LoadClassicFanzinesTemplate()
+    if template is None:
+        LogError(f"PutClassicFanzineList(): unable to load 'Template - Classic_Fanzines.html'")
         return False
-    output=temp
+
+    # There is a single entry for each fanzine, including ones with multiple titles. We want to create an entry for each title.
+    # The strategy will be to duplicate any ClassicFanzinesLine with multiple names, marking the extras as duplicate so they are ignored when doing the GetFanzinesList
+    duplicatelist=[]
+    for fanzine in fanzinesList:
+        duplicatelist.append(fanzine)
+        if len(fanzine.Name.Othernames) > 0:
+            # Duplicate the fanzine's entry, swapping each of the other names in turn as the main name
+            for i in range(len(fanzine.Name.Othernames)):
+                fz=fanzine.Deepcopy()
+                if fz.Name.SwapMainNameAndOtherName(i):
+                    fz.DuplicateCopy=True
+                    duplicatelist.append(fz)
+
+    duplicatelist.sort(key=lambda x:x.DisplayNameSort)
+
+    table=RenderClassicFanzinesRows(duplicatelist)
+
+    # If the table is just what's already on the server, there's nothing to upload (and nothing to back up)
+    # (The "Updated" date at the bottom of the page doesn't count.)
+    tableDigest=TableDigest(table)
+    if PublishedClassicFanzines.IsUnchanged(rootDir, tableDigest):
+        Log(f"PutClassicFanzineList(): the table in /{rootDir}/Classic_Fanzines.html is unchanged -- upload skipped")
+        return True
+
+    # Work out what's changing.  (It goes in the FTP log once the upload has succeeded.)
+    added, removed, changed=PublishedClassicFanzines.Diff(fanzinesList)
+    Log(f"PutClassicFanzineList(): {len(added)} added, {len(removed)} removed, {len(changed)} changed")
+
+    output=template.Render({"table": table, "updated": f"Updated {ClassicFanzinesDate().Now()}"})
 
     with ModalDialogManager(ProgressMessage2, f"Uploading 'Classic_Fanzines.html'", parent=None):
         ret=FTP().BackupServerFile(f"/{rootDir}/Classic_Fanzines.html")
@@ -412,20 +481,56 @@ def PutClassicFanzineList(fanzinesList: list[ClassicFanzinesLine], rootDir: str)
         if not ret:
             Log(f"Could not FTP().PutFileAsString: /{rootDir}/Classic_Fanzines.html because {FTP().LastMessage}")
             return False
+        if len(added)+len(removed)+len(changed) > 0:
+            FTPLog().AppendItemVerb("Classic_Fanzines changes", f"{Tagit("RootDir", rootDir)} {Tagit("Added", "; ".join(added))} "
+                                                               f"{Tagit("Removed", "; ".join(removed))} {Tagit("Changed", "; ".join(changed))}", Flush=True)
+
+        # And the data file which lets the list be loaded without scraping the page.  (It's tied to the page by the page's
+        # stamp, so if this fails, the stale one left behind won't be used.)
+        stamp=ServerFileStamp(f"/{rootDir}", "Classic_Fanzines.html")
+        if stamp is not None:
+            if not FTP().PutFileAsString(f"/{rootDir}", ClassicFanzinesDataFilename, RenderClassicFanzinesData(stamp, list(fanzinesList), tableDigest), create=True):
+                Log(f"Could not FTP().PutFileAsString: /{rootDir}/{ClassicFanzinesDataFilename} because {FTP().LastMessage}")
     FTPLog().AppendItemVerb("upload Classic_Fanzines succeeded", f"{Tagit("RootDir", rootDir)}", Flush=True)
+    PublishedClassicFanzines.Record(rootDir, tableDigest, fanzinesList)
     return True
 
 
+#==========================================================================================================
+# The background threads which connect to the server, take the lock and load the list of fanzines at startup (see
+# FanzinesEditorWindow).  The user can exit while one is still at work, so main() waits for them before releasing the lock.
+_startupThreadsTimeout=60        # Seconds
+
+class StartupThreads:
+    g_threads: list[threading.Thread]=[]
+
+    @staticmethod
+    def Start(target, *args) -> None:
+        thread=threading.Thread(target=target, args=args, daemon=True)
+        StartupThreads.g_threads.append(thread)
+        thread.start()
+
+    # Wait up to timeout seconds (in all) for them to finish.  Returns False if one is still running.
+    @staticmethod
+    def Join(timeout: float) -> bool:
+        deadline=time.monotonic()+timeout
+        for thread in StartupThreads.g_threads:
+            thread.join(max(0.0, deadline-time.monotonic()))
+        return not any(x.is_alive() for x in StartupThreads.g_threads)
+
+
 #==========================================================================================================
 class FanzinesEditorWindow(FanzinesGridGen):
-    def __init__(self, parent):
+    # lockRootDir and lockID are used to establish the lock on the Fanzines directories
+    def __init__(self, parent, lockRootDir: str, lockID: str|None):
         FanzinesGridGen.__init__(self, parent)
 
         SetWindowIcon(self, PyiResourcePath("FanzinesEditor.ico"))   # Bundled into the exe; harmless no-op if missing or bad
 
         self._dataGrid: DataGrid=DataGrid(self.wxGrid)
         self.Datasource=FanzinesPage()      # Note that this is an empty instance
-        self._fanzinesList: list[ClassicFanzinesLine]=[]        # This holds the linear list of fanzines that gets folded into the rectangular grid
+        self._fanzinesList: ClassicFanzinesList=ClassicFanzinesList()        # This holds the linear list of fanzines (in server directory order) that gets folded into the rectangular grid
+        self._searchIndex: FanzinesSearchIndex=FanzinesSearchIndex()     # Prebuilt index of _fanzinesList for the search box
 
         # Position the window on the screen it was on before at the size it was before
         tlwp=Settings("FanzinesEditor positions.json").Get("Top Level Window Position")
@@ -450,14 +555,6 @@ class FanzinesEditorWindow(FanzinesGridGen):
         if Settings().IsTrue("Test mode"):
             self.RootDir=Settings().Get("Test Root Directory", self.RootDir)
 
-        with ModalDialogManager(ProgressMessage2, "Downloading main fanzine page", parent=self):
-                cfllist=GetClassicFanzinesList()
-                if cfllist is None or len(cfllist) == 0:
-                    return
-                cfllist.sort(key=lambda cfl: cfl.ServerDir.casefold())
-                self._fanzinesList=cfllist      # Update the linear list of fanzines
-                self.Datasource.FanzineList=self._fanzinesList      # Update the rectangular grid of fanzine server directories
-
         self._dataGrid.HideRowLabels()
         self._dataGrid.HideColLabels()
 
@@ -467,16 +564,131 @@ class FanzinesEditorWindow(FanzinesGridGen):
             self.m_TestMode.SetLabelText(f"Test Mode: {self.RootDir}")
 
 
-        self._savedSignature=0   # We need this member. ClearMainWindow() will initialize it
-        self._fanzinesCount=0   # Also used to prevent exist with loss of data
+        self._savedVersion=-1   # We need this member. MarkAsSaved() will initialize it
 
         self.MarkAsSaved()
-        self.tSearch.SetFocus()     # Start up with the entry cursor in the search box
-        self.RefreshWindow()
 
+        # When the mouse rests on a fanzine for a moment, its page is prefetched (see FanzineIndexPageCache)
+        self._hoverCell=None
+        self._hoverTimer=wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.OnHoverTimer, self._hoverTimer)
+        self.wxGrid.GetGridWindow().Bind(wx.EVT_MOTION, self.OnGridMotion)
+
+        # Show the (empty) window while the list of fanzines is loaded in the background.
+        # Until it arrives, everything which needs the list or the server is disabled.
+        self.EnableControls(False)
+        self.SetTitle("Editing Fanzines (loading...)")
+        self.CFLText.Label="Connecting to fanac.org and loading the list of fanzines..."
         self.Show(True)
         self.Raise()    # Bring the window to the top
+        LogStartupMilestone("Main window shown")
+        self.Bind(wx.EVT_IDLE, self._OnFirstIdle)     # The first idle event comes once the window has been painted
+
+        StartupThreads.Start(self._ConnectAndLoad, lockRootDir, lockID)
+
+
+    def _OnFirstIdle(self, event):
+        self.Unbind(wx.EVT_IDLE, handler=self._OnFirstIdle)
+        LogStartupMilestone("Main window painted")
+        LogStartupProfile()
+        event.Skip()
+
+
+    # Enable or disable the controls which need the list of fanzines (and the server)
+    def EnableControls(self, enable: bool) -> None:
+        for control in [self.tSearch, self.bClearSearch, self.bUpload, self.bAddNewFanzine, self.bDeleteFanzine, self.wxGrid]:
+            control.Enable(enable)
+
+
+    #------------------------------------------------------------------------------
+    # Startup, part 1 (background thread): Connect to the server, establish the lock and then load the list of fanzines
+    # Code running on the background thread must not touch the GUI; it hands its results back using wx.CallAfter()
+    def _ConnectAndLoad(self, rootDir: str, id: str|None) -> None:
+        try:
+            with StartupPhase("Connect to server"):
+                connected=FTP().OpenConnection("FTP Credentials.json")
+            if not connected:
+                Log("Main: OpenConnection('FTP Credentials.json' failed")
+                wx.CallAfter(self._OnStartupFailed, "Unable to open connection to FTP server fanac.org")
+                return
+
+            # Attempt to establish a lock on the Fanzines directories
+            if id is None:
+                wx.CallAfter(self._OnStartupFailed, "No 'ID' in FanzinesEditor settings.txt, so a lock on the fanzines directories can't be established")
+                return
+            with StartupPhase("Establish lock"):
+                rslt=Lock().SetLock(rootDir, id)
+            if rslt != "":
+                wx.CallAfter(self._OnLockFailed, rootDir, id, rslt)
+                return
+        except Exception as e:
+            Log(f"_ConnectAndLoad(): exception {e}", isError=True)
+            wx.CallAfter(self._OnStartupFailed, f"Unable to connect to fanac.org: {e}")
+            return
+
+        self._LoadFanzinesList()
+
+
+    # Startup, part 2 (background thread): Download and parse the list of fanzines and build its search index
+    def _LoadFanzinesList(self) -> None:
+        try:
+            with StartupPhase("Load Classic fanzines list"):
+                cfllist=GetClassicFanzinesList()
+            if cfllist is None or len(cfllist) == 0:
+                wx.CallAfter(self._OnFanzinesListLoaded, None, None)
+                return
+            with StartupPhase("Index fanzines list"):
+                fanzines=ClassicFanzinesList(cfllist)
+                searchIndex=FanzinesSearchIndex(fanzines)
+        except Exception as e:
+            Log(f"_LoadFanzinesList(): exception {e}", isError=True)
+            wx.CallAfter(self._OnFanzinesListLoaded, None, None)
+            return
+        wx.CallAfter(self._OnFanzinesListLoaded, fanzines, searchIndex)
+
+
+    # (GUI thread) Someone else holds the lock.  Ask the user whether to go ahead anyway.
+    def _OnLockFailed(self, rootDir: str, id: str, rslt: str) -> None:
+        if not self:    # The window was closed while we were working in the background
+            return
+        dlg=wx.MessageDialog(self, f"Unable to establish a lock for id '{id}' in directory '{rootDir}' because: \n{rslt}. \n\n Do you wish to proceed, anyway? ", "Continue (and risk disaster)?", wx.YES_NO|wx.ICON_QUESTION)
+        result=dlg.ShowModal()
+        dlg.Destroy()
+        if result != wx.ID_YES:
+            self.Close()
+            return
+        StartupThreads.Start(self._LoadFanzinesList)
+
+
+    # (GUI thread)
+    def _OnStartupFailed(self, msg: str) -> None:
+        if not self:
+            return
+        Log(msg, isCritical=True)
+        self.Close()
+
+
+    # (GUI thread) The list of fanzines has arrived: display it and let the user at it
+    def _OnFanzinesListLoaded(self, fanzines: ClassicFanzinesList|None, searchIndex: FanzinesSearchIndex|None) -> None:
+        if not self:
+            return
+        if fanzines is None or searchIndex is None:
+            # Leave everything but Exit disabled: uploading an empty list would wipe out the Classic Fanzines page.
+            LogError(f"Unable to load the list of fanzines from 'Classic_Fanzines.html'")
+            self.CFLText.Label="Unable to load the list of fanzines."
+            return
+
+        self._fanzinesList=fanzines      # Update the linear list of fanzines
+        self._searchIndex=searchIndex
+        self.Datasource.FanzineList=self._fanzinesList      # Update the rectangular grid of fanzine server directories
+
+        self.CFLText.Label=""
+        self.EnableControls(True)
+        self.MarkAsSaved()
+        self.RefreshWindow()
+        self.Raise()    # Bring the window to the top
         self.tSearch.SetFocus()     # And put the focus/cursor in the search box
+        LogStartupMilestone(f"{len(self._fanzinesList)} fanzines displayed")
 
 
     @property
@@ -505,6 +717,7 @@ class FanzinesEditorWindow(FanzinesGridGen):
                 return
 
         self.MarkAsSaved()  # Uploaded, or the user chose to discard the changes
+        FanzineIndexPageCache.Stop()    # The server connection is about to be closed
 
         # Save the window's position
         pos=self.GetPosition()
@@ -532,18 +745,15 @@ class FanzinesEditorWindow(FanzinesGridGen):
 
     # ----------------------------------------------
     # Used to determine if anything has been updated
-    def Signature(self) -> int:       
-        return self.Datasource.Signature()
-
-
+    # Every change to the list of fanzines bumps the datasource's version, so this is just a comparison of counters.
+    # (A full content digest is only needed when actually saving -- see FanzinesPage.Signature().)
     def MarkAsSaved(self):       
-        self._savedSignature=self.Signature()
-        self._fanzinesCount=len(self._fanzinesList)
+        self._savedVersion=self.Datasource.Version
         self.UpdateNeedsSavingFlag()
 
 
     def NeedsSaving(self):       
-        return self._savedSignature != self.Signature() or self._fanzinesCount != len(self._fanzinesList)
+        return self._savedVersion != self.Datasource.Version
 
 
     def OnSearchText(self, event):       
@@ -554,9 +764,13 @@ class FanzinesEditorWindow(FanzinesGridGen):
         if event.GetKeyCode() != 13:
             event.Skip()
             return
-        # A Return was pressed.  If the list of fanzines is down to 1, treat this as a request to open it.  (Otherwise, just process normally.)
+        # A Return was pressed.  If the list of fanzines is down to 1, treat this as a request to open it.
+        # Otherwise, search all the fanzines' issues for the search text.  (If there's none, just process normally.)
         if len(self.Datasource._fanzineList) != 1:
-            event.Skip()
+            if self.tSearch.GetValue().strip() == "":
+                event.Skip()
+                return
+            self.SearchIssues(self.tSearch.GetValue())
             return
 
         self.clickedColumn=0
@@ -568,9 +782,45 @@ class FanzinesEditorWindow(FanzinesGridGen):
     def SearchFanzineList(self):       
         searchtext=self.tSearch.GetValue()
         if searchtext != "":
-            fanzinelist=[x for x in self._fanzinesList if searchtext.casefold().replace("_", " ") in x.ServerDir.casefold().replace("_", " ") or searchtext.casefold() in x.Name.MainName.casefold()]
-            self.Datasource.FanzineList=fanzinelist
+            self.Datasource.FanzineList=self._searchIndex.Search(searchtext)
             self.RefreshWindow()
+            # If the search has narrowed the list down to a few fanzines, one of them is likely to be opened next
+            found=self.Datasource._fanzineList
+            if 0 < len(found) <= Int0(Settings().Get("Prefetch search results", 5)):
+                FanzineIndexPageCache.Prefetch([x.ServerDir for x in found])
+
+
+    # Full-text search of every fanzine's issues using the catalog (see FanzinesCatalog).  The matching issues are listed
+    # and the fanzine of the one picked is opened with that issue's row selected.
+    @GuardReentry
+    def SearchIssues(self, searchtext: str) -> None:
+        import sqlite3
+        from FanzinesCatalog import FanzinesCatalog, CatalogPath     # Not needed until a search is done, so not imported at startup
+        if not os.path.exists(CatalogPath()):
+            wx.MessageBox("There is no catalog of the fanzines' issues to search.\n(It can be built using 'FanzinesEditor --batch none --all --catalog')",
+                          caption="Search Issues", parent=self)
+            return
+        try:
+            with FanzinesCatalog() as catalog:
+                hits=catalog.SearchIssues(searchtext)
+        except sqlite3.Error as e:
+            LogError(f"SearchIssues('{searchtext}'): unable to search the catalog {CatalogPath()}: {e}")
+            return
+        if len(hits) == 0:
+            wx.MessageBox(f"No issues found matching '{searchtext}'", caption="Search Issues", parent=self)
+            return
+
+        choices=[]
+        for hit in hits:
+            choice=f"{hit['name'] or hit['serverdir']}:  {hit['displaytext']}"
+            if hit["snippet"].replace("[", "").replace("]", "") != hit["displaytext"]:      # Show where the match is if it isn't in the display text
+                choice+=f"    ({hit['snippet']})"
+            choices.append(choice)
+        with wx.SingleChoiceDialog(self, f"{len(hits)} issues found matching '{searchtext}'", "Search Issues", choices) as dlg:
+            if dlg.ShowModal() != wx.ID_OK:
+                return
+            hit=hits[dlg.GetSelection()]
+        self.OpenFanzine(hit["serverdir"], hit["seq"], hit["displaytext"])
 
 
     def OnClearSearch( self, event ):       
@@ -582,7 +832,8 @@ class FanzinesEditorWindow(FanzinesGridGen):
     @GuardReentry
     def OnAddNewFanzine(self, event):
 
-        with FanzineIndexPageWindow(None, ExistingFanzinesServerDirs=self.Datasource.ServerDirs) as fsw:
+        from FanzineIndexPageEdit import FanzineIndexPageWindow     # Not needed until a fanzine is opened, so not imported at startup
+        with FanzineIndexPageCache.Paused(), FanzineIndexPageWindow(None, ExistingFanzinesServerDirs=self.Datasource.ServerDirs) as fsw:
             fsw.ShowModal()
 
             # Rows may have been moved to other fanzines (possibly newly created ones) from within the dialog;
@@ -592,7 +843,7 @@ class FanzinesEditorWindow(FanzinesGridGen):
                 self.MergeCFLIntoList(cfl)
                 changed=True
 
-            if fsw._uploaded:
+            if fsw._uploaded and fsw.CFL is not None:
                 FTPLog().AppendItemVerb("New Fanzine", f"{Tagit("FanzineName", fsw.CFL.Name.MainName)}", Flush=True)
                 # A new fanzine has been added.
                 self.MergeCFLIntoList(fsw.CFL)
@@ -600,7 +851,6 @@ class FanzinesEditorWindow(FanzinesGridGen):
 
         if not changed:
             return
-        self._fanzinesList.sort(key=lambda cfl: cfl.ServerDir.casefold())
         self.Datasource.FanzineList=self._fanzinesList
         self.SearchFanzineList()
         self.RefreshWindow()
@@ -609,26 +859,36 @@ class FanzinesEditorWindow(FanzinesGridGen):
     # Update the list entry for this CFL's server directory, or add it if it isn't in the list (e.g. a fanzine
     # newly created by Move to Different Fanzine from within another fanzine's dialog).
     def MergeCFLIntoList(self, cfl: ClassicFanzinesLine) -> None:
-        hits=[i for i, x in enumerate(self._fanzinesList) if x.ServerDir.lower() == cfl.ServerDir.lower()]
-        if hits:
-            self._fanzinesList[hits[0]]=cfl
-        else:
-            self._fanzinesList.append(cfl)
+        old=self._fanzinesList.Merge(cfl)       # (This keeps the list in order)
+        self._searchIndex.Replace(old, cfl)
+        if old is None or old is cfl or old != cfl:      # (If it's the same CFL, it may have been edited in place)
+            self.Datasource.NoteChange()
 
 
     def OnGridCellLeftClick( self, event ):
-        row=event.GetRow()
-        if row > self.Datasource.NumRows-1:
-            return
-        col=event.GetCol()
-        if col > self.Datasource.NumCols-1:
-            return
-        loc=row*self.Datasource.NumCols+col
-        if loc >= len(self.Datasource._fanzineList):
+        cfl=self.Datasource.FanzineAt(event.GetRow(), event.GetCol())
+        if cfl is None:
             return
-        cfl=self.Datasource._fanzineList[loc]
         self.CFLText.Label=f"{cfl}"
         self._dataGrid.OnGridCellLeftClick(event)
+        FanzineIndexPageCache.Prefetch([cfl.ServerDir])
+
+
+    def OnGridMotion(self, event):
+        event.Skip()
+        x, y=self.wxGrid.CalcUnscrolledPosition(event.GetX(), event.GetY())
+        cell=(self.wxGrid.YToRow(y), self.wxGrid.XToCol(x))
+        if cell == self._hoverCell:
+            return
+        self._hoverCell=cell
+        self._hoverTimer.StartOnce(500)     # (Restarted on each move, so it fires only once the mouse has stopped)
+
+    def OnHoverTimer(self, event):
+        if self._hoverCell is None:
+            return
+        cfl=self.Datasource.FanzineAt(*self._hoverCell)
+        if cfl is not None:
+            FanzineIndexPageCache.Prefetch([cfl.ServerDir])
 
 
     #-------------------
@@ -639,18 +899,24 @@ class FanzinesEditorWindow(FanzinesGridGen):
 
     @GuardReentry
     def OpenClickedCell(self, icol: int, irow: int):
+        self.OpenFanzine(self._Datasource.Rows[irow][icol])
 
-        serverDir=self._Datasource.Rows[irow][icol]
-        with FanzineIndexPageWindow(None, serverDir=serverDir) as fipw:
+
+    # Open a fanzine's index page for editing, optionally with one of its rows selected (see FanzineIndexPageWindow.ShowRow)
+    def OpenFanzine(self, serverDir: str, showRow: int|None=None, showDisplayText: str="") -> None:
+        from FanzineIndexPageEdit import FanzineIndexPageWindow     # Not needed until a fanzine is opened, so not imported at startup
+        with FanzineIndexPageCache.Paused(), FanzineIndexPageWindow(None, serverDir=serverDir) as fipw:
             if fipw.failure:
                 wx.MessageBox(f"Unable to load {serverDir}", caption="Loading Fanzine Index page", parent=self)
                 Log(f"FanzineIndexPageWindow('{serverDir}') failed")
                 return
+            if showRow is not None:
+                fipw.ShowRow(showRow, showDisplayText)
             fipw.ShowModal()
 
         # The edit may have updated some of the parameters -- and rows may have been moved to other fanzines
         # (possibly newly created ones) whose list entries also need updating or adding.
-        # (We can't use icol/irow to locate the entry -- they're meaningless if a search was active -- so we
+        # (We can't use the clicked cell's position to locate the entry -- it's meaningless if a search was active -- so we
         # match on the server directory, which is unique.)
         changed=False
         if fipw.CFL is not None:
@@ -661,7 +927,6 @@ class FanzinesEditorWindow(FanzinesGridGen):
             changed=True
         if changed:
             # Display the updated fanzines list
-            self._fanzinesList.sort(key=lambda cfl: cfl.ServerDir.casefold())
             self.Datasource.FanzineList=self._fanzinesList
             self.SearchFanzineList()
             self.RefreshWindow()
@@ -670,7 +935,8 @@ class FanzinesEditorWindow(FanzinesGridGen):
     # Upload the fanzines list to the classic fanzine page
     @GuardReentry
     def OnUploadPressed( self, event ):
-        success=PutClassicFanzineList(self._fanzinesList, self.RootDir)
+        with FanzineIndexPageCache.Paused():
+            success=PutClassicFanzineList(self._fanzinesList, self.RootDir)
         self.Raise()    # Bring the window to the top
         self.tSearch.SetFocus()     # And put the focus/cursor in the search box
         if success:
@@ -691,12 +957,13 @@ class FanzinesEditorWindow(FanzinesGridGen):
             result=dlg.ShowModal()
             dlg.Destroy()
             if result == wx.ID_YES:
-                self._fanzinesList=[x for x in self._fanzinesList if x.ServerDir != selectedFanzine]
-                self._fanzinesList.sort(key=lambda cfl: cfl.ServerDir.casefold())
+                for cfl in self._fanzinesList.Remove(selectedFanzine):
+                    self._searchIndex.Remove(cfl)
+                    self.Datasource.NoteChange()
                 searchtext=self.tSearch.GetValue()
                 fanzinelist=self._fanzinesList
                 if searchtext != "":
-                    fanzinelist=[x for x in self._fanzinesList if searchtext.casefold().replace("_", " ") in x.ServerDir.casefold().replace("_", " ") or searchtext.casefold() in x.Name.MainName.casefold()]
+                    fanzinelist=self._searchIndex.Search(searchtext)
                 self.Datasource.FanzineList=fanzinelist
                 self.RefreshWindow()
 
@@ -792,6 +1059,62 @@ class FanzinesPageRow(GridDataRowClass):
     def IsTextRow(self, val: bool) -> None:
         self._isText=val
 
+
+#=============================================================
+# A row of the main grid which has no cells of its own: each cell is looked up in the page's (1-D) list of fanzines
+# when it is asked for.  This way changing the list (e.g., on every search keystroke) costs nothing, and only the cells
+# the grid actually asks for are ever computed.
+class FanzinesPageRowView(FanzinesPageRow):
+
+    def __init__(self, page: FanzinesPage, irow: int):
+        GridDataRowClass.__init__(self)
+        self._page: FanzinesPage=page
+        self._irow: int=irow
+        self._isText=False
+
+    @property
+    def _cells(self) -> list[str]:
+        return [self._page.CellValue(self._irow, icol) for icol in range(self._page.NumCols)]
+
+    def __len__(self):
+        return self._page.NumCols
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, int):
+            if index < 0:
+                index+=self._page.NumCols
+            if index < 0 or index >= self._page.NumCols:
+                raise IndexError(f"FanzinesPageRowView.__getitem__({index}) index out of range.")
+            return self._page.CellValue(self._irow, index)
+        return FanzinesPageRow.__getitem__(self, index)
+
+    def __setitem__(self, index: str | int | slice, value: str | int | bool) -> None:
+        raise Exception(f"FanzinesPageRowView.__setitem__({index}): the fanzines grid is computed from the list of fanzines and can't be set.")
+
+
+# The rows of the main grid, as a sequence of FanzinesPageRowViews made on demand
+class FanzinesPageRows:
+
+    def __init__(self, page: FanzinesPage):
+        self._page: FanzinesPage=page
+
+    def __len__(self) -> int:
+        return self._page.NumRows
+
+    def __getitem__(self, index: int | slice) -> FanzinesPageRowView | list[FanzinesPageRowView]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index+=len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError(f"FanzinesPageRows.__getitem__({index}) index out of range.")
+        return FanzinesPageRowView(self._page, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield FanzinesPageRowView(self._page, i)
+
+
 #####################################################################################################
 #####################################################################################################
 
@@ -802,26 +1125,55 @@ class FanzinesPage(GridDataSource):
         self._colDefs: ColDefinitionsList=ColDefinitionsList([])
         for i in range(self._numCols):
             self._colDefs.append(ColDefinition("", IsEditable=IsEditable.Yes))
-        self._rows: list[FanzinesPageRow]=[]
         self._gridDataRowClass=FanzinesPageRow
         #self._daysForUpdatedFlag=Settings().Get("How old is old", 90)
 
         self._fanzineList:list[ClassicFanzinesLine]=[]
 
+        # The version of the list of fanzines. It is bumped each time the list is changed (but not when a search merely
+        # changes what is displayed), so "has anything changed?" is a single comparison.  The ClassicFanzinesLines don't
+        # track their own changes, so anything which changes one in place must call NoteChange() -- as MergeCFLIntoList() does.
+        self._version: int=0
+
     def __hash__(self):
         return sum([hash(x)*(i+1) for i, x in enumerate(self._fanzineList)])
 
 
+    # A full digest of the displayed fanzines' contents.  This is O(n), so it's not used to track changes -- use Version.
     def Signature(self) -> int:        
         return self.__hash__()
 
+
+    @property
+    def Version(self) -> int:
+        return self._version
+
+    def NoteChange(self) -> None:
+        self._version+=1
+
     # Inherited from GridDataSource
+    # The 1-D fanzine list is folded into the 2-D grid on the fly: row r, column c shows fanzine r*NumCols+c.
     @property
-    def Rows(self) -> list[FanzinesPageRow]:        
-        return self._rows
+    def Rows(self) -> FanzinesPageRows:        
+        return FanzinesPageRows(self)
     @Rows.setter
     def Rows(self, rows: list) -> None:        
-        self._rows=rows
+        raise Exception(f"FanzinesPage.Rows setter should never be called -- set FanzineList instead.")
+
+    # The fanzine displayed in a grid cell, or None if the cell is past the end of the list
+    def FanzineAt(self, irow: int, icol: int) -> ClassicFanzinesLine|None:
+        if icol < 0 or icol >= self._numCols:
+            return None
+        loc=irow*self._numCols+icol
+        if loc < 0 or loc >= len(self._fanzineList):
+            return None
+        return self._fanzineList[loc]
+
+    def CellValue(self, irow: int, icol: int) -> str:
+        cfl=self.FanzineAt(irow, icol)
+        if cfl is None:
+            return ""
+        return cfl.ServerDir
 
     @property
     def NumRows(self) -> int:        
@@ -831,31 +1183,17 @@ class FanzinesPage(GridDataSource):
         return numcells//self._numCols+1
 
     @property
-    def FanzineList(self) -> list[ClassicFanzinesLine]:
+    def FanzineList(self) -> list[ClassicFanzinesLine]|ClassicFanzinesList:
         return self._fanzineList
     @FanzineList.setter
-    def FanzineList(self, val: list[ClassicFanzinesLine]) -> None:
-        self._fanzineList=val
-
-        # Now distribute the 1-D fanzine list into the 2-D grid
-        self._rows=[]
-        for i in range(len(val)):
-            row=i//self._numCols
-            col=i%self._numCols
-            if col == 0:
-                self._rows.append(self._gridDataRowClass(self._numCols*[""]))
-            self._rows[row][col]=val[i].ServerDir
+    def FanzineList(self, val: list[ClassicFanzinesLine]|ClassicFanzinesList) -> None:
+        self._fanzineList=val       # (The grid's rows are computed from this on demand -- see Rows)
 
 
-    # The flat list of server-directory names currently shown in the grid (derived from the displayed rows)
+    # The flat list of server-directory names currently shown in the grid
     @property
     def ServerDirs(self) -> list[str]:
-        serverdirs=[]
-        for row in self._rows:
-            for cell in row:
-                if len(cell) > 0:
-                    serverdirs.append(cell)
-        return serverdirs
+        return [x.ServerDir for x in self._fanzineList if len(x.ServerDir) > 0]
 
 
     def __getitem__(self, index: int) -> FanzinesPageRow:
@@ -863,6 +1201,7 @@ class FanzinesPage(GridDataSource):
 
     def __setitem__(self, index: int, val: ClassicFanzinesLine) -> None:
         self._fanzineList[index]=val
+        self.NoteChange()
     def CanAddColumns(self) -> bool:        
         return False
 
@@ -874,7 +1213,9 @@ class FanzinesPage(GridDataSource):
         for i in range(num):
             ftr=ClassicFanzinesLine()
             self._fanzineList.insert(insertat+i, ftr)
+        self.NoteChange()
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()    # Needed by the batch mode's worker processes in the frozen exe
     main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+# The search index behind the main window's search box.
+#
+# The search box is re-run on every keystroke, so rather than casefolding every fanzine's server directory and name
+# each time, we normalize each fanzine's searchable text (server directory, main name, other names and editors) once,
+# when it is added to the index.  Normalizing folds case and accents and treats "_" as a space.
+#
+# To find substrings quickly we also keep a trigram index: for every three-character sequence, the set of fanzines whose
+# normalized text contains it.  A query of three or more characters then only needs to look at the fanzines which
+# contain all of the query's trigrams.  (Shorter queries match most of the list anyway, so they just scan it.)
+
+from unidecode import unidecode
+
+from ClassicFanzinesLine import ClassicFanzinesLine
+
+
+# Normalize text for searching
+def SearchFold(s: str) -> str:
+    return unidecode(s).casefold().replace("_", " ")
+
+
+def _Trigrams(s: str) -> set[str]:
+    return {s[i:i+3] for i in range(len(s)-2)}
+
+
+class _SearchEntry:
+    def __init__(self, cfl: ClassicFanzinesLine) -> None:
+        self.CFL: ClassicFanzinesLine=cfl
+        self.SortKey: str=cfl.ServerDir.casefold()      # The order of the main fanzines list
+        # The fields are joined with a character that can't be typed so that a match can't span two fields
+        fields=[cfl.ServerDir, cfl.Name.MainName]+cfl.Name.Othernames+[cfl.Editors]
+        self.Text: str="\x00".join([SearchFold(x) for x in fields])
+        self.Trigrams: set[str]=_Trigrams(self.Text)
+
+
+class FanzinesSearchIndex:
+    def __init__(self, fanzines: list[ClassicFanzinesLine]|None=None) -> None:
+        self._entries: dict[int, _SearchEntry]={}       # Keyed by id(cfl)
+        self._trigrams: dict[str, set[int]]={}
+        if fanzines is not None:
+            for cfl in fanzines:
+                self.Add(cfl)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def Add(self, cfl: ClassicFanzinesLine) -> None:
+        if id(cfl) in self._entries:
+            self.Remove(cfl)
+        entry=_SearchEntry(cfl)
+        self._entries[id(cfl)]=entry
+        for trigram in entry.Trigrams:
+            self._trigrams.setdefault(trigram, set()).add(id(cfl))
+
+    def Remove(self, cfl: ClassicFanzinesLine) -> None:
+        entry=self._entries.pop(id(cfl), None)
+        if entry is None:
+            return
+        for trigram in entry.Trigrams:
+            ids=self._trigrams.get(trigram)
+            if ids is not None:
+                ids.discard(id(cfl))
+                if len(ids) == 0:
+                    del self._trigrams[trigram]
+
+    # Replace old (if it's in the index) with new
+    def Replace(self, old: ClassicFanzinesLine|None, new: ClassicFanzinesLine) -> None:
+        if old is not None:
+            self.Remove(old)
+        self.Add(new)
+
+    # Return the fanzines whose searchable text contains searchtext, in the order of the main fanzines list
+    def Search(self, searchtext: str) -> list[ClassicFanzinesLine]:
+        query=SearchFold(searchtext)
+        if len(query) < 3:
+            candidates=self._entries.values()
+        else:
+            # Start with the rarest trigram and whittle the candidates down from there
+            postings=sorted([self._trigrams.get(x, set()) for x in _Trigrams(query)], key=len)
+            ids=set(postings[0])
+            for posting in postings[1:]:
+                if len(ids) == 0:
+                    break
+                ids&=posting
+            candidates=[self._entries[x] for x in ids]
+
+        hits=[x for x in candidates if query in x.Text]
+        hits.sort(key=lambda x: x.SortKey)
+        return [x.CFL for x in hits]
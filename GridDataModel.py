@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+# The column definitions and table handling the fanzine index page model needs, without wx.
+#
+# WxDataGrid's GridDataSource and ColDefinition classes live in the same module as its DataGrid, which imports wx, so a
+# model built on them can't be loaded without wx (e.g., by batch workers or the tests).  These are the parts of them the
+# model uses.  In the editor, FanzineIndexPageEdit's FanzineIndexPageGridSource puts GridDataSource underneath the
+# model for the DataGrid, which is handed these column definitions.  (They have the same attributes as WxDataGrid's,
+# and IsEditable compares equal to WxDataGrid's IsEditable of the same name.)
+
+from enum import Enum
+
+from Log import LogError
+
+
+class IsEditable(Enum):
+    Yes=1
+    No=2
+    Maybe=3         # Only once AllowCellEdit() has been called for the cell
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Enum) and type(other).__name__ == "IsEditable":
+            return self.name == other.name
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.name)
+
+
+# The definition of a column: its name (and the name it is preferably shown as), width, type and editability
+class ColDefinition:
+    def __init__(self, Name: str="", Width: int=100, Type: str="", IsEditable: IsEditable=IsEditable.Yes, Preferred: str=""):
+        self.Name=Name
+        self.Width=Width
+        self.Type=Type
+        self.IsEditable=IsEditable
+        self._preferred=Preferred
+
+    def __str__(self) -> str:
+        return self.Name
+
+    def Signature(self) -> int:
+        return hash(f"{self.Name};{self.Width};{self.Type};{self.IsEditable.name};{self._preferred}")
+
+    @property
+    def Preferred(self) -> str:
+        if self._preferred != "":
+            return self._preferred
+        return self.Name
+    @Preferred.setter
+    def Preferred(self, val: str) -> None:
+        self._preferred=val
+
+    # Does this column go by this name (either its own or its preferred one)?
+    def IsNamed(self, name: str) -> bool:
+        return name == self.Name or name == self.Preferred
+
+
+# A table's column definitions.  Columns can be looked up by either of their names as well as by position.
+class ColDefinitionsList(list):
+    def __init__(self, cols: list[ColDefinition]|None=None):
+        super().__init__(cols if cols is not None else [])
+
+    def __contains__(self, val: str|ColDefinition) -> bool:
+        if isinstance(val, str):
+            return any(x.IsNamed(val) for x in self)
+        return super().__contains__(val)
+
+    # The position of the first column of this name
+    def index(self, val: str|ColDefinition, *args) -> int:
+        if isinstance(val, str):
+            for i, x in enumerate(self):
+                if x.IsNamed(val):
+                    return i
+            raise ValueError(f"ColDefinitionsList.index(): no column named '{val}'")
+        return super().index(val, *args)
+
+    def __getitem__(self, index: int|slice|str) -> ColDefinition|ColDefinitionsList:
+        if isinstance(index, str):
+            return super().__getitem__(self.index(index))
+        if isinstance(index, slice):
+            return ColDefinitionsList(super().__getitem__(index))
+        return super().__getitem__(index)
+
+    def __add__(self, other: list[ColDefinition]) -> ColDefinitionsList:
+        return ColDefinitionsList(list(self)+list(other))
+
+    # Append a column, or all the columns of a list of them
+    def append(self, val: ColDefinition|list[ColDefinition]) -> None:
+        if isinstance(val, list):
+            self.extend(val)
+            return
+        super().append(val)
+
+    def Signature(self) -> int:
+        return sum([x.Signature()*(i+1) for i, x in enumerate(self)])
+
+
+# A table of rows under a list of column definitions.  A subclass supplies the rows (Rows, with each row's Cells).
+class TableDataSource:
+    def __init__(self):
+        self._colDefs: ColDefinitionsList=ColDefinitionsList([])
+
+    @property
+    def ColDefs(self) -> ColDefinitionsList:
+        return self._colDefs
+    @ColDefs.setter
+    def ColDefs(self, val: ColDefinitionsList) -> None:
+        self._colDefs=val
+
+    @property
+    def ColHeaders(self) -> list[str]:
+        return [x.Preferred for x in self._colDefs]
+
+    @property
+    def NumCols(self) -> int:
+        return len(self._colDefs)
+
+    # The position of the column of this name, or -1 if there isn't one
+    def ColHeaderIndex(self, name: str) -> int:
+        if name not in self._colDefs:
+            return -1
+        return self._colDefs.index(name)
+
+    # Insert a new (empty) column before column index.  (An index of NumCols appends it.)
+    def InsertColumn2(self, index: int, cdef: ColDefinition) -> None:
+        if index < 0 or index > self.NumCols:
+            LogError(f"TableDataSource.InsertColumn2(): column {index} is out of range")
+            return
+        self._colDefs.insert(index, cdef)
+        for row in self.Rows:
+            row.Cells.insert(index, "")
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+# Clean-up of the HTML of pages downloaded from fanac.org.
+#
+# Some pages have picked up runs of over-escaped ampersands ("&amp;amp;amp;...") and stray non-breaking spaces, either
+# as the character itself, as its UTF-8 bytes mis-decoded ("\xc2\xa0"), or as the literal text "0xa0" or "0xc2".
+# The non-breaking spaces are fixed with a single pass of a compiled regex rather than by repeated whole-page
+# str.replace()s, which matters for the larger pages.  The ampersand runs are rare, so a page is only searched for them
+# once unless it has some.
+
+import re
+
+
+_ampPattern=re.compile(r"&(?:amp;){2,}")            # "&amp;amp;", "&amp;amp;amp;", ...
+_nbspPattern=re.compile("\xc2\xa0|\xa0|0xa0|0xc2")  # (The two-character form must come before the lone \xa0)
+
+
+# Collapse each run of "&amp;amp;..." to a single "&amp;".  Returns the cleaned html and the number of runs collapsed.
+# This is done just as it always has been: every "amp;amp;" is replaced by "amp;" until there's no "&amp;amp;" left.
+# So runs of "amp;amp;..." which don't start with a real "&" (found in some already-mangled pages) are shortened, too.
+# (Each pass halves every run, so even a long one takes only a few passes.)
+def CollapseRedundantAmps(html: str) -> tuple[str, int]:
+    if "&amp;amp;" not in html:
+        return html, 0
+    ampRuns=len(_ampPattern.findall(html))
+    while "&amp;amp;" in html:
+        html=html.replace("amp;amp;", "amp;")
+    return html, ampRuns
+
+
+# Turn each non-breaking space (in any of its forms, see above) into a plain space
+def RemoveNbspCrap(s: str) -> str:
+    return _nbspPattern.sub(" ", s)
+
+
+# Do both of the above.  Returns the cleaned html and the number of "&amp;amp;..." runs collapsed.
+def CleanDownloadedHtml(html: str) -> tuple[str, int]:
+    html, ampRuns=CollapseRedundantAmps(html)
+    return RemoveNbspCrap(html), ampRuns
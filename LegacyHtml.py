@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+# A fast stand-in for BeautifulSoup(html, "html.parser") for reading old-style ("Jack") fanzine index pages.
+#
+# GetFanzineIndexPageOld() only needs findAll(name) and str() of the tags it finds, but building a BeautifulSoup tree with
+# the pure-Python html.parser (and then stringifying it, again and again) takes most of a second on a big legacy page.
+# ParseLegacyHtml() tokenizes the page with regexes and builds the same tree html.parser would: the same nesting (no
+# implied end tags; an end tag closes the most recent open tag of that name and is ignored if there isn't one; void
+# elements like <br> close at once), and the same serialization (lower-case names, attributes sorted and re-quoted,
+# entities decoded and &, < and > re-escaped, whitespace-only text collapsed to a single character).  Since the tags are
+# serialized in document order, the whole page is serialized once as it is parsed and str() of a tag is just a slice.
+#
+# It only handles the plain HTML the legacy pages are made of.  Anything else (processing instructions, CDATA, stray <s,
+# odd comments, ambiguous entities or attributes, ...) makes it return None, and the caller falls back to BeautifulSoup.
+# (lxml would be faster still, but it builds a different tree -- it un-nests the <h1><h2><h2> top matter, for one.)
+#
+# "FanzinesEditor --check-legacy <folder>" compares it with BeautifulSoup on every .html file in a folder (e.g., a
+# folder of captured legacy pages, or the local mirror of the server) -- see CheckLegacyParser().
+
+import os
+import re
+import argparse
+from html import unescape
+from html.entities import html5
+
+from Log import Log, LogError, LogOpen, LogClose
+
+
+BeautifulSoupVersion="4.15.0"       # The version of BeautifulSoup whose trees this has been checked against (see requirements-dev.txt)
+
+_voidElements={"area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta", "param", "source",
+               "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex", "nextid", "spacer"}
+_preserveWhitespaceElements={"pre", "textarea"}
+_rawTextElements={"script", "style"}       # Their text is neither decoded nor escaped
+
+# Attributes whose value is a list of words: it is re-joined with single spaces.  (Those for any tag are under "*".)
+_listAttributes={"*": {"class", "accesskey", "dropzone"}, "a": {"rel", "rev"}, "link": {"rel", "rev"}, "td": {"headers"}, "th": {"headers"},
+                 "form": {"accept-charset"}, "object": {"archive"}, "area": {"rel"}, "icon": {"sizes"}, "iframe": {"sandbox"}, "output": {"for"}}
+
+# The tokens we handle.  (A '<' or '&' which doesn't start one of them isn't.)
+_tokenPattern=re.compile(r"""(?P<text>[^<&]+)
+    |(?P<entity>&(?:\#(?P<decimal>[0-9]+);|\#[xX](?P<hex>[0-9a-fA-F]+);|(?P<entityname>[a-zA-Z][a-zA-Z0-9]*)(?:;|(?=[^-.a-zA-Z0-9]))))
+    |(?P<ampersand>&(?=[^\#a-zA-Z]))
+    |(?P<starttag><(?P<startname>[a-zA-Z][a-zA-Z0-9-]*)(?P<attributes>(?:\s+[a-zA-Z_:][-a-zA-Z0-9_:.]*(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?)*)\s*(?P<selfclosing>/?)>)
+    |(?P<endtag></(?P<endname>[a-zA-Z][a-zA-Z0-9-]*)\s*>)
+    |(?P<comment><!--(?P<commenttext>.*?)-->)
+    |(?P<doctype><!(?P<decl>[dD][oO][cC][tT][yY][pP][eE][^<>]*)>)""", flags=re.DOTALL|re.VERBOSE)
+_attributePattern=re.compile(r"([a-zA-Z_:][-a-zA-Z0-9_:.]*)(?:\s*=\s*(\"[^\"]*\"|'[^']*'|[^\s\"'=<>`]+))?")
+_endTagPattern=re.compile(r"</([a-zA-Z][a-zA-Z0-9-]*)\s*>")
+_whitespacePattern=re.compile(r"[ \n\t\f\r]*")
+_wordPattern=re.compile(r"\S+")
+
+_entities: dict[str, str]={}
+
+
+# The named entities as html.parser's BeautifulSoup builder decodes them
+def _Entities() -> dict[str, str]:
+    if len(_entities) == 0:
+        for name, character in sorted(html5.items()):
+            _entities.setdefault(name.removesuffix(";"), character)
+    return _entities
+
+
+def _Escape(s: str) -> str:
+    if "&" in s or "<" in s or ">" in s:
+        s=s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return s
+
+
+def _QuoteAttribute(value: str) -> str:
+    value=_Escape(value)
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"'+value.replace('"', "&quot;")+'"'
+
+
+# The serialized start tag, or None if it's one we don't handle
+def _StartTag(name: str, attributeText: str) -> str|None:
+    attributes: dict[str, str]={}
+    for m in _attributePattern.finditer(attributeText):
+        value=m.group(2)
+        if value is None:
+            value=""
+        elif value[0] in "\"'":
+            value=value[1:-1]
+        elif value.endswith("/"):
+            return None     # (Is <a href=x/> an empty element or a link to "x/"?  It depends on the version of html.parser.)
+        if "&" in value:
+            value=unescape(value)
+        attributes[m.group(1).lower()]=value        # (The last of duplicates wins)
+
+    listAttributes=_listAttributes["*"] | _listAttributes.get(name, set())
+    parts=[f"<{name}"]
+    for key, value in sorted(attributes.items()):
+        if key in listAttributes:
+            value=" ".join(_wordPattern.findall(value))
+        parts.append(f" {key}={_QuoteAttribute(value)}")
+    parts.append("/>" if name in _voidElements else ">")
+    return "".join(parts)
+
+
+# A tag in the tree built by ParseLegacyHtml().  It supports findAll(name) and str() just as a BeautifulSoup Tag does.
+class LegacyTag:
+    __slots__=("name", "_document", "_index", "_last", "_start", "_end")
+
+    def __init__(self, document: LegacyDocument, name: str, index: int, start: int) -> None:
+        self.name=name
+        self._document=document
+        self._index=index       # Its position in document.Tags (which are in document order)
+        self._last=index        # The position of its last descendant
+        self._start=start       # Its extent in document.Text
+        self._end=start
+
+    # All the tags of this name within it, in document order
+    def findAll(self, name: str) -> list[LegacyTag]:
+        return [x for x in self._document.Tags[self._index+1:self._last+1] if x.name == name]
+
+    def __str__(self) -> str:
+        return self._document.Text[self._start:self._end]
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+# The root of the tree
+class LegacyDocument(LegacyTag):
+    __slots__=("Tags", "Text")
+
+    def __init__(self) -> None:
+        super().__init__(self, "[document]", -1, 0)
+        self.Tags: list[LegacyTag]=[]
+        self.Text=""
+
+
+# Parse a page into the tree BeautifulSoup(html, "html.parser") would build.  Returns None if the page uses anything we don't handle.
+def ParseLegacyHtml(html: str) -> LegacyDocument|None:
+    document=LegacyDocument()
+    tags=document.Tags
+    out: list[str]=[]
+    outlen=0
+    stack: list[LegacyTag]=[]
+    data: list[str]=[]
+    preserveWhitespace=0
+    alreadyClosed: dict[str, int]={}     # Void elements closed at their start tag, whose end tag (if any) is to be ignored
+
+    # Add the pending text to the tree: as text, or (with its prefix and suffix) as a comment or doctype
+    def EndData(prefix: str="", suffix: str="") -> None:
+        nonlocal outlen
+        s="".join(data)
+        data.clear()
+        if preserveWhitespace == 0 and _whitespacePattern.fullmatch(s):
+            s="\n" if "\n" in s else " "
+        if prefix != "":
+            s=prefix+s+suffix
+        elif len(stack) == 0 or stack[-1].name not in _rawTextElements:
+            s=_Escape(s)
+        out.append(s)
+        outlen+=len(s)
+
+    def Close(tag: LegacyTag, endTag: str) -> None:
+        nonlocal outlen, preserveWhitespace
+        out.append(endTag)
+        outlen+=len(endTag)
+        tag._end=outlen
+        tag._last=len(tags)-1
+        if tag.name in _preserveWhitespaceElements:
+            preserveWhitespace-=1
+
+    # Close the most recent open tag of this name and everything opened since
+    def PopToTag(name: str) -> None:
+        if len(stack) > 0 and stack[-1].name == name:
+            tag=stack.pop()
+            Close(tag, f"</{name}>")
+            return
+        for i in range(len(stack)-2, -1, -1):
+            if stack[i].name == name:
+                while len(stack) > i:
+                    tag=stack.pop()
+                    Close(tag, f"</{tag.name}>")
+                return
+
+    entities=_Entities()
+    starttags: dict[tuple[str, str], str|None]={}       # (The same few start tags appear over and over)
+    pos=0
+    n=len(html)
+    while pos < n:
+        m=_tokenPattern.match(html, pos)
+        if m is None:
+            break
+        kind=m.lastgroup
+        pos=m.end()
+
+        if kind == "text":
+            data.append(m.group(0))
+
+        elif kind == "entity":
+            name=m.group("entityname")
+            if name is not None:
+                data.append(entities.get(name, "&"+name))
+            else:
+                number=int(m.group("decimal"), 10) if m.group("decimal") is not None else int(m.group("hex"), 16)
+                if number == 0 or 0x7f <= number <= 0x9f or 0xd800 <= number <= 0xdfff or number > 0x10ffff:
+                    Log(f"ParseLegacyHtml(): unhandled character reference at {m.start()}")
+                    return None
+                data.append(chr(number))
+
+        elif kind == "ampersand":
+            data.append("&")
+
+        elif kind == "starttag":
+            name=m.group("startname").lower()
+            key=(name, m.group("attributes"))
+            starttag=starttags.get(key, "")
+            if starttag == "":
+                starttag=starttags[key]=_StartTag(name, m.group("attributes"))
+            if starttag is None:
+                Log(f"ParseLegacyHtml(): unhandled <{name}> tag at {m.start()}")
+                return None
+            if data:
+                EndData()
+            tag=LegacyTag(document, name, len(tags), outlen)
+            tags.append(tag)
+            out.append(starttag)
+            outlen+=len(starttag)
+            if name in _voidElements:
+                Close(tag, "")
+                if m.group("selfclosing") == "":
+                    alreadyClosed[name]=alreadyClosed.get(name, 0)+1
+                continue
+            stack.append(tag)
+            if name in _preserveWhitespaceElements:
+                preserveWhitespace+=1
+            if m.group("selfclosing") != "":
+                PopToTag(name)
+            elif name in _rawTextElements:
+                # Its text runs up to its end tag
+                end=html.find("<", pos)
+                mend=_endTagPattern.match(html, end) if end != -1 else None
+                if mend is None or mend.group(1).lower() != name:
+                    Log(f"ParseLegacyHtml(): unhandled <{name}> at {m.start()}")
+                    return None
+                if end > pos:
+                    data.append(html[pos:end])
+                pos=end
+
+        elif kind == "endtag":
+            name=m.group("endname").lower()
+            if alreadyClosed.get(name, 0) > 0:
+                alreadyClosed[name]-=1
+                continue
+            if data:
+                EndData()
+            PopToTag(name)
+
+        elif kind == "comment":
+            comment=m.group("commenttext")
+            if "--" in comment or comment.startswith(">") or comment.startswith("->"):
+                Log(f"ParseLegacyHtml(): unhandled comment at {m.start()}")
+                return None
+            if data:
+                EndData()
+            data.append(comment)
+            EndData("<!--", "-->")
+
+        elif kind == "doctype":
+            if data:
+                EndData()
+            data.append(m.group("decl")[8:])
+            EndData("<!DOCTYPE ", ">\n")
+
+    if pos < n:
+        Log(f"ParseLegacyHtml(): unhandled '{html[pos]}' at {pos}: {html[pos:pos+20]!r}")
+        return None
+
+    if data:
+        EndData()
+    while len(stack) > 0:
+        tag=stack.pop()
+        Close(tag, f"</{tag.name}>")
+    document._last=len(tags)-1
+    document.Text="".join(out)
+    document._end=len(document.Text)
+    return document
+
+
+# Compare ParseLegacyHtml() with BeautifulSoup on every .html file in a folder (and its subfolders): each file must
+# either be rejected or give the same tree.  Returns the number of files which differ.
+def CheckLegacyParser(folder: str) -> int:
+    import bs4
+    from bs4 import BeautifulSoup
+    if bs4.__version__ != BeautifulSoupVersion:
+        LogError(f"CheckLegacyParser(): this is BeautifulSoup {bs4.__version__}, but the parser has been checked against {BeautifulSoupVersion}")
+
+    checked=0
+    rejected=0
+    differ=0
+    for dirpath, _, filenames in os.walk(folder):
+        for filename in sorted(filenames):
+            if not filename.lower().endswith((".html", ".htm")):
+                continue
+            path=os.path.join(dirpath, filename)
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    html=f.read()
+            except OSError as e:
+                LogError(f"CheckLegacyParser(): unable to read {path}: {e}")
+                continue
+            checked+=1
+            fast=ParseLegacyHtml(html)
+            if fast is None:
+                rejected+=1
+                continue
+            soup=BeautifulSoup(html, "html.parser")
+            for name in ["body", "table", "tr", "th", "td", "fanac-type"]:
+                fastTags=[str(x) for x in fast.findAll(name)]
+                soupTags=[str(x) for x in soup.findAll(name)]
+                if fastTags != soupTags:
+                    LogError(f"CheckLegacyParser(): {path}: the <{name}> tags differ")
+                    differ+=1
+                    break
+
+    Log(f"CheckLegacyParser({folder}): {checked} pages checked, {rejected} left to BeautifulSoup, {differ} differ")
+    return differ
+
+
+# "FanzinesEditor --check-legacy <folder>" runs CheckLegacyParser() without the GUI
+def CheckLegacyMain(args: list[str]) -> int:
+    parser=argparse.ArgumentParser(prog="FanzinesEditor --check-legacy", description="Compare the fast legacy page parser with BeautifulSoup.")
+    parser.add_argument("folder", help="a folder of captured legacy fanzine index pages")
+    options=parser.parse_args(args)
+
+    homedir=os.getcwd()
+    LogOpen(os.path.join(homedir, "Log -- FanzinesEditor check-legacy.txt"), os.path.join(homedir, "Log (Errors) -- FanzinesEditor check-legacy.txt"))
+    differ=CheckLegacyParser(options.folder)
+    LogClose()
+    return 1 if differ > 0 else 0
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+# What the server's Classic_Fanzines.html holds, as of when we last downloaded (or uploaded) it.
+#
+# We remember a digest of the page's table section and the content of each fanzine in it.  When the user uploads the
+# list, a table whose digest matches needs neither a backup nor an upload.  When it has changed, we can say which
+# fanzines were added, removed or changed.
+
+import hashlib
+
+from ClassicFanzinesLine import ClassicFanzinesLine
+from ClassicFanzinesList import ServerDirKey
+
+
+def TableDigest(table: str) -> str:
+    return hashlib.sha256(table.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+class PublishedClassicFanzines:
+    g_serverDir: str|None=None                  # The directory the page is in
+    g_tableDigest: str|None=None
+    g_fanzines: dict[str, tuple[int, str]]={}   # ServerDirKey -> (hash of the CFL, main name)
+
+    @staticmethod
+    def Record(serverDir: str, tableDigest: str|None, fanzines) -> None:
+        PublishedClassicFanzines.g_serverDir=serverDir.strip("/")
+        PublishedClassicFanzines.g_tableDigest=tableDigest
+        PublishedClassicFanzines.g_fanzines={ServerDirKey(x.ServerDir): (hash(x), x.Name.MainName) for x in fanzines}
+
+    # Is this table what's already on the server in serverDir?
+    @staticmethod
+    def IsUnchanged(serverDir: str, tableDigest: str) -> bool:
+        return PublishedClassicFanzines.g_tableDigest is not None and PublishedClassicFanzines.g_tableDigest == tableDigest and \
+            PublishedClassicFanzines.g_serverDir == serverDir.strip("/")
+
+    # Compare a list of fanzines with what's on the server.  Returns the names of the fanzines added, removed and changed.
+    @staticmethod
+    def Diff(fanzines) -> tuple[list[str], list[str], list[str]]:
+        published=PublishedClassicFanzines.g_fanzines
+        current: dict[str, ClassicFanzinesLine]={ServerDirKey(x.ServerDir): x for x in fanzines}
+        added=[x.Name.MainName for key, x in current.items() if key not in published]
+        removed=[name for key, (_, name) in published.items() if key not in current]
+        changed=[x.Name.MainName for key, x in current.items() if key in published and published[key][0] != hash(x)]
+        return added, removed, changed
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+# Content-addressed backups of the files we overwrite on the server.
+#
+# FTP().BackupServerFile() copies a file to a new timestamped file every time, so a page which is uploaded again and
+# again piles up full copies, many of them identical.  Instead, the copy about to be replaced is stored in the "Backups"
+# subdirectory of its directory under a name made from its digest: an index.html whose contents hash to 3fa91c... is
+# backed up as Backups/index-3fa91c....html.  A revision which has been backed up before is already there, so it isn't
+# stored again.  (When each revision was replaced is in the FTP log's "backup" entries, which name the backup file.)
+
+import os
+import hashlib
+
+from FTP import FTP
+from Log import Log, LogError
+
+
+_backupDirectory="Backups"
+_digestLength=16        # Hex digits of the digest which go into the name
+
+
+# The name the backup of filename goes under when its contents are text
+def BackupFilename(filename: str, text: str) -> str:
+    digest=hashlib.sha256(text.encode("utf-8")).hexdigest()[:_digestLength]
+    base, ext=os.path.splitext(filename)
+    return f"{base}-{digest}{ext}"
+
+
+# Back up serverDir/filename, whose contents are text.  Returns the backup's path relative to serverDir, or None if it couldn't be stored.
+def BackupServerText(serverDir: str, filename: str, text: str) -> str|None:
+    backupDir=f"{serverDir.rstrip('/')}/{_backupDirectory}"
+    name=BackupFilename(filename, text)
+    if FTP().FileExists(f"{backupDir}/{name}"):
+        Log(f"BackupServerText(): {serverDir}/{filename} is already backed up as {_backupDirectory}/{name}")
+        return f"{_backupDirectory}/{name}"
+
+    if not FTP().PutFileAsString(backupDir, name, text, create=True):
+        LogError(f"BackupServerText(): could not store {backupDir}/{name} because {FTP().LastMessage}")
+        return None
+    Log(f"BackupServerText(): {serverDir}/{filename} backed up as {_backupDirectory}/{name}")
+    return f"{_backupDirectory}/{name}"
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+# A local mirror of the fanzine directories on the server.
+#
+# For each fanzine directory, the mirror holds a copy of its index.html (and index.json, if any) and a listing of its files with their stamps
+# (size and modification time, see FTPStat), kept in the directory's .mirror.json.  The root's .mirror.json holds the
+# modification time of each fanzine directory as of the last Sync().
+#
+# Sync() refreshes the mirror incrementally: one MLSD of the root shows which directories have changed since the last
+# sync, and only those are listed again and have their index.html and index.json downloaded (if they have changed).
+# GetFileAsString() reads through the mirror, downloading a file only if the mirror's copy is out of date.  For a directory
+# which Sync() has found current during this run, the stamps in its listing are trusted; for any other, it asks the server
+# for the file's stamp (a single MLST).  (So a file overwritten without changing its directory's modification time is
+# missed until the directory next changes.  The editor's own uploads update the mirror as they go.)
+#
+# A directory which is gone from the server is only marked stale: nothing in its mirror is trusted any more, but nothing
+# is deleted either, so a listing which is wrong for a moment can't throw the mirror away.
+#
+# The mirror is on unless the setting "Use local mirror" is False.  It lives in the "Mirror directory" setting's
+# directory (default: Mirror in the editor's home directory).
+
+import os
+import json
+
+from FTP import FTP
+from FTPStat import ServerFileStamp, ServerListing, StampFromFacts
+from Log import Log
+from Settings import Settings
+
+
+_listingFilename=".mirror.json"
+_syncedFilenames=["index.html", "index.json"]
+
+
+class ServerMirror:
+    g_listedDirs: set[str]=set()        # The directories whose listings Sync() has found current during this run
+
+    @staticmethod
+    def Enabled() -> bool:
+        return Settings().Get("Use local mirror", "True") != "False"
+
+    @staticmethod
+    def LocalPath(serverDir: str, filename: str="") -> str:
+        root=Settings().Get("Mirror directory", "")
+        if root == "":
+            root=os.path.join(os.getcwd(), "Mirror")
+        return os.path.join(root, *[x for x in serverDir.split("/") if x != ""], filename)
+
+
+    # A directory's listing: "modify" is the directory's mtime (for the root: name -> mtime of each subdirectory),
+    # "files" is name -> stamp of each file on the server, and "mirrored" is name -> stamp of each file copied to the mirror.
+    @staticmethod
+    def _ReadListing(serverDir: str) -> dict:
+        path=ServerMirror.LocalPath(serverDir, _listingFilename)
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    listing=json.load(f)
+                if isinstance(listing, dict):
+                    return {"modify": listing.get("modify", {}), "files": listing.get("files", {}), "mirrored": listing.get("mirrored", {})}
+            except (OSError, ValueError) as e:
+                Log(f"ServerMirror: unable to read {path}: {e}")
+        return {"modify": {}, "files": {}, "mirrored": {}}
+
+    @staticmethod
+    def _WriteListing(serverDir: str, listing: dict) -> None:
+        path=ServerMirror.LocalPath(serverDir, _listingFilename)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file and then swap it in so a crash can't leave a half-written listing behind
+            with open(path+".tmp", "w", encoding="utf-8") as f:
+                json.dump(listing, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(path+".tmp", path)
+        except OSError as e:
+            Log(f"ServerMirror: unable to write {path}: {e}")
+
+
+    # Put a copy of a file (whose stamp on the server is stamp) into the mirror
+    @staticmethod
+    def _Save(serverDir: str, filename: str, text: str, stamp: str|None, listing: dict|None=None) -> None:
+        if stamp is None:
+            return
+        if listing is None:
+            listing=ServerMirror._ReadListing(serverDir)
+        path=ServerMirror.LocalPath(serverDir, filename)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+        except OSError as e:
+            Log(f"ServerMirror: unable to write {path}: {e}")
+            return
+        listing["mirrored"][filename]=stamp
+        ServerMirror._WriteListing(serverDir, listing)
+
+
+    # Get a file from the server as a string, using the mirror's copy if it's up-to-date.  (Like FTP().GetFileAsString)
+    @staticmethod
+    def GetFileAsString(serverDir: str, filename: str, TestLoad: bool=False) -> str|None:
+        if not ServerMirror.Enabled():
+            return FTP().GetFileAsString(serverDir, filename, TestLoad=TestLoad)
+
+        listing=ServerMirror._ReadListing(serverDir)
+        if "/"+serverDir.strip("/") in ServerMirror.g_listedDirs:
+            stamp=listing["files"].get(filename)
+        else:
+            stamp=ServerFileStamp(serverDir, filename)
+        path=ServerMirror.LocalPath(serverDir, filename)
+        if stamp is not None and listing["mirrored"].get(filename) == stamp and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8", newline="") as f:
+                    return f.read()
+            except OSError as e:
+                Log(f"ServerMirror: unable to read {path}: {e}")
+
+        text=FTP().GetFileAsString(serverDir, filename, TestLoad=TestLoad)
+        if text is not None:
+            ServerMirror._Save(serverDir, filename, text, stamp, listing)
+        return text
+
+
+    # The mirror's copy of a file, without checking whether it's up-to-date.  This is only for files which carry their own
+    # check (as index.json carries the digest of the index.html it goes with).  Returns None if there isn't one.
+    @staticmethod
+    def GetMirroredCopy(serverDir: str, filename: str) -> str|None:
+        if not ServerMirror.Enabled():
+            return None
+        path=ServerMirror.LocalPath(serverDir, filename)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                return f.read()
+        except OSError as e:
+            Log(f"ServerMirror: unable to read {path}: {e}")
+            return None
+
+
+    # We've just uploaded text as serverDir/filename: update the mirror to match
+    @staticmethod
+    def Store(serverDir: str, filename: str, text: str) -> None:
+        if not ServerMirror.Enabled():
+            return
+        stamp=ServerFileStamp(serverDir, filename)
+        listing=ServerMirror._ReadListing(serverDir)
+        if stamp is not None:
+            listing["files"][filename]=stamp      # Keep a trusted listing in step with the server
+        else:
+            ServerMirror.g_listedDirs.discard("/"+serverDir.strip("/"))     # We no longer know what's there
+        ServerMirror._Save(serverDir, filename, text, stamp, listing)
+
+
+    # Bring the mirror of the fanzine directories in rootDir up to date.  Returns the number of directories refreshed,
+    # or -1 if the server can't be listed.
+    @staticmethod
+    def Sync(rootDir: str) -> int:
+        rootDir="/"+rootDir.strip("/")
+        top=ServerListing(rootDir)
+        if top is None:
+            Log(f"ServerMirror.Sync({rootDir}): unable to list the server")
+            return -1
+        rootListing=ServerMirror._ReadListing(rootDir)
+        synced: dict[str, str]=rootListing["modify"]
+
+        refreshed=0
+        dirs={name: facts.get("modify", "") for name, facts in top.items() if facts.get("type") == "dir"}
+        for name, modify in dirs.items():
+            serverDir=f"{rootDir}/{name}"
+            if modify != "" and synced.get(name) == modify:
+                ServerMirror.g_listedDirs.add(serverDir)
+                continue        # Unchanged since the last sync
+
+            ServerMirror.g_listedDirs.discard(serverDir)
+            files=ServerListing(serverDir)
+            if files is None:
+                continue
+            listing=ServerMirror._ReadListing(serverDir)
+            listing["modify"]=modify
+            listing["files"]={x: StampFromFacts(facts) for x, facts in files.items() if facts.get("type") == "file"}
+            for filename in _syncedFilenames:
+                stamp=listing["files"].get(filename)
+                if stamp is not None and listing["mirrored"].get(filename) != stamp:
+                    text=FTP().GetFileAsString(serverDir, filename)
+                    if text is not None:
+                        ServerMirror._Save(serverDir, filename, text, stamp, listing)
+            ServerMirror._WriteListing(serverDir, listing)
+            synced[name]=modify
+            ServerMirror.g_listedDirs.add(serverDir)
+            refreshed+=1
+
+        # Mark the mirrors of directories which are gone from the server as stale.  (Should one come back, it will be
+        # listed and downloaded afresh.)
+        for name in [x for x in synced if x not in dirs]:
+            del synced[name]
+            serverDir=f"{rootDir}/{name}"
+            ServerMirror.g_listedDirs.discard(serverDir)
+            if os.path.exists(ServerMirror.LocalPath(serverDir, _listingFilename)):
+                ServerMirror._WriteListing(serverDir, {"modify": "", "files": {}, "mirrored": {}})
+            Log(f"ServerMirror.Sync({rootDir}): {name} is gone from the server; its mirror is now stale")
+
+        ServerMirror._WriteListing(rootDir, rootListing)
+        Log(f"ServerMirror.Sync({rootDir}): {refreshed} of {len(dirs)} directories refreshed")
+        return refreshed
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+# Page templates compiled into static text plus named slots.
+#
+# Our pages are made by taking a template file and running a series of HTML helper functions over it, each of which
+# finds a marker (a fanac comment pair, a bracketed tag, ...) and puts something there.  Each helper call searches
+# and copies the whole document, and the template is read from disk every time.
+#
+# Instead, we run the very same helper calls just once per template, inserting a unique sentinel string instead of the
+# real contents.  Splitting the result on the sentinels gives us the static segments between the slots.  Rendering a
+# page is then one join of segments and slot values.  Because the markers are located by the same helpers the old
+# code used, the rendered page is identical to what the sequence of helper calls would have produced.
+
+import os
+from typing import Callable
+
+from Log import Log, LogError
+
+
+# A slot inserter takes the document and the text to be inserted and returns the updated document ("" on failure)
+SlotInserter=Callable[[str, str], str]
+
+
+class SlotTemplate:
+    def __init__(self, segments: list[str], slots: list[str]) -> None:
+        assert len(segments) == len(slots)+1
+        self._segments: list[str]=segments
+        self._slots: list[str]=slots
+
+    @property
+    def Slots(self) -> list[str]:
+        return self._slots
+
+    @staticmethod
+    def Sentinel(name: str) -> str:
+        return f"@@@FanzinesEditor-slot-{name}@@@"
+
+    # Compile template text by running each (name, inserter) over it in order with a sentinel as the inserted text.
+    # The optional slots may be missing from the template, in which case they're left out (and their values are ignored).
+    @staticmethod
+    def Compile(text: str, slots: list[tuple[str, SlotInserter]], optional: set[str]|None=None) -> SlotTemplate|None:
+        found: list[str]=[]
+        for name, inserter in slots:
+            sentinel=SlotTemplate.Sentinel(name)
+            if sentinel in text:
+                LogError(f"SlotTemplate.Compile(): slot '{name}' is used twice")
+                return None
+            temp=inserter(text, sentinel)
+            if temp == "" or sentinel not in temp:
+                if optional is not None and name in optional:
+                    Log(f"SlotTemplate.Compile(): optional slot '{name}' is not in the template")
+                    continue
+                LogError(f"SlotTemplate.Compile(): could not locate slot '{name}'")
+                return None
+            text=temp
+            found.append(name)
+
+        # Now break the text apart at the sentinels, in the order in which they appear
+        located=sorted([(text.find(SlotTemplate.Sentinel(name)), name) for name in found])
+        segments: list[str]=[]
+        names: list[str]=[]
+        pos=0
+        for loc, name in located:
+            if text.count(SlotTemplate.Sentinel(name)) != 1:
+                LogError(f"SlotTemplate.Compile(): slot '{name}' was inserted more than once")
+                return None
+            segments.append(text[pos:loc])
+            names.append(name)
+            pos=loc+len(SlotTemplate.Sentinel(name))
+        segments.append(text[pos:])
+        return SlotTemplate(segments, names)
+
+    # Fill in the slots.  Every slot must be supplied.
+    def Render(self, values: dict[str, str]) -> str:
+        parts: list[str]=[self._segments[0]]
+        for name, segment in zip(self._slots, self._segments[1:]):
+            parts.append(values[name])
+            parts.append(segment)
+        return "".join(parts)
+
+
+# Compiled templates, keyed by filename and slot names.  A template is recompiled if the file has changed on disk.
+_templateCache: dict[tuple[str, tuple[str, ...], tuple[str, ...]], tuple[float, SlotTemplate]]={}
+
+def LoadSlotTemplate(filename: str, slots: list[tuple[str, SlotInserter]], optional: set[str]|None=None) -> SlotTemplate|None:
+    key=(filename, tuple([name for name, _ in slots]), tuple(sorted(optional or [])))
+    try:
+        mtime=os.path.getmtime(filename)
+    except OSError:
+        LogError(f"LoadSlotTemplate() can't find '{filename}' at {os.getcwd()}")
+        return None
+
+    cached=_templateCache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(filename) as f:
+        text=f.read()
+    template=SlotTemplate.Compile(text, slots, optional)
+    if template is None:
+        LogError(f"LoadSlotTemplate(): unable to compile '{filename}'")
+        return None
+    Log(f"LoadSlotTemplate(): compiled '{filename}' with slots {template.Slots}")
+    _templateCache[key]=(mtime, template)
+    return template
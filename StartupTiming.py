@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+# Timing of FanzinesEditor's startup.
+#
+# Startup is a sequence of phases (loading settings, connecting to the server, taking the lock, loading the list of
+# fanzines, ...), some of which run on a background thread.  Each phase is wrapped in StartupPhase(), which logs how
+# long it took, and milestones (e.g., the main window first appearing) are logged with the time since startup began.
+#
+# Startup profiling: set the environment variable FANZINESEDITOR_PROFILE_STARTUP=1 (or start the editor with
+# --profile-startup) and the time taken to import each module is recorded as well, and written to the log along with
+# the time until the main window is first painted.  (It has to be an environment variable or command line switch rather
+# than a setting, since the imports are over before the settings file is read.)  Timing is done by wrapping
+# builtins.__import__, so it works just the same in the frozen PyInstaller exe, where python -X importtime can't be used.
+
+import os
+import sys
+import time
+import builtins
+import threading
+from contextlib import contextmanager
+
+from Log import Log
+
+
+_startTime: float=time.perf_counter()
+
+
+# Seconds since startup began (which is when this module was first imported)
+def StartupElapsed() -> float:
+    return time.perf_counter()-_startTime
+
+
+def LogStartupMilestone(name: str) -> None:
+    Log(f"Startup: {name} at {StartupElapsed():.3f} sec")
+
+
+@contextmanager
+def StartupPhase(name: str):
+    start=time.perf_counter()
+    try:
+        yield
+    finally:
+        Log(f"Startup: {name} took {time.perf_counter()-start:.3f} sec")
+
+
+#--------------------------------------------------
+# Startup profiling
+
+_profiling: bool=os.environ.get("FANZINESEDITOR_PROFILE_STARTUP", "").strip().lower() in ("1", "true", "yes") or "--profile-startup" in sys.argv
+
+_realImport=builtins.__import__
+_importTimes: dict[str, tuple[float, float]]={}    # Module name -> (total time, time excluding the modules it imported)
+_importStacks=threading.local()                     # Per thread: the time spent in nested imports of each import in progress
+
+
+def StartupProfiling() -> bool:
+    return _profiling
+
+
+def _TimedImport(name, globals=None, locals=None, fromlist=(), level=0):
+    # Only first-time imports take any time worth measuring
+    if level != 0 or name in sys.modules:
+        return _realImport(name, globals, locals, fromlist, level)
+
+    stack=getattr(_importStacks, "stack", None)
+    if stack is None:
+        stack=_importStacks.stack=[]
+    stack.append(0.0)
+    start=time.perf_counter()
+    try:
+        return _realImport(name, globals, locals, fromlist, level)
+    finally:
+        elapsed=time.perf_counter()-start
+        nested=stack.pop()
+        if len(stack) > 0:
+            stack[-1]+=elapsed
+        if name not in _importTimes:
+            _importTimes[name]=(elapsed, elapsed-nested)
+
+
+# Log the import times recorded so far and stop recording them.  Called once the main window has been painted.
+def LogStartupProfile(count: int=30) -> None:
+    if not _profiling:
+        return
+    if builtins.__import__ is _TimedImport:
+        builtins.__import__=_realImport
+
+    frozen=" (frozen)" if getattr(sys, "frozen", False) else ""
+    importTime=sum([x[1] for x in _importTimes.values()])
+    Log(f"Startup profile{frozen}: {len(_importTimes)} modules imported in {importTime:.3f} sec")
+    Log(f"      total      self   module")
+    for name, (total, own) in sorted(_importTimes.items(), key=lambda x: x[1][1], reverse=True)[:count]:
+        Log(f"    {total:7.3f}   {own:7.3f}   {name}")
+
+
+if _profiling:
+    builtins.__import__=_TimedImport
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+# The tests import the editor's modules from the repository root (as FanzinesEditor does) and are run from there, since
+# the page templates are loaded from the current directory.
+#
+# Like the editor itself, they need the helper packages (HelpersPackage, WxDataGrid, FTP, Log, Settings, ...) which the
+# mklinks*.bat scripts link into the repository, and (for the tests of FanzinesEditor's own functions) wxPython.  What the
+# tests need beyond that (pytest and the pinned BeautifulSoup) is in requirements-dev.txt.
+
+import os
+import sys
+
+import pytest
+
+
+RepoRoot=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RepoRoot not in sys.path:
+    sys.path.insert(0, RepoRoot)
+
+
+@pytest.fixture(autouse=True)
+def _RunInRepoRoot(monkeypatch):
+    monkeypatch.chdir(RepoRoot)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+# Rendering Classic_Fanzines.html from its compiled template (LoadClassicFanzinesTemplate() and RenderClassicFanzinesRows(),
+# as PutClassicFanzineList() uses them).
+
+import time
+from datetime import datetime, timedelta
+
+from ClassicFanzinesLine import ClassicFanzinesLine, ClassicFanzinesDate
+from FanzineNames import FanzineNames
+from FanzinesEditor import LoadClassicFanzinesTemplate, RenderClassicFanzinesRows
+from HelpersPackage import InsertHTMLUsingFanacStartEndCommentPair, UnicodeToHtml, Int0
+from Settings import Settings
+
+
+# Fanzines with every combination of the New, Updated and Complete flags, other names, and text which needs escaping
+def _FixtureFanzines(count: int=16) -> list[ClassicFanzinesLine]:
+    now=datetime.now()
+    fanzines=[]
+    for i in range(count):
+        cfl=ClassicFanzinesLine()
+        cfl.ServerDir=f"Zine{i:02}"
+        cfl.Name=FanzineNames(f"Zine {i} Café", [f"Other Zine {i}", "Encore"] if i%5 == 0 else [])
+        cfl.Editors="Bob Tucker; Joe & Jane Fann" if i%2 == 0 else "Walt Willis"
+        cfl.Dates=f"{1940+i} - {1950+i}"
+        cfl.Type="Genzine" if i%3 else "Clubzine"
+        cfl.Issues=i*3
+        cfl.Complete=i%2 == 1
+        cfl.Created=now-timedelta(days=10 if i%4 < 2 else 1000)
+        cfl.Updated=now-timedelta(days=10 if i%8 < 4 else 1000)
+        cfl.DuplicateCopy=i%7 == 3
+        fanzines.append(cfl)
+    return fanzines
+
+
+# The page as it was rendered before the template was compiled into a SlotTemplate: the template file, with the table
+# and then the Updated date inserted into it.  The compiled template must produce just the same page.
+def _RenderClassicFanzinesPageOld(fanzines: list[ClassicFanzinesLine]) -> str:
+    with open("Template - Classic_Fanzines.html") as f:
+        output=f.read()
+
+    insert=""
+    for fanzine in fanzines:
+        row='<TR VALIGN="top">\n'
+        row+='<TD><IMG SRC="blue.gif" HEIGHT="14" WIDTH="21" ALT="[BB]"></TD>\n'
+        row+=f'<TD sorttable_customkey="{fanzine.DisplayNameSort}"><A HREF="{fanzine.ServerDir}/"><STRONG>{UnicodeToHtml(fanzine.Name.MainName)}</STRONG></A>'
+        if len(fanzine.Name.Othernames) > 0:
+            row+="<br>"+fanzine.Name.OthernamesAsHTML
+        row+=f'</TD>'
+        row+=f'<TD sorttable_customkey="{fanzine.EditorsSort}">{UnicodeToHtml(fanzine.Editors)}</TD>\n'
+        row+=f'<TD sorttable_customkey="{fanzine.DatesSort}">{fanzine.Dates}</TD>\n'
+        row+=f'<TD>{fanzine.Type}</TD>\n'
+        row+=f'<TD CLASS="right" sorttable_customkey="{fanzine.IssuesSort}">{fanzine.Issues}</TD>\n'
+
+        updatedFlag=fanzine.Updated.DaysAgo() < Int0(Settings().Get("How old is updated", 90))
+        newFlag=fanzine.Created.DaysAgo() < Int0(Settings().Get("How old is new", 90))
+        flags=("n" if newFlag else "")+("u" if updatedFlag else "")+("c" if fanzine.Complete else "")
+        match flags:
+            case "":
+                row+=f'<TD sorttable_customkey="zzzz"><BR>&nbsp;<br>\n'
+            case "c":
+                row+=f'<TD sorttable_customkey="complete"><X CLASS="complete">Complete</X><br>\n'
+            case "u":
+                row+=f'<TD sorttable_customkey="updated"><X CLASS="updated">Updated</X><br>\n'
+            case "n":
+                row+=f'<TD sorttable_customkey="new"><X CLASS="new">New</X><br>\n'
+            case "uc":
+                row+=f'<TD sorttable_customkey="complete+updated"><X CLASS="complete">Complete</X><br><X CLASS="updated">Updated</X><br>\n'
+            case "nc":
+                row+=f'<TD sorttable_customkey="complete+new"><X CLASS="complete">Complete</X><br><X CLASS="new">New</X><br>\n'
+            case "nu":
+                row+=f'<TD sorttable_customkey="new+updated"><X CLASS="updated">Updated</X><br><X CLASS="new">New</X><br>\n'
+            case "nuc":
+                row+=f'<TD sorttable_customkey="complete+updated+new"><X CLASS="complete">Complete</X><br><X CLASS="updated">Updated</X><br><X CLASS="new">New</X><br>\n'
+
+        row+=f'<!-- fanac-updated {str(fanzine.Updated)} -->\n'
+        row+=f'<!-- fanac-created {str(fanzine.Created)} -->\n'
+        row+=f'<!-- fanac-duplicate {"yes" if fanzine.DuplicateCopy else "no"} -->\n'
+        row+=f'</TD></TR>\n'
+        insert+=row
+
+    output=InsertHTMLUsingFanacStartEndCommentPair(output, "table", insert)
+    return InsertHTMLUsingFanacStartEndCommentPair(output, "updated", f"Updated {ClassicFanzinesDate().Now()}")
+
+
+def test_RenderMatchesOldRenderer():
+    fanzines=_FixtureFanzines()
+    template=LoadClassicFanzinesTemplate()
+    assert template is not None
+    rendered=template.Render({"table": RenderClassicFanzinesRows(fanzines), "updated": f"Updated {ClassicFanzinesDate().Now()}"})
+    assert rendered == _RenderClassicFanzinesPageOld(fanzines)
+
+
+def test_EmptyList():
+    template=LoadClassicFanzinesTemplate()
+    assert template is not None
+    assert template.Render({"table": RenderClassicFanzinesRows([]), "updated": f"Updated {ClassicFanzinesDate().Now()}"}) == _RenderClassicFanzinesPageOld([])
+
+
+
+# A 10,000-fanzine page, rendered both ways.  (Best of three, to keep a busy machine from deciding it.  Both times include
+# reading the template file.)  Most of the time for a whole page goes to the rows' sort keys and dates, which both ways
+# share, so the page is also timed being put together from an already-rendered table, which is where the compiled
+# template differs.
+def test_Benchmark():
+    fanzines=_FixtureFanzines(10000)
+    updated=f"Updated {ClassicFanzinesDate().Now()}"
+
+    def RenderNew() -> str:
+        return LoadClassicFanzinesTemplate().Render({"table": RenderClassicFanzinesRows(fanzines), "updated": updated})
+
+    assert RenderNew() == _RenderClassicFanzinesPageOld(fanzines)
+
+    def Time(render) -> float:
+        best=float("inf")
+        for _ in range(3):
+            start=time.perf_counter()
+            render()
+            best=min(best, time.perf_counter()-start)
+        return best
+
+    old=Time(lambda: _RenderClassicFanzinesPageOld(fanzines))
+    new=Time(RenderNew)
+    print(f"\nRendering a 10,000-fanzine Classic_Fanzines.html: old {old*1000:.0f} ms, new {new*1000:.0f} ms ({old/new:.1f}x)")
+
+    table=RenderClassicFanzinesRows(fanzines)
+    def AssembleOld() -> str:
+        with open("Template - Classic_Fanzines.html") as f:
+            output=f.read()
+        output=InsertHTMLUsingFanacStartEndCommentPair(output, "table", table)
+        return InsertHTMLUsingFanacStartEndCommentPair(output, "updated", updated)
+    def AssembleNew() -> str:
+        return LoadClassicFanzinesTemplate().Render({"table": table, "updated": updated})
+
+    assert AssembleNew() == AssembleOld()
+    oldAssembly=Time(AssembleOld)
+    newAssembly=Time(AssembleNew)
+    print(f"Putting the page together around its table: old {oldAssembly*1000:.1f} ms, new {newAssembly*1000:.1f} ms ({oldAssembly/newAssembly:.0f}x)")
+    assert newAssembly < oldAssembly
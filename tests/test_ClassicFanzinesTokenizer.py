@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+# Splitting the rows of Classic_Fanzines.html into cells (TokenizeClassicFanzinesRow(), as GetClassicFanzinesList()
+# uses it) must give just what the old search-and-remove loop did, and be faster on a big page.
+
+import re
+import random
+import time
+
+import pytest
+
+from FanzinesEditor import TokenizeClassicFanzinesRow
+
+
+# The splitter as it was: find the first cell, keep its contents, remove it from the row, and repeat.  What's left is the last cell.
+def _SplitRowOld(srow: str) -> list[str]:
+    cells=[]
+    while True:
+        colpat=r"<td.*?>(.*?)</td>"
+        m=re.search(colpat, srow, flags=re.IGNORECASE | re.DOTALL)
+        if m is None:
+            if len(srow) > 0:
+                cells.append(srow)
+            break
+        cells.append(m.groups()[0])
+        srow=re.sub(colpat, "", srow, count=1, flags=re.IGNORECASE | re.DOTALL)
+    return cells
+
+
+# A row of the table as GetClassicFanzinesList() gets it (str() of the <tr>, from its first <td> on)
+def _Row(r: random.Random, i: int) -> str:
+    name=r.choice(["Aberration", "Zed, The", "Sky Hook", "Quandry", "Hyphen", "Le Zombie", "Café Fanac", "Science-Fiction Five-Yearly"])
+    othernames=r.choice(["", "", "", "<br/>Die Zeitschrift Fur Vollstandigen Unsinn", "<br/>Slant<br/>Slant &amp; Hyphen"])
+    flags=r.choice(['<br/>\xa0<br/>\n', '<x class="complete">Complete</x><br/>\n',
+                    '<x class="complete">Complete</x><br/><x class="updated">Updated</x><br/><x class="new">New</x><br/>\n'])
+    row=(f'<td><img alt="[BB]" height="14" src="blue.gif" width="21"/></td>\n'
+         f'<td sorttable_customkey="{name.upper()}{i}"><a href="{name.replace(" ", "_")}{i}/"><strong>{name} {i}</strong></a>{othernames}</td>'
+         f'<td sorttable_customkey="MOOMAW, KENT">Kent Moomaw; Joe &amp; Jane Fann</td>\n'
+         f'<td sorttable_customkey="{1940+i%60}0000">{1940+i%60}-{1945+i%60}</td>\n'
+         f'<td>{r.choice(["Genzine", "Clubzine", "Newszine", "Collection"])}</td>\n'
+         f'<td class="right" sorttable_customkey="{i%300:05}">{i%300}</td>\n'
+         f'<td sorttable_customkey="complete">{flags}'
+         f'<!-- fanac-updated 2024-01-{1+i%28:02} -->\n<!-- fanac-created 2010-05-06 -->\n<!-- fanac-duplicate {r.choice(["yes", "no"])} -->\n</td></tr>')
+    # Some rows have something odd about them
+    match i%7:
+        case 1:
+            row=row.upper()
+        case 2:
+            row=row.replace("</td>", "</TD>", 2).replace("<td ", "<TD\n", 1)
+        case 3:
+            row=row.removesuffix("</td></tr>")+"</tr>"       # The last cell isn't closed
+        case 4:
+            row="stray text "+row.replace("</td>\n", "</td> between\n", 1)
+    return row
+
+
+@pytest.fixture(scope="module")
+def Rows() -> list[str]:
+    r=random.Random(1)
+    return [_Row(r, i) for i in range(10000)]
+
+
+def test_SameCells(Rows: list[str]):
+    for row in Rows:
+        assert list(TokenizeClassicFanzinesRow(row)) == _SplitRowOld(row), row
+
+
+@pytest.mark.parametrize("row", ["", "no cells at all", "<td></td>", "<td>a</td>", "<td>a</td>b", "<td>a<td>b</td></td>", "<td>a</td>\n<TD x>b</Td>tail"])
+def test_EdgeCases(row: str):
+    assert list(TokenizeClassicFanzinesRow(row)) == _SplitRowOld(row)
+
+
+# The whole 10,000-row table, split both ways.  (Best of three, to keep a busy machine from deciding it.)
+def test_Benchmark(Rows: list[str]):
+    def Time(split) -> float:
+        best=float("inf")
+        for _ in range(3):
+            start=time.perf_counter()
+            for row in Rows:
+                split(row)
+            best=min(best, time.perf_counter()-start)
+        return best
+
+    old=Time(_SplitRowOld)
+    new=Time(lambda row: list(TokenizeClassicFanzinesRow(row)))
+    print(f"\nSplitting 10,000 Classic fanzines rows: old {old*1000:.0f} ms, new {new*1000:.0f} ms ({old/new:.1f}x)")
+    assert new < old
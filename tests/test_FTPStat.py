@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+# Getting file stamps from the server (FTPStat), and giving up cleanly when the server won't say.
+
+import ftplib
+
+import pytest
+
+import FTPStat
+from FTP import FTP
+
+
+# An ftplib connection which never connects: it answers from a dict of path -> (size, modify), and refuses MLST/MLSD
+# if told to
+class _FakeConnection(ftplib.FTP):
+    def __init__(self, files: dict[str, tuple[int, str]], mlst: bool=True):
+        super().__init__()
+        self.Files=files
+        self.Mlst=mlst
+        self.Sent: list[str]=[]
+
+    def sendcmd(self, cmd: str) -> str:
+        self.Sent.append(cmd)
+        verb, path=cmd.split(" ", 1)
+        if verb == "MLST" and not self.Mlst:
+            raise ftplib.error_perm("500 Unknown command")
+        if path not in self.Files:
+            raise ftplib.error_perm(f"550 {path}: No such file")
+        size, modify=self.Files[path]
+        if verb == "MLST":
+            return f"250-Listing {path}\n size={size};modify={modify};type=file; {path}\n250 End"
+        return f"213 {modify}"
+
+    def size(self, path: str) -> int:
+        self.Sent.append(f"SIZE {path}")
+        if path not in self.Files:
+            raise ftplib.error_perm(f"550 {path}: No such file")
+        return self.Files[path][0]
+
+    def mlsd(self, path: str="", facts=[]):
+        self.Sent.append(f"MLSD {path}")
+        if not self.Mlst:
+            raise ftplib.error_perm("500 Unknown command")
+        return iter([(".", {"type": "cdir"})]+[(x.rsplit("/", 1)[1], {"Type": "file", "Size": str(s), "Modify": m}) for x, (s, m) in self.Files.items()])
+
+
+@pytest.fixture
+def Connect(monkeypatch):
+    monkeypatch.setattr(FTPStat, "_mlstRefused", False)
+    def Connect(connection: ftplib.FTP|None) -> None:
+        monkeypatch.setattr(FTP, "g_ftp", connection, raising=False)
+    return Connect
+
+
+_files={"/fanzines/Apollo/index.html": (1234, "20240101120000")}
+
+
+def test_NotConnected(Connect):
+    Connect(None)
+    assert FTPStat.ServerFileStamp("/fanzines/Apollo", "index.html") is None
+    assert FTPStat.ServerListing("/fanzines/Apollo") is None
+
+
+def test_Mlst(Connect):
+    connection=_FakeConnection(_files)
+    Connect(connection)
+    assert FTPStat.ServerFileStamp("/fanzines/Apollo/", "index.html") == "size=1234;modify=20240101120000"
+    assert connection.Sent == ["MLST /fanzines/Apollo/index.html"]
+    assert FTPStat.ServerListing("/fanzines/Apollo") == {"index.html": {"type": "file", "size": "1234", "modify": "20240101120000"}}
+
+
+def test_MlstRefused(Connect):
+    connection=_FakeConnection(_files, mlst=False)
+    Connect(connection)
+    # SIZE+MDTM give the same stamp MLST would have...
+    assert FTPStat.ServerFileStamp("/fanzines/Apollo", "index.html") == "size=1234;modify=20240101120000"
+    # ...and once refused, MLST isn't tried again
+    connection.Sent.clear()
+    assert FTPStat.ServerFileStamp("/fanzines/Apollo", "index.html") == "size=1234;modify=20240101120000"
+    assert connection.Sent == ["SIZE /fanzines/Apollo/index.html", "MDTM /fanzines/Apollo/index.html"]
+    assert FTPStat.ServerListing("/fanzines/Apollo") is None
+
+
+def test_MissingFile(Connect):
+    connection=_FakeConnection(_files)
+    Connect(connection)
+    assert FTPStat.ServerFileStamp("/fanzines/Apollo", "nothere.html") is None
+    assert not FTPStat._mlstRefused      # A missing file says nothing about whether MLST works
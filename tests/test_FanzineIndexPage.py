@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+# Reading the table of a new-style fanzine index page (GetFanzineIndexPageNew()) and rendering a page from the
+# template (RenderFanzineIndexPage()).
+
+import os
+import re
+import sys
+import time
+import subprocess
+from datetime import datetime
+
+import pytest
+
+from FanzineIndexPage import FanzineIndexPage, SpecialNameFormatToHtmlFancylink, ColNamesToColDefs, _dataFilename
+from FanzineIndexPageTableRow import FanzineIndexPageTableRow
+from ClassicFanzinesLine import ClassicFanzinesDate
+from GridDataModel import ColDefinition, ColDefinitionsList, IsEditable
+from HelpersPackage import FindAndReplaceSingleBracketedText, FindAndReplaceBracketedText, InsertBetweenHTMLComments, FindLinkInString
+from HelpersPackage import InsertInvisibleTextInsideFanacComment, InsertHTMLUsingFanacStartEndCommentPair, TurnPythonListIntoWordList
+from HelpersPackage import ExtractHTMLUsingFanacStartEndCommentPair, RemoveAllHTMLLikeTags, StripSpecificTag
+from HtmlHelpersPackage import UnicodeToHtmlEscapes, HtmlEscapesToUnicode, ConvertHTMLEscapes
+
+
+_headers=["Issue", "Year", "Mailing", "Notes"]
+
+_linkRow='\n<TR><TD colspan="5"><a href="https://fanac.org/fanzines/Apollo2/">More of Apollo</a></TD></TR>'
+_textRow='\n<TR><TD colspan="5"><b>Supplements &amp; one-shots</b></TD></TR>'
+_ordinaryRow="\n<TR>\n<TD><a href=\"Apollo01.pdf\">Apollo #1</A></TD>\n<TD CLASS='left'>1943</TD>\n<TD CLASS='left'>FAPA 25</TD>\n<TD CLASS='left'><i>first</i> issue</TD>\n<!-- Up: 2023-02-01-->\n</TR>\n"
+_unlinkedRow="\n<TR>\n<TD>Apollo #2</TD>\n<TD CLASS='left'>1944</TD>\n<TD CLASS='left'></TD>\n<TD CLASS='left'>never published</TD>\n</TR>\n"
+# A row with several Up comments gets the last one on the first line which has any...
+_severalUpsRow="\n<TR>\n<TD><a href=\"Apollo03.pdf\">Apollo #3</A></TD>\n<TD CLASS='left'>1945</TD>\n<TD CLASS='left'></TD>\n<TD CLASS='left'></TD>\n" \
+               "<!-- Up: 2020-01-01--><!-- Up: 2021-05-06-->\n<!-- Up: 2022-07-08-->\n</TR>\n"
+# ...even when it's on the same line as the cells
+_inlineUpsRow="\n<TR><TD><a href=\"Apollo04.pdf\">Apollo #4</A></TD><TD>1946</TD><TD></TD><TD></TD><!-- Up: 2019-01-01--> <!-- Up: 2019-02-02-->\n<!-- Up: 2019-03-03-->\n</TR>\n"
+
+
+# The Fanzine Index Page template with the given table in it
+def _FixturePage(headers: list[str], rows: str) -> str:
+    with open("Template - Fanzine Index Page.html", encoding="utf-8") as f:
+        html=f.read()
+    def Replace(html: str, tag: str, contents: str) -> str:
+        start=html.index(f"<!-- fanac-{tag} start-->")+len(f"<!-- fanac-{tag} start-->")
+        end=html.index(f"<!-- fanac-{tag} end-->")
+        return html[:start]+contents+html[end:]
+    html=Replace(html, "table-headers", "\n<TR>\n"+"".join([f"<TH>{x}</TH>\n" for x in headers])+"</TR>\n")
+    return Replace(html, "table-rows", rows)
+
+
+# Read a page as GetFanzineIndexPage() does once it has downloaded a new-style page
+def _LoadPage(html: str) -> FanzineIndexPage:
+    fip=FanzineIndexPage()
+    fip._version="2.1"
+    assert fip.GetFanzineIndexPageNew(html)
+    for row in fip.Rows:
+        row.SavedSignature=row.Signature()
+    return fip
+
+
+def test_RowKinds():
+    fip=_LoadPage(_FixturePage(_headers, _linkRow+_textRow+_ordinaryRow+_unlinkedRow))
+    assert fip.ColHeaders == ["Link", "Display Text", "Year", "Mailing", "Notes"]
+    assert len(fip.Rows) == 4
+    link, text, ordinary, unlinked=fip.Rows
+
+    assert link.IsLinkRow
+    assert link.Cells[:2] == ["https://fanac.org/fanzines/Apollo2/", "More of Apollo"]
+
+    assert text.IsTextRow
+    assert text.Cells[0] == "Supplements & one-shots"
+
+    assert not ordinary.IsLinkRow and not ordinary.IsTextRow
+    assert ordinary.Cells == ["Apollo01.pdf", "Apollo #1", "1943", "FAPA 25", "first issue"]
+    assert ordinary.UpdatedComment == "<!-- Up: 2023-02-01-->"
+
+    assert unlinked.Cells == ["", "Apollo #2", "1944", "", "never published"]
+    assert unlinked.UpdatedComment == ""
+
+
+@pytest.mark.parametrize("row, updated", [
+    (_ordinaryRow, "<!-- Up: 2023-02-01-->"),
+    (_severalUpsRow, "<!-- Up: 2021-05-06-->"),
+    (_inlineUpsRow, "<!-- Up: 2019-02-02-->"),
+    (_unlinkedRow, ""),
+], ids=["one", "several", "inline", "none"])
+def test_UpdatedComment(row: str, updated: str):
+    fip=_LoadPage(_FixturePage(_headers, row))
+    assert [x.UpdatedComment for x in fip.Rows] == [updated]
+    # It's what the search the parser used to do found
+    m=re.search(".*(<!-- Up: [0-9 -]*-->)", re.findall(r"<TR>(.+?)</TR>", row, flags=re.DOTALL|re.IGNORECASE)[0])
+    assert updated == ("" if m is None else m.groups()[0])
+
+
+# Pages in the layout the editor writes (V2 and V2.1), including one of over 1000 rows
+_fanzineIndexPagesFolder=os.path.join(os.path.dirname(__file__), "fanzine_index_pages")
+_fanzineIndexPages=sorted([x for x in os.listdir(_fanzineIndexPagesFolder) if x.lower().endswith(".html")])
+
+
+def _ReadCorpusPage(filename: str) -> tuple[str, str]:
+    with open(os.path.join(_fanzineIndexPagesFolder, filename), encoding="utf-8", newline="") as f:
+        html=f.read()
+    return html, re.search(r"<!-- fanac-fanzine index page V([0-9.]+)-->", html).group(1)
+
+
+# The table of a page read the way GetFanzineIndexPageNew() did before its patterns were compiled: pattern strings
+# and flags on each call, successive re.match()es for link and text rows, and ".*(<!-- Up: ...-->)" for the Up comment.
+# Returns the column headers and, for each row, its cells, whether it's a link row or a text row, and its Up comment.
+def _ParseTableOld(html: str, version: str) -> tuple[list[str], list[tuple[list[str], bool, bool, str]]]:
+    headers=ExtractHTMLUsingFanacStartEndCommentPair(html, "table-headers")
+    headers=re.findall(r"<TH>(.+?)</TH>", headers, flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
+    colDefs=ColDefinitionsList([ColDefinition("Link", 100, "url", IsEditable.Maybe)])+ColNamesToColDefs(headers)
+
+    out=[]
+    rows=ExtractHTMLUsingFanacStartEndCommentPair(html, "table-rows")
+    rows=re.findall(r"<TR>(.+?)</TR>", rows, flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
+    for row in rows:
+        m=re.match(r'<TD colspan=\"[0-9]+\">(<a href=\"(.*?)">(.*?)</a>)</TD>', row, flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
+        if m is not None:
+            fipr=FanzineIndexPageTableRow(colDefs)
+            fipr.Cells[0]=m.groups()[1]
+            fipr.Cells[1]=m.groups()[2]
+            fipr.IsLinkRow=True
+            out.append(fipr)
+            continue
+
+        m=re.match(r'<TD colspan=\"[0-9]+\">(.*?)</TD>', row, flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
+        if m is not None:
+            fipr=FanzineIndexPageTableRow(colDefs)
+            fipr.Cells[0]=ConvertHTMLEscapes(StripSpecificTag(m.groups()[0], "b"))
+            fipr.IsTextRow=True
+            out.append(fipr)
+            continue
+
+        updated=""
+        m=re.search(".*(<!-- Up: [0-9 -]*-->)", row)
+        if m is not None:
+            updated=m.groups()[0]
+
+        rowsfound=re.findall(r"<TD(:?.*?)>(.*?)</TD>", row, flags=re.DOTALL|re.MULTILINE|re.IGNORECASE)
+        cols=[x[1] for x in rowsfound]
+        cols0=str(cols[0])
+        _, url, text, _=FindLinkInString(cols0)
+        if "gostak.org.uk" in url:
+            url="http:"+url
+        text=text.replace("&amp;nbsp;", "&nbsp;")
+        if version == "2":
+            url=HtmlEscapesToUnicode(url, isURL=True).replace("&amp;", "&")
+        else:
+            url=HtmlEscapesToUnicode(url, isURL=True)
+        if url == "" and text == "":
+            cols=["", cols0]+cols[1:]
+        else:
+            cols=[url, text]+cols[1:]
+        fipr=FanzineIndexPageTableRow(colDefs, cols[:2]+[RemoveAllHTMLLikeTags(str(x)) for x in cols[2:]])
+        fipr.UpdatedComment=updated
+        out.append(fipr)
+
+    return headers, [(x.Cells, x.IsLinkRow, x.IsTextRow, x.UpdatedComment) for x in out]
+
+
+@pytest.mark.parametrize("filename", _fanzineIndexPages)
+def test_CorpusMatchesOldParser(filename: str):
+    html, version=_ReadCorpusPage(filename)
+    fip=FanzineIndexPage()
+    fip._version=version
+    assert fip.GetFanzineIndexPageNew(html)
+
+    headers, rows=_ParseTableOld(html, version)
+    assert fip.ColHeaders == ["Link"]+[x.Preferred for x in ColNamesToColDefs(headers)]
+    assert len(fip.Rows) == len(rows)
+    for row, old in zip(fip.Rows, rows):
+        assert (row.Cells, row.IsLinkRow, row.IsTextRow, row.UpdatedComment) == old
+
+
+# Reading the biggest page of the corpus, both ways.  (Best of three, to keep a busy machine from deciding it.  The new
+# time is for all of GetFanzineIndexPageNew(), so it includes the page's header as well as its table.)
+def test_Benchmark():
+    filename=max(_fanzineIndexPages, key=lambda x: os.path.getsize(os.path.join(_fanzineIndexPagesFolder, x)))
+    html, version=_ReadCorpusPage(filename)
+    numRows=len(_ParseTableOld(html, version)[1])
+    assert numRows >= 1000
+
+    def Time(parse) -> float:
+        best=float("inf")
+        for _ in range(3):
+            start=time.perf_counter()
+            parse()
+            best=min(best, time.perf_counter()-start)
+        return best
+
+    def ParseNew() -> None:
+        fip=FanzineIndexPage()
+        fip._version=version
+        fip.GetFanzineIndexPageNew(html)
+
+    old=Time(lambda: _ParseTableOld(html, version))
+    new=Time(ParseNew)
+    print(f"\nReading {filename} ({numRows} rows): old {old*1000:.0f} ms, new {new*1000:.0f} ms ({old/new:.1f}x)")
+    assert new < old
+
+
+# The page as it was rendered before the template was compiled into a SlotTemplate: the template file, filled in by
+# one helper call after another.  RenderFanzineIndexPage() must produce just the same page.
+def _RenderFanzineIndexPageOld(fip: FanzineIndexPage) -> str:
+    with open("Template - Fanzine Index Page.html") as f:
+        output=f.read()
+
+    edlist=", ".join([x for x in fip.Editors.split("\n")])
+    names=[fip.Name.MainName]
+    names.extend(fip.Name.Othernames)
+    namelist=", ".join(names)
+    content=f'{namelist}, {edlist}, {fip.Dates.strip()}, {fip.FanzineType.strip()}'
+    if fip.Clubname != "":
+        content+=f", {fip.Clubname}"
+    meta=f'meta name="description" content="{content}"'
+    output=FindAndReplaceSingleBracketedText(output, "meta name=", f"<{UnicodeToHtmlEscapes(meta)}>")
+    output, _=FindAndReplaceBracketedText(output, "title", f"<title>{UnicodeToHtmlEscapes(fip.Name.MainName)}</title>", caseInsensitive=True)
+
+    output=InsertBetweenHTMLComments(output, "name", UnicodeToHtmlEscapes(fip.Name.MainName))
+    output=InsertBetweenHTMLComments(output, "other", fip.Name.OthernamesAsHTML)
+    output=InsertBetweenHTMLComments(output, "eds", "<br>".join([SpecialNameFormatToHtmlFancylink(UnicodeToHtmlEscapes(x.strip())) for x in fip.Editors.split("\n")]))
+    output=InsertBetweenHTMLComments(output, "dates", UnicodeToHtmlEscapes(fip.Dates.strip()))
+    output=InsertBetweenHTMLComments(output, "complete", "(Complete)" if fip.Complete else "")
+    output=InsertBetweenHTMLComments(output, "type", fip.FanzineType.strip())
+    output=InsertBetweenHTMLComments(output, "club", f" - {UnicodeToHtmlEscapes(fip.Clubname)}" if fip.Clubname != "" else "")
+    output=InsertBetweenHTMLComments(output, "loc", TurnPythonListIntoWordList(fip.Locale))
+
+    output=InsertInvisibleTextInsideFanacComment(output, "sig", fip.Significance)
+    output=InsertInvisibleTextInsideFanacComment(output, "ordering", fip.Ordering)
+    temp=InsertInvisibleTextInsideFanacComment(output, "data", _dataFilename)
+    if temp != "":
+        output=temp
+    output=InsertHTMLUsingFanacStartEndCommentPair(output, "topcomments", fip.TopComments.replace("\n", "<br>").strip())
+    output=InsertInvisibleTextInsideFanacComment(output, "keywords", "")
+
+    insert="\n<TR>\n<TH>Issue</TH>\n"
+    for header in fip.ColHeaders[2:]:
+        insert+=f"<TH>{header}</TH>\n"
+    insert+="</TR>\n"
+    output=InsertHTMLUsingFanacStartEndCommentPair(output, "table-headers", insert)
+
+    insert=""
+    for row in fip.Rows:
+        if row.IsEmptyRow:
+            insert+=f"\n<TR>"
+            for i in range(fip.NumCols-1):
+                insert+=f"<TD>&nbsp;</TD>\n"
+            insert+=f"</TR>\n"
+            continue
+        if row.IsTextRow:
+            contents=row.Cells[0]
+            if not re.match(r"<a name=.*>", contents, flags=re.IGNORECASE):
+                contents=UnicodeToHtmlEscapes(contents)
+            insert+=f'\n<TR><TD colspan="{fip.NumCols}"><b>{contents}</b></TD></TR>'
+            continue
+        if row.IsLinkRow:
+            insert+=fr'\n<TR><TD colspan="{fip.NumCols}"><a href="{row.Cells[0]}">{UnicodeToHtmlEscapes(row.Cells[1])}</a></TD></TR>'
+            continue
+        insert+=f"\n<TR>"
+        href=row.Cells[0].replace("#", "%23").replace("&", "%26").strip()
+        if href != "":
+            insert+=f'\n<TD><a href="{href}">{row.Cells[1]}</A></TD>\n'
+        else:
+            insert+=f'\n<TD>{row.Cells[1]}</TD>\n'
+        for i, cell in enumerate(row.Cells[2:]):
+            if fip.ColHeaders[i+2].lower() == "mailing":
+                insert+=f"<TD CLASS='left'>{fip.ProcessAPALinks(cell)}</TD>\n"
+            else:
+                insert+=f"<TD CLASS='left'>{cell}</TD>\n"
+        if row.SavedSignature != row.Signature():
+            row.UpdatedComment=f"<!-- Up: {datetime.now():%Y-%m-%d}-->"
+        insert+=row.UpdatedComment+"\n"
+        insert+=f"</TR>\n"
+    output=InsertHTMLUsingFanacStartEndCommentPair(output, "table-rows", insert)
+
+    temp=InsertHTMLUsingFanacStartEndCommentPair(output, "scan", UnicodeToHtmlEscapes(fip.Credits))
+    if len(temp) > 0:
+        output=temp
+    return InsertHTMLUsingFanacStartEndCommentPair(output, "updated", f"Updated {ClassicFanzinesDate().Now()}")
+
+
+def _EditFixture(fip: FanzineIndexPage) -> None:
+    fip.Editors="Joe Hensley\nLionel Innman & Café"
+    fip.Clubname="The Lunarians"
+    fip.TopComments="A fanzine of the\nMidwest"
+    fip.Credits="Scanned by Joe & Café"
+    fip.Rows[2].Cells[4]="first issue (revised)"       # An edited row gets today's Up comment
+    fip.InsertEmptyRows(3)
+
+
+def test_RenderMatchesOldRenderer():
+    html=_FixturePage(_headers, _linkRow+_textRow+_ordinaryRow+_unlinkedRow+_severalUpsRow+_inlineUpsRow)
+    new=_LoadPage(html)
+    old=_LoadPage(html)
+    _EditFixture(new)
+    _EditFixture(old)
+
+    rendered=new.RenderFanzineIndexPage("Apollo")
+    assert rendered is not None
+    assert rendered == _RenderFanzineIndexPageOld(old)
+    assert [x.UpdatedComment for x in new.Rows] == [x.UpdatedComment for x in old.Rows]
+
+    # Rendering again (when each row's HTML comes from its cache) changes nothing -- unless a row has been edited since
+    assert new.RenderFanzineIndexPage("Apollo") == rendered
+    new.Rows[3].Cells[4]="never published (really)"
+    old.Rows[3].Cells[4]="never published (really)"
+    assert new.RenderFanzineIndexPage("Apollo") == _RenderFanzineIndexPageOld(old)
+
+
+# The model (and the batch mode and catalog built on it) must load without wx, as in a batch worker or on a machine
+# without a display.  This is checked in a fresh interpreter in which importing wx fails.
+@pytest.mark.parametrize("module", ["FanzineIndexPage", "FanzinesBatch", "FanzinesCatalog"])
+def test_ImportsWithoutWx(module: str):
+    code=f"import sys; sys.modules['wx']=None; import {module}; print(sorted(x for x, m in sys.modules.items() if m is not None and x.split('.')[0] in ('wx', 'WxDataGrid', 'WxHelpers')))"
+    result=subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)})
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+# ParseLegacyHtml() must build the same tree as BeautifulSoup(html, "html.parser"): for every tag name that
+# GetFanzineIndexPageOld() looks for (and every other one in the page), findAll() must find the same tags and str() them
+# the same way.  This is checked for each page in legacy_pages/ (any .html file put there is picked up), as well as for
+# the page and fragments below.  (To check a whole folder of pages, e.g. the local mirror, use "FanzinesEditor --check-legacy".)
+
+import os
+import bs4
+import pytest
+from bs4 import BeautifulSoup
+
+from LegacyHtml import ParseLegacyHtml, BeautifulSoupVersion
+
+
+_legacyPagesFolder=os.path.join(os.path.dirname(__file__), "legacy_pages")
+_tagNames=["html", "head", "title", "body", "table", "tr", "th", "td", "a", "h1", "h2", "p", "br", "img", "fanac-type"]
+
+
+# An old-style ("Jack") page, with the quirks they are made of: unclosed <H2>s and <p>s, upper-case tags and attributes,
+# unquoted and valueless attributes, entities, <br/>, a script, a comment and whitespace-only text.
+_legacyPage='''<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0 Transitional//EN">
+<HTML><HEAD><TITLE>Apollo &amp; Friends</TITLE><script>var x=1;</script></HEAD>
+<BODY BGCOLOR="#FFFFFF" link=blue>
+<TABLE class="fmz"><TR><TD class="logo"><IMG SRC="fh.gif" ALT='logo'></TD>
+<TD class="fmz" border="none"><H1 class="sansserif">Apollo<BR><H2>Joe Hensley <BR> Lionel Innman<BR><H2>1943 - 1946<BR><BR>Genzine</H2></H2></H1></TD></TR></TABLE>
+<fanac-type><h2>US: Bloomington IN</h2></fanac-type>
+<p>Some comments here<p>and more &eacute;t&eacute;&nbsp;caf&#233;
+<TABLE><TR><TD>spacer</TD></TR></TABLE>
+<!-- Fanac-keywords: Alphabetize Individually -->
+<TABLE BORDER="1">
+<TR><TH>Issue</TH><TH>Date</TH><TH>Year</TH><TH>Editor</TH><TH>Mailing</TH><TH>Notes</TH></TR>
+<TR><TD><A HREF="Apollo01.pdf">Apollo #1</A></TD><TD CLASS="left">Nov 1943</TD><TD>1943</TD><TD>Bob &amp; Joe</TD>
+<TD><a href="http://fanac.org/fanzines/APA_Mailings/FAPA/12.html?a=1&b=2">FAPA 12</a></TD><TD><i>first</i> issue<br/>16pp</TD></TR>
+<TR><TD><A HREF="Apollo02.pdf">Apollo #2</A></TD><TD CLASS=left>  </TD><TD>1944</TD><TD></TD><TD></TD><TD>x<br>y</TD></TR>
+<TR><TD colspan="6"><b>Supplements</b></TD></TR>
+</TABLE>
+Scanned by Joe<BR>
+Updated 2001<BR>
+</BODY></HTML>'''
+
+
+# A different BeautifulSoup may build (or serialize) some trees differently, so the comparisons are only good for this one
+def test_BeautifulSoupVersion():
+    assert bs4.__version__ == BeautifulSoupVersion, f"LegacyHtml has been checked against BeautifulSoup {BeautifulSoupVersion}, not {bs4.__version__}"
+
+
+def _AssertSameTrees(html: str) -> None:
+    document=ParseLegacyHtml(html)
+    assert document is not None
+    soup=BeautifulSoup(html, "html.parser")
+    for name in _tagNames+sorted({x.name for x in soup.find_all(True)}-set(_tagNames)):
+        assert [str(x) for x in document.findAll(name)] == [str(x) for x in soup.find_all(name)], f"<{name}>"
+    # ...and the same within each table, as GetFanzineIndexPageOld() searches the tables for their rows and cells
+    for table, soupTable in zip(document.findAll("table"), soup.find_all("table")):
+        for name in ["tr", "th", "td"]:
+            assert [str(x) for x in table.findAll(name)] == [str(x) for x in soupTable.find_all(name)], f"<{name}> in <table>"
+
+
+def test_LegacyPage():
+    _AssertSameTrees(_legacyPage)
+
+
+# The pages are read as they come from the server: as UTF-8, with their line ends left alone
+@pytest.mark.parametrize("filename", sorted(x for x in os.listdir(_legacyPagesFolder) if x.endswith(".html")))
+def test_LegacyPagesCorpus(filename: str):
+    with open(os.path.join(_legacyPagesFolder, filename), encoding="utf-8", newline="") as f:
+        _AssertSameTrees(f.read())
+
+
+@pytest.mark.parametrize("html", [
+    "<p>a<p>b</p></p>",                                     # An end tag closes the most recent open tag of its name...
+    "<table><tr><td>a</table></td></tr>",                   # ...and is ignored if there isn't one
+    "<td>a</b>b</td>",
+    "<br><BR/><br />x</br>",                                # Void elements
+    "<td>  \n  </td><td>\n</td><td> </td>",                 # Whitespace-only text
+    "<td>&lt;&gt;&amp;&quot;&#39;&#x41;&copy;</td>",        # Entities
+    "<a href=x.pdf title='It&#39;s' checked>z</a>",         # Attribute quoting
+    "<td><!-- a comment --><!----></td>",
+])
+def test_Fragments(html: str):
+    _AssertSameTrees(html)
+
+
+# Anything it doesn't handle makes it give up (and the caller use BeautifulSoup) rather than build a different tree
+@pytest.mark.parametrize("html", [
+    "<td>a <? php ?> b</td>",
+    "<td><![CDATA[x]]></td>",
+    "<script>if (a<b) x=2;</script>",
+])
+def test_Rejected(html: str):
+    assert ParseLegacyHtml(html) is None
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+# Reading through the local mirror of the server (ServerMirror): which reads go to the server, and what Sync() does
+# with directories which have gone.
+
+import os
+
+import pytest
+
+import ServerMirror as ServerMirrorModule
+from ServerMirror import ServerMirror
+
+
+# The server: the fanzine directories in /fanzines, each with its mtime and its files' contents and stamps.  It counts
+# the stamps (MLSTs) and downloads asked of it.
+class _FakeServer:
+    def __init__(self):
+        self.Dirs: dict[str, str]={"Apollo": "20240101000000", "Sky_Hook": "20240202000000"}
+        self.Files: dict[str, tuple[str, str]]={
+            "/fanzines/Apollo/index.html": ("<html>Apollo</html>", "size=19;modify=20240101000000"),
+            "/fanzines/Sky_Hook/index.html": ("<html>Sky Hook</html>", "size=21;modify=20240202000000"),
+        }
+        self.Stamps: list[str]=[]
+        self.Downloads: list[str]=[]
+
+    def ServerListing(self, serverDir: str) -> dict[str, dict[str, str]]|None:
+        if serverDir == "/fanzines":
+            return {x: {"type": "dir", "modify": m} for x, m in self.Dirs.items()}
+        files={x.rsplit("/", 1)[1]: s for x, (_, s) in self.Files.items() if x.rsplit("/", 1)[0] == serverDir}
+        return {x: {"type": "file", "size": s.split(";")[0][5:], "modify": s.split(";")[1][7:]} for x, s in files.items()}
+
+    def ServerFileStamp(self, serverDir: str, filename: str) -> str|None:
+        path=f"{serverDir.rstrip('/')}/{filename}"
+        self.Stamps.append(path)
+        return self.Files[path][1] if path in self.Files else None
+
+    def GetFileAsString(self, serverDir: str, filename: str, TestLoad: bool=False) -> str|None:
+        path=f"{serverDir.rstrip('/')}/{filename}"
+        self.Downloads.append(path)
+        return self.Files[path][0] if path in self.Files else None
+
+
+@pytest.fixture
+def Server(monkeypatch, tmp_path) -> _FakeServer:
+    server=_FakeServer()
+    class Settings:
+        def Get(self, name: str, default: str="") -> str:
+            return str(tmp_path) if name == "Mirror directory" else default
+    monkeypatch.setattr(ServerMirrorModule, "Settings", Settings)
+    monkeypatch.setattr(ServerMirrorModule, "FTP", lambda: server)
+    monkeypatch.setattr(ServerMirrorModule, "ServerListing", server.ServerListing)
+    monkeypatch.setattr(ServerMirrorModule, "ServerFileStamp", server.ServerFileStamp)
+    monkeypatch.setattr(ServerMirror, "g_listedDirs", set())
+    return server
+
+
+def test_UnsyncedReadsStampEachFile(Server: _FakeServer):
+    assert ServerMirror.GetFileAsString("/fanzines/Apollo", "index.html") == "<html>Apollo</html>"
+    assert ServerMirror.GetFileAsString("/fanzines/Apollo", "index.html") == "<html>Apollo</html>"
+    assert Server.Stamps == ["/fanzines/Apollo/index.html"]*2
+    assert Server.Downloads == ["/fanzines/Apollo/index.html"]
+
+
+def test_SyncedReadsTrustTheListing(Server: _FakeServer):
+    assert ServerMirror.Sync("fanzines") == 2
+    Server.Downloads.clear()
+    assert ServerMirror.GetFileAsString("/fanzines/Apollo", "index.html") == "<html>Apollo</html>"
+    assert ServerMirror.GetFileAsString("/fanzines/Sky_Hook/", "index.html") == "<html>Sky Hook</html>"
+    assert Server.Stamps == []
+    assert Server.Downloads == []
+
+    # A directory which has changed is listed again by the next sync, and the new file read from the server
+    Server.Files["/fanzines/Apollo/index.html"]=("<html>Apollo!</html>", "size=20;modify=20240303000000")
+    Server.Dirs["Apollo"]="20240303000000"
+    assert ServerMirror.Sync("fanzines") == 1
+    assert ServerMirror.GetFileAsString("/fanzines/Apollo", "index.html") == "<html>Apollo!</html>"
+    assert Server.Stamps == []
+
+    # A file the listing doesn't know about goes to the server, as without a mirror
+    assert ServerMirror.GetFileAsString("/fanzines/Apollo", "index.json") is None
+    assert Server.Downloads[-1] == "/fanzines/Apollo/index.json"
+
+
+def test_StoreKeepsTheListingCurrent(Server: _FakeServer):
+    ServerMirror.Sync("fanzines")
+    Server.Files["/fanzines/Apollo/index.html"]=("<html>Edited</html>", "size=19;modify=20240404000000")
+    ServerMirror.Store("/fanzines/Apollo", "index.html", "<html>Edited</html>")
+    Server.Downloads.clear()
+    assert ServerMirror.GetFileAsString("/fanzines/Apollo", "index.html") == "<html>Edited</html>"
+    assert Server.Downloads == []
+
+
+def test_GoneDirectoryIsMarkedStale(Server: _FakeServer):
+    ServerMirror.Sync("fanzines")
+    del Server.Dirs["Sky_Hook"]
+    ServerMirror.Sync("fanzines")
+
+    # Nothing is deleted...
+    assert os.path.exists(ServerMirror.LocalPath("/fanzines/Sky_Hook", "index.html"))
+    # ...but nothing in it is trusted: it's read from the server again
+    Server.Downloads.clear()
+    assert ServerMirror.GetFileAsString("/fanzines/Sky_Hook", "index.html") == "<html>Sky Hook</html>"
+    assert Server.Stamps == ["/fanzines/Sky_Hook/index.html"]
+    assert Server.Downloads == ["/fanzines/Sky_Hook/index.html"]
+
+    # If it comes back, it's listed afresh
+    Server.Dirs["Sky_Hook"]="20240505000000"
+    assert ServerMirror.Sync("fanzines") == 1
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+# main() releases the server lock only once the startup threads (which take it) are done.  (See StartupThreads.)
+
+import threading
+
+from FanzinesEditor import StartupThreads
+
+
+def test_Join(monkeypatch):
+    monkeypatch.setattr(StartupThreads, "g_threads", [])
+    lockTaken=threading.Event()
+    StartupThreads.Start(lockTaken.wait)
+    StartupThreads.Start(lambda: None)
+
+    # Still taking the lock: not safe to release it
+    assert not StartupThreads.Join(0.1)
+
+    lockTaken.set()
+    assert StartupThreads.Join(5)
+    assert not any(x.is_alive() for x in StartupThreads.g_threads)